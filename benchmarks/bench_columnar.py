@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Column scans: the indented JSON feed vs the Parquet/Arrow exports of the same reviews.
+
+Writes N synthetic reviews with the CLI's JSON exporter (indented array)
+and the ``parquet``/``arrow`` feed exporters, then times reading the
+``date`` and ``rating`` columns back: ``json.load`` of the whole file vs a
+column-projected read into an Arrow table (what a dataframe load does).
+Every format must return the same values. Needs the optional ``pyarrow``
+package.
+
+    python benchmarks/bench_columnar.py [--items 200000] [--row-group-size 10000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrapy.exporters import JsonItemExporter  # noqa: E402
+
+from scrap_reviews.columnar import ArrowItemExporter, ParquetItemExporter, require_pyarrow  # noqa: E402
+from scrap_reviews.items import ReviewItem  # noqa: E402
+
+TEXT = "Reporting is flexible once you learn the saved-search model, but the UI feels dated."
+COLUMNS = ["date", "rating"]
+
+
+def make_items(n):
+    return [
+        ReviewItem(
+            source=("g2", "capterra", "trustpilot")[i % 3],
+            company_name=("NetSuite", "Acumatica", "Sage Intacct")[i % 7 % 3],
+            title=f"Solid ERP #{i}",
+            review_text=f"{TEXT} Review {i}.",
+            date=f"{2020 + i % 6}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            rating=float(1 + i % 5),
+            reviewer_name=f"Reviewer {i % 5000}",
+            scraped_at="2025-07-01T12:00:00",
+        )
+        for i in range(n)
+    ]
+
+
+def export(path, exporter_cls, items, **kwargs):
+    with open(path, "wb") as f:
+        exporter = exporter_cls(f, **kwargs)
+        exporter.start_exporting()
+        for item in items:
+            exporter.export_item(item)
+        exporter.finish_exporting()
+    return os.path.getsize(path)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--row-group-size", type=int, default=10000)
+    args = parser.parse_args()
+    try:
+        pa = require_pyarrow()
+    except RuntimeError as e:
+        sys.exit(str(e))
+
+    items = make_items(args.items)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: os.path.join(tmp, f"reviews.{fmt}") for fmt in ("json", "parquet", "arrow")}
+        sizes = {
+            "json": export(paths["json"], JsonItemExporter, items, encoding="utf-8", ensure_ascii=False, indent=2),
+            "parquet": export(paths["parquet"], ParquetItemExporter, items, row_group_size=args.row_group_size),
+            "arrow": export(paths["arrow"], ArrowItemExporter, items, row_group_size=args.row_group_size),
+        }
+
+        def scan_json():
+            with open(paths["json"], encoding="utf-8") as f:
+                rows = json.load(f)
+            return {c: [r[c] for r in rows] for c in COLUMNS}
+
+        def scan_parquet():
+            return pa.parquet.read_table(paths["parquet"], columns=COLUMNS)
+
+        def scan_arrow():
+            with pa.memory_map(paths["arrow"]) as source:
+                return pa.ipc.open_file(source).read_all().select(COLUMNS)
+
+        results = {fmt: timed(fn) for fmt, fn in (("json", scan_json), ("parquet", scan_parquet), ("arrow", scan_arrow))}
+
+    expected = results["json"][1]
+    for fmt in ("parquet", "arrow"):
+        table = results[fmt][1]
+        dates = [d.isoformat() for d in table.column("date").to_pylist()]
+        if dates != expected["date"] or table.column("rating").to_pylist() != expected["rating"]:
+            sys.exit(f"{fmt} columns differ from the JSON feed")
+
+    base_t = results["json"][0]
+    print(f"{args.items} reviews, reading {', '.join(COLUMNS)}")
+    for fmt, (elapsed, _) in results.items():
+        print(
+            f"  {fmt:>8}: {sizes[fmt] / 1e6:7.1f} MB on disk, {elapsed * 1000:7.0f} ms "
+            f"({base_t / elapsed:.1f}x vs json)"
+        )
+
+
+if __name__ == "__main__":
+    main()
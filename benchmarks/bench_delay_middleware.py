@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Throughput of 3 concurrent spiders with the blocking vs non-blocking delay.
+
+Each spider fetches PAGES pages from a local server through its own
+download slot. The "blocking" mode reproduces the old ``time.sleep()``
+middleware; "async" uses ``scrap_reviews.middlewares.RandomDelayMiddleware``.
+
+    python benchmarks/bench_delay_middleware.py [--pages 10] [--delay 0.2]
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class BlockingDelayMiddleware:
+    """The pre-change middleware: sleeps inside the reactor thread."""
+
+    def __init__(self, delay, randomize):
+        self.delay = delay
+        self.randomize = randomize
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            crawler.settings.getfloat("BENCH_DELAY"),
+            crawler.settings.getfloat("BENCH_RANDOMIZE"),
+        )
+
+    def process_request(self, request, spider):
+        time.sleep(self.delay + random.uniform(0, self.randomize))
+        return None
+
+
+def run_once(mode: str, pages: int, delay: float, port: int) -> dict:
+    import scrapy
+    from scrapy.crawler import CrawlerProcess
+
+    class BenchSpider(scrapy.Spider):
+        name = "bench"
+
+        def start_requests(self):
+            for i in range(pages):
+                yield scrapy.Request(
+                    f"http://127.0.0.1:{port}/?spider={self.name}&page={i}",
+                    meta={"download_slot": self.name},
+                    dont_filter=True,
+                )
+
+        def parse(self, response):
+            yield {"url": response.url}
+
+    if mode == "blocking":
+        mw = {f"{__name__}.BlockingDelayMiddleware": 401}
+    else:
+        mw = {"scrap_reviews.middlewares.RandomDelayMiddleware": 401}
+
+    process = CrawlerProcess(
+        settings={
+            "LOG_LEVEL": os.getenv("BENCH_LOG_LEVEL", "ERROR"),
+            "DOWNLOAD_DELAY": delay,
+            "RANDOMIZE_DOWNLOAD_DELAY": delay,
+            "BENCH_DELAY": delay,
+            "BENCH_RANDOMIZE": delay,
+            "DOWNLOADER_MIDDLEWARES": mw,
+            "CONCURRENT_REQUESTS": 8,
+            "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
+            "DOWNLOAD_SLOTS": {f"s{i}": {"delay": 0, "concurrency": 1} for i in range(3)},
+            "TELNETCONSOLE_ENABLED": False,
+        }
+    )
+    crawlers = []
+    for i in range(3):
+        cls = type(f"BenchSpider{i}", (BenchSpider,), {"name": f"s{i}"})
+        crawler = process.create_crawler(cls)
+        crawlers.append(crawler)
+        process.crawl(crawler)
+    t0 = time.perf_counter()
+    process.start()
+    elapsed = time.perf_counter() - t0
+    fetched = sum(c.stats.get_value("response_received_count", 0) for c in crawlers)
+    return {"mode": mode, "pages": fetched, "seconds": round(elapsed, 2), "pages_per_sec": round(fetched / elapsed, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10, help="pages per spider")
+    parser.add_argument("--delay", type=float, default=0.2, help="base and random delay (s)")
+    parser.add_argument("--mode", choices=["blocking", "async"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # One reactor per process: each mode runs in its own subprocess.
+        print(json.dumps(run_once(args.mode, args.pages, args.delay, args.port)))
+        return
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    with tempfile.TemporaryDirectory() as docroot:
+        with open(os.path.join(docroot, "index.html"), "w") as f:
+            f.write("<html><body><article>review</article></body></html>")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1", "-d", docroot],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            time.sleep(0.5)
+            for mode in ("blocking", "async"):
+                cmd = [
+                    sys.executable, __file__, "--mode", mode, "--port", str(port),
+                    "--pages", str(args.pages), "--delay", str(args.delay),
+                ]
+                out = subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=ROOT)
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{r['mode']:>8}: {r['pages']} pages in {r['seconds']}s ({r['pages_per_sec']} pages/s)")
+        finally:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
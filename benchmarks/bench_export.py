@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Export throughput: the old JsonExportPipeline + CsvExportPipeline pair vs ExportPipeline.
+
+The old pair serialized every item twice: an indented JSON array through
+scrapy's JsonItemExporter, and a CSV row built with ``str()`` per field.
+ExportPipeline writes both formats from one serialization with buffered
+writes. The JSON and CSV files must hold the same data either way.
+
+    python benchmarks/bench_export.py [--items 50000] [--flush-items 500]
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from itemadapter import ItemAdapter  # noqa: E402
+from scrapy.exporters import JsonItemExporter  # noqa: E402
+
+from scrap_reviews.items import ReviewItem  # noqa: E402
+from scrap_reviews.pipelines import ExportPipeline  # noqa: E402
+
+TEXT = "Reporting is flexible once you learn the saved-search model, but the UI feels dated."
+
+
+class LegacyJsonExport:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, "reviews_legacy.json")
+        self.file = open(self.path, "wb")
+        self.exporter = JsonItemExporter(self.file, encoding="utf-8", ensure_ascii=False, indent=2)
+        self.exporter.start_exporting()
+
+    def process_item(self, item, spider):
+        ItemAdapter(item)
+        self.exporter.export_item(item)
+        return item
+
+    def close_spider(self, spider):
+        self.exporter.finish_exporting()
+        self.file.close()
+
+
+class LegacyCsvExport:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, "reviews_legacy.csv")
+        self.file = open(self.path, "w", newline="", encoding="utf-8")
+        self.writer = None
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        row = {}
+        for k in adapter.field_names():
+            v = adapter.get(k)
+            if isinstance(v, bytes):
+                row[k] = v.decode("utf-8", errors="ignore")
+            elif v is None:
+                row[k] = ""
+            else:
+                row[k] = str(v)
+        if self.writer is None:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(row.keys())
+        self.writer.writerow(row.values())
+        return item
+
+    def close_spider(self, spider):
+        self.file.close()
+
+
+def make_items(n):
+    return [
+        ReviewItem(
+            source=("g2", "capterra", "trustpilot")[i % 3],
+            company_name="NetSuite",
+            title=f"Solid ERP #{i}",
+            review_text=f'{TEXT} "Review" {i},\nsecond line.',
+            date=f"{2020 + i % 6}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            rating=float(1 + i % 5),
+            reviewer_name=f"Reviewer {i % 5000}",
+            scraped_at="2025-07-01T12:00:00",
+        )
+        for i in range(n)
+    ]
+
+
+def timed(stages, items):
+    t0 = time.perf_counter()
+    for item in items:
+        for stage in stages:
+            stage.process_item(item, None)
+    for stage in stages:
+        stage.close_spider(None)
+    return time.perf_counter() - t0
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--flush-items", type=int, default=500, help="ExportPipeline buffer size")
+    args = parser.parse_args()
+    items = make_items(args.items)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = [LegacyJsonExport(tmp), LegacyCsvExport(tmp)]
+        legacy_t = timed(legacy, items)
+
+        out = os.path.join(tmp, "new")
+        pipeline = ExportPipeline(["json", "csv"], flush_items=args.flush_items, directory=out)
+        pipeline.open_spider(None)
+        new_t = timed([pipeline], items)
+
+        (new_json,) = glob.glob(os.path.join(out, "*.json"))
+        (new_csv,) = glob.glob(os.path.join(out, "*.csv"))
+        with open(legacy[0].path, encoding="utf-8") as a, open(new_json, encoding="utf-8") as b:
+            if json.load(a) != json.load(b):
+                sys.exit("JSON outputs differ")
+        if read_csv(legacy[1].path) != read_csv(new_csv):
+            sys.exit("CSV outputs differ")
+
+    print(f"{args.items} items to JSON + CSV")
+    print(f"  legacy pair:    {args.items / legacy_t:9.0f} items/s")
+    print(f"  ExportPipeline: {args.items / new_t:9.0f} items/s ({legacy_t / new_t:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
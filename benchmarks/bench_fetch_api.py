@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Per-scrape latency: one process per scrape (the CLI) vs ``fetch_reviews`` on a shared reactor.
+
+A local server serves a synthetic G2 listing page. "process" starts a
+fresh interpreter per scrape running ``CrawlerProcess.start()``, the
+only way to scrape more than once with the blocking CLI; "api" awaits
+``scrap_reviews.api.fetch_reviews`` N times (then N at once) inside one
+asyncio program. Every scrape must return the same number of reviews.
+
+    python benchmarks/bench_fetch_api.py [--scrapes 5]
+"""
+import argparse
+import asyncio
+import http.server
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parse_cards import synthetic_page  # noqa: E402
+
+# No politeness delays against localhost; the page is not on g2.com.
+OVERRIDES = {
+    "DOWNLOAD_DELAY": 0,
+    "AUTOTHROTTLE_ENABLED": False,
+    "LOG_LEVEL": "ERROR",
+    "DOWNLOADER_MIDDLEWARES": {"scrapy.downloadermiddlewares.offsite.OffsiteMiddleware": None},
+}
+CRAWL = {"source": "g2", "company": "NetSuite", "start": "2020-01-01", "end": "2030-12-31", "max_pages": 1}
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = synthetic_page("g2")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def one_shot(url):
+    """One scrape in this process the CLI way; prints the item count."""
+    from scrapy import signals
+    from scrapy.crawler import CrawlerProcess
+
+    from scrap_reviews.api import api_settings
+
+    process = CrawlerProcess(api_settings(OVERRIDES))
+    crawler = process.create_crawler("g2_reviews")
+    items = []
+
+    def on_item(item, response, spider):
+        items.append(item)
+
+    crawler.signals.connect(on_item, signal=signals.item_scraped)
+    process.crawl(
+        crawler,
+        company_name=CRAWL["company"],
+        start_date=CRAWL["start"],
+        end_date=CRAWL["end"],
+        product_url=url,
+        max_pages=CRAWL["max_pages"],
+    )
+    process.start()
+    print(json.dumps({"items": len(items)}))
+
+
+def run_processes(url, n):
+    counts = []
+    t0 = time.perf_counter()
+    for _ in range(n):
+        out = subprocess.run(
+            [sys.executable, __file__, "--one-shot", url], capture_output=True, text=True, check=True
+        ).stdout
+        counts.append(json.loads(out.strip().splitlines()[-1])["items"])
+    return time.perf_counter() - t0, counts
+
+
+async def run_api(url, n):
+    from scrap_reviews.api import fetch_reviews
+
+    async def scrape():
+        count = 0
+        async for _ in fetch_reviews(
+            CRAWL["source"], CRAWL["company"], CRAWL["start"], CRAWL["end"],
+            product_url=url, max_pages=CRAWL["max_pages"], settings=OVERRIDES,
+        ):
+            count += 1
+        return count
+
+    await scrape()  # starts the shared reactor
+    t0 = time.perf_counter()
+    sequential = [await scrape() for _ in range(n)]
+    seq_t = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    concurrent = await asyncio.gather(*(scrape() for _ in range(n)))
+    return seq_t, sequential, time.perf_counter() - t0, list(concurrent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scrapes", type=int, default=5)
+    parser.add_argument("--one-shot", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.one_shot:
+        one_shot(args.one_shot)
+        return
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/products/netsuite/reviews"
+    try:
+        proc_t, proc_counts = run_processes(url, args.scrapes)
+        seq_t, seq_counts, conc_t, conc_counts = asyncio.run(run_api(url, args.scrapes))
+    finally:
+        server.shutdown()
+        from scrap_reviews.api import get_fetcher
+
+        get_fetcher().close()
+
+    counts = set(proc_counts + seq_counts + conc_counts)
+    if len(counts) != 1 or not counts.pop():
+        sys.exit(f"item counts differ or are empty: {proc_counts} {seq_counts} {conc_counts}")
+    n = args.scrapes
+    print(f"{n} scrapes of {proc_counts[0]} reviews each")
+    print(f"  process per scrape:        {proc_t / n * 1000:7.0f} ms/scrape")
+    print(f"  fetch_reviews, sequential: {seq_t / n * 1000:7.0f} ms/scrape ({proc_t / seq_t:.1f}x)")
+    print(f"  fetch_reviews, concurrent: {conc_t / n * 1000:7.0f} ms/scrape ({proc_t / conc_t:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Parse-time of the spiders' card extraction, per listing page.
+
+- "legacy": the old per-page extraction: every page probes the card
+  selectors with ``response.css`` and every field walks its CSS fallbacks,
+  serializing each hit and re-parsing it into a new Selector for its text.
+- "probing": in-tree text extraction with precompiled XPath, but a fresh
+  ``LayoutPlan`` per page (no learning carried over).
+- "planned": one ``LayoutPlan`` for the crawl, card selector learned on the first page.
+
+All modes must extract identical items. Pages are synthetic 25-card
+listings per source unless saved pages are given as ``SOURCE=PATH``.
+
+    python benchmarks/bench_parse_cards.py [--repeat 20] [--pages 5] [g2=saved.html ...]
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrapy.http import HtmlResponse  # noqa: E402
+from scrapy.selector import Selector  # noqa: E402
+
+from scrap_reviews.extract import LayoutPlan  # noqa: E402
+from scrap_reviews.spiders.capterra_reviews import CapterraReviewsSpider  # noqa: E402
+from scrap_reviews.spiders.g2_reviews import G2ReviewsSpider  # noqa: E402
+from scrap_reviews.spiders.trustpilot_reviews import TrustpilotReviewsSpider  # noqa: E402
+
+SPIDERS = {
+    "g2": G2ReviewsSpider,
+    "capterra": CapterraReviewsSpider,
+    "trustpilot": TrustpilotReviewsSpider,
+}
+
+LOREM = (
+    "We moved our finance team onto it last year. <b>Reporting</b> is flexible once "
+    "you learn the saved-search model, but the UI <i>feels dated</i> and support "
+    "tickets can take days. <a href='#'>Read more</a>"
+)
+
+
+def legacy_text(sel, css_query):
+    v = sel.css(css_query).get()
+    if not v:
+        return None
+    v = re.sub(r"\s+", " ", Selector(text=v).xpath("string()").get() or "").strip()
+    return v or None
+
+
+def legacy_find_cards(self, response):
+    for q in self.card_queries:
+        found = response.css(q)
+        if found:
+            return found
+    return []
+
+
+def legacy_field(self, card, name, convert=None):
+    for q in self.field_queries[name]:
+        # Dates were read raw; every other field went through _text.
+        v = card.css(q).get() if name == "date" else legacy_text(card, q)
+        if v and convert is not None:
+            v = convert(v)
+        if v:
+            return v
+    return None
+
+
+def g2_card(i, d):
+    return (
+        f'<article class="elv-bg-neutral-0"><div class="header"><h3>Great tool for ops #{i}</h3>'
+        f'<time datetime="{d}">{d}</time><div class="stars" aria-label="4.5 out of 5"></div></div>'
+        f'<div class="review-content"><p>{LOREM}</p><p>{LOREM}</p></div>'
+        f'<div class="user"><span class="reviewer-name">Reviewer {i}</span></div></article>'
+    )
+
+
+def capterra_card(i, d):
+    return (
+        f'<div data-test="review-card-{i}"><header><h3>Solid ERP #{i}</h3></header>'
+        f'<span class="ms-2">{d}</span><div class="rating" aria-label="4 out of 5"></div>'
+        f'<div class="review-content"><p>{LOREM}</p><p>Pros: {LOREM}</p></div>'
+        f'<span class="reviewer-name">Reviewer {i}</span></div>'
+    )
+
+
+def trustpilot_card(i, d):
+    return (
+        f'<article data-service-review-card-paper="true"><span data-consumer-name="true">Reviewer {i}</span>'
+        f'<time datetime="{d}T09:12:00.000Z">{d}</time>'
+        f'<div data-service-review-rating="4"></div><h2>Works well #{i}</h2>'
+        f'<p data-service-review-text-typography="true">{LOREM}</p></article>'
+    )
+
+
+CARDS = {"g2": g2_card, "capterra": capterra_card, "trustpilot": trustpilot_card}
+
+
+def synthetic_page(source, page=1, cards=25):
+    body = "".join(CARDS[source](i, f"2025-{12 - page % 12:02d}-{1 + i % 28:02d}") for i in range(cards))
+    chrome = "<nav>" + "<a href='#'>link</a>" * 50 + "</nav>" + "<script>var x = 1;</script>" * 5
+    return f"<html><head><title>Reviews</title></head><body>{chrome}{body}</body></html>".encode()
+
+
+def run(cls, responses, repeat, mode):
+    spider = cls(company_name="bench", start_date="2025-01-01", end_date="2025-12-31")
+    items = []
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        spider.layout = None
+        items = []
+        for response in responses:
+            if mode == "probing":
+                spider.layout = None
+            items += spider._parse_cards(response, spider._find_cards(response))[0]
+    return (time.perf_counter() - t0) / (repeat * len(responses)), [dict(i) for i in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the pages")
+    parser.add_argument("--pages", type=int, default=5, help="synthetic pages per source")
+    parser.add_argument("saved", nargs="*", help="saved pages as SOURCE=PATH")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    bodies = {}
+    for spec in args.saved:
+        source, _, path = spec.partition("=")
+        with open(path, "rb") as f:
+            bodies.setdefault(source, []).append(f.read())
+    if not bodies:
+        bodies = {s: [synthetic_page(s, n) for n in range(1, args.pages + 1)] for s in SPIDERS}
+
+    new_find, new_field = LayoutPlan.find_cards, LayoutPlan.field
+    for source, pages in bodies.items():
+        cls = SPIDERS[source]
+        responses = [
+            HtmlResponse(url=f"https://example.com/{source}?page={n}", body=body, encoding="utf-8")
+            for n, body in enumerate(pages, 1)
+        ]
+        results = {}
+        for mode in ("legacy", "probing", "planned"):
+            if mode == "legacy":
+                LayoutPlan.find_cards, LayoutPlan.field = legacy_find_cards, legacy_field
+            try:
+                results[mode] = run(cls, responses, args.repeat, mode)
+            finally:
+                LayoutPlan.find_cards, LayoutPlan.field = new_find, new_field
+        if len({repr(r[1]) for r in results.values()}) != 1:
+            sys.exit(f"{source}: extraction modes disagree")
+        legacy_t = results["legacy"][0]
+        line = ", ".join(
+            f"{mode} {t * 1e3:6.2f} ms ({legacy_t / t:.1f}x)" for mode, (t, _) in results.items()
+        )
+        print(f"{source:>10} ({len(pages)} pages, {len(results['planned'][1])} items): {line} per page")
+
+
+if __name__ == "__main__":
+    main()
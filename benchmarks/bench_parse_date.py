@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""parse_date throughput: the precompiled/memoized parser vs the old one.
+
+Dates come from the ``data/`` fixtures, rendered in the formats the review
+sites show (``Jan 05, 2025``, ``05 January 2025``, ``01/05/2025``, ISO with
+time and zone, relative). Both parsers must agree on every input.
+
+    python benchmarks/bench_parse_date.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrap_reviews.state import iter_output_items  # noqa: E402
+from scrap_reviews.utils import parse_date  # noqa: E402
+
+
+def _legacy_relative(s, now=None):
+    text = s.strip().lower()
+    now = now or datetime.now(timezone.utc)
+    if text == "today":
+        return now
+    if text == "yesterday":
+        return now - timedelta(days=1)
+    for pattern, days in (
+        (r"(\d+)\s*(day|days|d)\s*ago", 1),
+        (r"(\d+)\s*(week|weeks|w)\s*ago", 7),
+        (r"(\d+)\s*(month|months|mo)\s*ago", 30),
+        (r"(\d+)\s*(year|years|y)\s*ago", 365),
+    ):
+        m = re.search(pattern, text)
+        if m:
+            return now - timedelta(days=days * int(m.group(1)))
+    return None
+
+
+def _legacy_formats(s, fmts):
+    for fmt in fmts:
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_parse_date(s, *, prefer_dayfirst=False, now=None):
+    """The pre-change parser: strptime over every format, regexes compiled per call."""
+    if not s or not str(s).strip():
+        return None
+    raw = str(s).strip()
+    rel = _legacy_relative(raw, now=now)
+    if rel:
+        return rel.date().isoformat()
+    cleaned = re.sub(r"\s+", " ", re.sub(r"[,\u00A0]", " ", raw)).strip()
+    dt = _legacy_formats(cleaned, [
+        "%b %d %Y", "%b %d, %Y", "%B %d %Y", "%B %d, %Y",
+        "%d %b %Y", "%d %B %Y", "%Y %b %d", "%Y %B %d",
+        "%b %Y", "%B %Y",
+    ])
+    if dt:
+        return dt.date().isoformat()
+    mdy = ["%m-%d-%Y", "%m/%d/%Y", "%m.%d.%Y"]
+    dmy = ["%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y"]
+    ordered = dmy + mdy if prefer_dayfirst else mdy + dmy
+    dt = _legacy_formats(cleaned, ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"] + ordered)
+    if dt:
+        return dt.date().isoformat()
+    try:
+        return datetime.fromisoformat(cleaned.replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        pass
+    token = re.search(r"(\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2})", cleaned)
+    if token:
+        dt = _legacy_formats(token.group(1), ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"])
+        if dt:
+            return dt.date().isoformat()
+    token = re.search(r"\b([A-Za-z]{3,9})\s+(\d{1,2}),?\s+(\d{4})\b", cleaned)
+    if token:
+        dt = _legacy_formats(" ".join(token.groups()), ["%b %d %Y", "%B %d %Y"])
+        if dt:
+            return dt.date().isoformat()
+    return None
+
+
+def sample_inputs(now):
+    dates = set()
+    for path in glob.glob(os.path.join(ROOT, "data", "*.json*")):
+        for item in iter_output_items(path):
+            if item.get("date"):
+                dates.add(date.fromisoformat(item["date"]))
+    if not dates:
+        dates = {date(2025, 1, 5), date(2024, 10, 20)}
+    inputs = []
+    for d in sorted(dates):
+        inputs += [
+            d.isoformat(),
+            f"{d.isoformat()}T10:31:07.000Z",
+            f"{d.isoformat()}T10:31:07+02:00",
+            d.strftime("%b %d, %Y"),
+            d.strftime("%B %d %Y"),
+            d.strftime("%d %B %Y"),
+            d.strftime("%m/%d/%Y"),
+            d.strftime("%d.%m.%Y"),
+            d.strftime("%b %Y"),
+            f"Reviewed on {d.strftime('%b %d, %Y')}",
+            f"{(now.date() - d).days} days ago",
+        ]
+    return inputs + ["today", "yesterday", "3 weeks ago", "not a date", ""]
+
+
+def bench(fn, inputs, repeat, now):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for s in inputs:
+            fn(s, now=now)
+    return (time.perf_counter() - t0) / (repeat * len(inputs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the inputs")
+    args = parser.parse_args()
+
+    now = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    inputs = sample_inputs(now)
+    for s in inputs:
+        for dayfirst in (False, True):
+            old = legacy_parse_date(s, prefer_dayfirst=dayfirst, now=now)
+            new = parse_date(s, prefer_dayfirst=dayfirst, now=now)
+            if old != new:
+                sys.exit(f"mismatch for {s!r} (dayfirst={dayfirst}): {old} != {new}")
+
+    legacy = bench(legacy_parse_date, inputs, args.repeat, now)
+    fast = bench(parse_date, inputs, args.repeat, now)
+    print(f"{len(inputs)} distinct inputs x {args.repeat} passes")
+    print(f"  legacy: {legacy * 1e6:7.2f} us/call")
+    print(f"    fast: {fast * 1e6:7.2f} us/call ({legacy / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
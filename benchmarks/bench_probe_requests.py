@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Requests and items produced while resolving the start URL, per spider.
+
+Feeds ``try_start`` the candidate responses of a run without
+``--product-url``: the first candidate shows no reviews, the second a
+listing page. Each step must produce exactly the expected requests and
+items (one follow-up request per candidate response, the page's items
+once, nothing for a repeated or late response); the script exits
+non-zero otherwise. Listing pages are synthetic (cards matching several
+card selectors) unless saved pages are given as ``SOURCE=PATH``.
+
+    python benchmarks/bench_probe_requests.py [--repeat 50] [g2=saved.html ...]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scrapy  # noqa: E402
+from scrapy.http import HtmlResponse  # noqa: E402
+from scrapy.settings import Settings  # noqa: E402
+
+from bench_parse_cards import SPIDERS, synthetic_page  # noqa: E402
+from scrap_reviews import settings as project_settings  # noqa: E402
+
+EMPTY_PAGE = b"<html><head><title>Not found</title></head><body><p>No such product</p></body></html>"
+
+
+def listing_page(source):
+    # itemprop="review" on every card so several card selectors match at once.
+    page = synthetic_page(source)
+    return page.replace(b"<article ", b'<article itemprop="review" ').replace(
+        b'<div data-test="review-card', b'<div itemprop="review" data-test="review-card'
+    )
+
+
+def make_spider(cls):
+    settings = Settings()
+    settings.setmodule(project_settings)
+    cls.update_settings(settings)
+    spider = cls(company_name="Acme Corp", start_date="2025-01-01", end_date="2025-12-31")
+    spider.settings = settings
+    return spider
+
+
+def respond(request, body):
+    return HtmlResponse(url=request.url, body=body, encoding="utf-8", request=request)
+
+
+def split(output):
+    requests = [r for r in output if isinstance(r, scrapy.Request)]
+    return requests, len(output) - len(requests)
+
+
+def page_items(cls, page):
+    """Items one parse of ``page`` yields, the count a hit must produce."""
+    spider = make_spider(cls)
+    response = HtmlResponse(url="https://example.com/reviews?page=1", body=page, encoding="utf-8")
+    return len(spider._parse_cards(response, spider._find_cards(response))[0])
+
+
+def probe_run(cls, page):
+    """Return ``[(step, requests, items)]`` for one simulated resolution."""
+    spider = make_spider(cls)
+    steps = []
+    (first,) = list(spider.start_requests())
+    requests, items = split(list(spider.try_start(respond(first, EMPTY_PAGE))))
+    steps.append(("miss", len(requests), items))
+    second = requests[0]
+    hit = respond(second, page)
+    requests, items = split(list(spider.try_start(hit)))
+    steps.append(("hit", len(requests), items))
+    # A repeated or late candidate response must not start another crawl.
+    requests, items = split(list(spider.try_start(hit)))
+    steps.append(("late", len(requests), items))
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="simulated resolutions per source")
+    parser.add_argument("saved", nargs="*", help="saved listing pages as SOURCE=PATH")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    pages = {}
+    for spec in args.saved:
+        source, _, path = spec.partition("=")
+        with open(path, "rb") as f:
+            pages[source] = f.read()
+    if not pages:
+        pages = {s: listing_page(s) for s in SPIDERS}
+
+    failed = False
+    for source, page in pages.items():
+        cls = SPIDERS[source]
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            steps = probe_run(cls, page)
+        elapsed = (time.perf_counter() - t0) / args.repeat
+        kept = page_items(cls, page)
+        expected = [("miss", 1, 0), ("hit", 1, kept), ("late", 0, 0)]
+        ok = steps == expected and kept > 0
+        failed |= not ok
+        line = ", ".join(f"{step}: {n} request(s) {i} item(s)" for step, n, i in steps)
+        print(f"{source:>10}: {line}; {elapsed * 1e3:.2f} ms per resolution {'ok' if ok else 'UNEXPECTED'}")
+    if failed:
+        sys.exit("try_start produced unexpected requests or items")
+
+
+if __name__ == "__main__":
+    main()
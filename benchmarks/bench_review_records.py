@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Memory and pipeline CPU time per review: ``ReviewItem`` vs ``ReviewRecord``.
+
+Builds N synthetic reviews of each type, measures the memory held by the
+live items (tracemalloc), then times them through the default pipeline
+chain: DataValidationPipeline, DuplicatesPipeline, LoggingPipeline and a
+JSON Lines exporter writing to memory. Both types must export the same lines.
+
+    python benchmarks/bench_review_records.py [--items 100000]
+"""
+import argparse
+import gc
+import io
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrapy.exceptions import DropItem  # noqa: E402
+
+from scrap_reviews.feeds import StreamingJsonLinesItemExporter  # noqa: E402
+from scrap_reviews.items import ReviewItem, ReviewRecord  # noqa: E402
+from scrap_reviews.pipelines import (  # noqa: E402
+    DataValidationPipeline,
+    DuplicatesPipeline,
+    LoggingPipeline,
+)
+from scrap_reviews.utils import DateWindow  # noqa: E402
+
+SOURCES = ("g2", "capterra", "trustpilot")
+TEXT = "Reporting is flexible once you learn the saved-search model, but the UI feels dated."
+
+
+class FakeSpider:
+    name = "bench_reviews"
+    window = DateWindow("2020-01-01", "2025-12-31")
+    logger = logging.getLogger("bench")
+
+
+def fields(i):
+    return {
+        "source": SOURCES[i % 3],
+        "company_name": "NetSuite",
+        "title": f"Solid ERP #{i}",
+        "review_text": f"{TEXT} Review {i}.",
+        "date": f"{2020 + i % 6}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        "rating": str(1 + i % 5),
+        "reviewer_name": f"Reviewer {i % 5000}",
+    }
+
+
+def build(cls, n):
+    gc.collect()
+    tracemalloc.start()
+    items = [cls(**fields(i)) for i in range(n)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return items, size
+
+
+def run_pipelines(items):
+    stages = [DataValidationPipeline(), DuplicatesPipeline(), LoggingPipeline()]
+    buf = io.BytesIO()
+    exporter = StreamingJsonLinesItemExporter(buf, flush_every=1000)
+    exporter.start_exporting()
+    spider = FakeSpider()
+    t0 = time.perf_counter()
+    for item in items:
+        try:
+            for stage in stages:
+                item = stage.process_item(item, spider)
+        except DropItem:
+            continue
+        exporter.export_item(item)
+    exporter.finish_exporting()
+    return time.perf_counter() - t0, buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="synthetic reviews per type")
+    args = parser.parse_args()
+    logging.getLogger("bench").setLevel(logging.WARNING)
+
+    results = {}
+    for cls in (ReviewItem, ReviewRecord):
+        items, size = build(cls, args.items)
+        elapsed, out = run_pipelines(items)
+        # scraped_at differs per run; compare the rest of every line.
+        lines = [line.split(b', "scraped_at"')[0].split(b',"scraped_at"')[0] for line in out.splitlines()]
+        results[cls.__name__] = (size, elapsed, lines)
+        del items
+
+    (base_size, base_t, base_lines), (rec_size, rec_t, rec_lines) = results.values()
+    if base_lines != rec_lines:
+        sys.exit("ReviewItem and ReviewRecord exports differ")
+    print(f"{args.items} reviews, {len(base_lines)} exported")
+    for name, (size, elapsed, _) in results.items():
+        print(
+            f"  {name:>12}: {size / args.items:6.0f} B/item live, "
+            f"{args.items / elapsed:8.0f} items/s through pipelines "
+            f"({base_size / size:.1f}x memory, {base_t / elapsed:.1f}x CPU vs ReviewItem)"
+        )
+
+
+if __name__ == "__main__":
+    main()
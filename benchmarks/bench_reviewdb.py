@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Date-range slices: globbing and parsing per-run JSON files vs the review database.
+
+Writes N synthetic reviews as per-run output files (one indented JSON
+array per source, company and quarter, as ``main.py`` names them), loads
+the same reviews into a ``ReviewDatabase``, then times "all of one
+company's reviews in one quarter, across sources" both ways. Also times
+the load: batched upserts vs one committed ``INSERT OR REPLACE`` per
+review. Both slices must hold the same reviews.
+
+    python benchmarks/bench_reviewdb.py [--items 100000] [--batch 500]
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scrap_reviews.reviewdb import COLUMNS, ReviewDatabase  # noqa: E402
+from scrap_reviews.state import iter_output_items  # noqa: E402
+from scrap_reviews.utils import slugify  # noqa: E402
+
+SOURCES = ("g2", "capterra", "trustpilot")
+COMPANIES = ("NetSuite", "Acumatica", "Sage Intacct", "Odoo", "SAP Business One")
+QUARTERS = (("01-01", "03-31"), ("04-01", "06-30"), ("07-01", "09-30"), ("10-01", "12-31"))
+TEXT = "Reporting is flexible once you learn the saved-search model, but the UI feels dated."
+
+
+def make_reviews(n):
+    return [
+        {
+            "source": SOURCES[i % 3],
+            "company_name": COMPANIES[i % 5],
+            "title": f"Review #{i}",
+            "review_text": f"{TEXT} Review {i}.",
+            "date": f"{2022 + i % 4}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "rating": float(1 + i % 5),
+            "reviewer_name": f"Reviewer {i}",
+            "scraped_at": "2025-07-01T12:00:00",
+        }
+        for i in range(n)
+    ]
+
+
+def write_run_files(directory, reviews):
+    runs = {}
+    for r in reviews:
+        year, month = r["date"][:4], int(r["date"][5:7])
+        start, end = QUARTERS[(month - 1) // 3]
+        name = f"{r['source']}_{slugify(r['company_name'])}_{year}-{start}_{year}-{end}.json"
+        runs.setdefault(name, []).append(r)
+    for name, items in runs.items():
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
+    return len(runs)
+
+
+def load_per_row(path, reviews):
+    db = ReviewDatabase(path)
+    conn = sqlite3.connect(path)
+    for i, r in enumerate(reviews):
+        conn.execute(
+            f"INSERT OR REPLACE INTO reviews (key, company, {', '.join(COLUMNS)}, updated_at) "
+            f"VALUES (?, ?, {', '.join('?' for _ in COLUMNS)}, ?)",
+            (i, slugify(r["company_name"]), *(r[c] for c in COLUMNS), time.time()),
+        )
+        conn.commit()
+    conn.close()
+    db.close()
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=500, help="REVIEW_DB_BATCH")
+    parser.add_argument("--per-row", type=int, default=2000, help="reviews for the per-row commit timing")
+    args = parser.parse_args()
+    reviews = make_reviews(args.items)
+    company, start, end = "NetSuite", "2024-01-01", "2024-03-31"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_run_files(tmp, reviews)
+
+        def scan_files():
+            out = []
+            for path in glob.glob(os.path.join(tmp, "*.json")):
+                for r in iter_output_items(path):
+                    if r["company_name"] == company and start <= r["date"] <= end:
+                        out.append(r)
+            return out
+
+        def load_batched():
+            db = ReviewDatabase(os.path.join(tmp, "reviews.sqlite"), args.batch)
+            for r in reviews:
+                db.add(r)
+            db.flush()
+            return db
+
+        per_row_t, _ = timed(load_per_row, os.path.join(tmp, "per_row.sqlite"), reviews[: args.per_row])
+        load_t, db = timed(load_batched)
+        scan_t, scanned = timed(scan_files)
+        query_t, queried = timed(lambda: list(db.query(company, start, end)))
+        plan = db.explain(company, start, end)
+        db.close()
+
+    def keyed(rows):
+        return sorted((r["source"], r["reviewer_name"], r["date"]) for r in rows)
+
+    if keyed(scanned) != keyed(queried):
+        sys.exit("file scan and database query disagree")
+    print(f"{args.items} reviews in {files} run files; {company} {start}..{end}: {len(queried)} reviews")
+    print(f"  load, per-row commits: {args.per_row / per_row_t:9.0f} reviews/s")
+    print(f"  load, batched upserts: {args.items / load_t:9.0f} reviews/s (batch {args.batch})")
+    print(f"  slice, glob + parse:   {scan_t * 1000:9.1f} ms")
+    print(f"  slice, database query: {query_t * 1000:9.1f} ms ({scan_t / query_t:.0f}x; {'; '.join(plan)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Stage timing on a local crawl: the per-stage breakdown and the instrumentation's overhead.
+
+A local server serves synthetic G2 listing pages. The same crawl runs
+with TIMING_ENABLED off and on (alternating, through ``fetch_reviews``
+on one reactor); both must scrape the same reviews. Prints the JSON
+report's download / parse / pipeline split and checks the Prometheus
+file holds every metric.
+
+    python benchmarks/bench_timing.py [--pages 5] [--runs 3]
+"""
+import argparse
+import asyncio
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_fetch_api import OVERRIDES  # noqa: E402
+from bench_parse_cards import synthetic_page  # noqa: E402
+
+METRICS = (
+    "scrap_reviews_download_seconds_sum",
+    "scrap_reviews_parse_cpu_seconds_sum",
+    "scrap_reviews_pipeline_seconds_sum",
+    "scrap_reviews_items_total",
+    "scrap_reviews_items_per_second",
+)
+
+
+class PagesHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query).get("page", ["1"])[0])
+        body = synthetic_page("g2", page)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def crawl(url, pages, settings):
+    from scrap_reviews.api import fetch_reviews
+
+    t0 = time.perf_counter()
+    n = 0
+    async for _ in fetch_reviews("g2", "NetSuite", "2020-01-01", "2030-12-31", product_url=url, max_pages=pages, settings=settings):
+        n += 1
+    return time.perf_counter() - t0, n
+
+
+async def run(url, pages, runs, tmp):
+    timed_settings = {
+        **OVERRIDES,
+        "TIMING_ENABLED": True,
+        "TIMING_REPORT_FILE": os.path.join(tmp, "{spider}_{start}.json"),
+        "TIMING_PROMETHEUS_FILE": os.path.join(tmp, "{spider}.prom"),
+    }
+    await crawl(url, pages, OVERRIDES)  # starts the shared reactor
+    results = {"off": [], "on": []}
+    for _ in range(runs):
+        results["off"].append(await crawl(url, pages, OVERRIDES))
+        results["on"].append(await crawl(url, pages, timed_settings))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PagesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/products/netsuite/reviews"
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            results = asyncio.run(run(url, args.pages, args.runs, tmp))
+        finally:
+            server.shutdown()
+            from scrap_reviews.api import get_fetcher
+
+            get_fetcher().close()
+        reports = sorted(p for p in os.listdir(tmp) if p.endswith(".json"))
+        with open(os.path.join(tmp, reports[-1]), encoding="utf-8") as f:
+            report = json.load(f)
+        with open(os.path.join(tmp, "g2_reviews.prom"), encoding="utf-8") as f:
+            prom = f.read()
+
+    counts = {n for runs in results.values() for _, n in runs}
+    if len(counts) != 1 or not counts.pop():
+        sys.exit(f"item counts differ or are empty: {results}")
+    missing = [m for m in METRICS if m not in prom]
+    if missing or len(reports) != args.runs or not report["pages"]:
+        sys.exit(f"incomplete timing output: missing metrics {missing}, {len(reports)} report(s)")
+
+    off = min(t for t, _ in results["off"])
+    on = min(t for t, _ in results["on"])
+    print(f"{args.pages} pages, {report['items']['g2']} reviews per crawl (best of {args.runs})")
+    print(f"  timing off: {off * 1000:7.1f} ms")
+    print(f"  timing on:  {on * 1000:7.1f} ms ({(on / off - 1) * 100:+.1f}%)")
+    download, parse = report["download"]["g2"], report["parse_cpu"]["g2"]
+    print(f"  download:   {download['total_s'] * 1000:7.1f} ms over {download['count']} responses")
+    print(f"  parse CPU:  {parse['total_s'] * 1000:7.1f} ms over {parse['count']} pages")
+    for name, s in report["pipelines"].items():
+        print(f"  {name + ':':<24}{s['total_s'] * 1000:7.1f} ms over {s['count']} items")
+    print(f"  items/s:    {report['items_per_second']:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import argparse
+import csv
+import json
 import os
 from datetime import datetime
 from typing import Optional
@@ -8,6 +10,8 @@ from scrapy.crawler import CrawlerProcess
 from scrapy.settings import Settings
 
 from scrap_reviews import settings as project_settings
+from scrap_reviews.columnar import require_pyarrow
+from scrap_reviews.feeds import COMPRESSION_SUFFIX
 from scrap_reviews.utils import slugify, parse_date
 
 
@@ -24,6 +28,7 @@ def build_output_path(
     start: Optional[str],
     end: Optional[str],
     output: Optional[str],
+    ext: str = ".json",
 ) -> str:
     if output:
         out_path = output
@@ -36,7 +41,7 @@ def build_output_path(
         end_s = end or "end"
         out_path = os.path.join(
             data_dir,
-            f"{source}_{slug}_{start_s}_{end_s}.json",
+            f"{source}_{slug}_{start_s}_{end_s}{ext}",
         )
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     return out_path
@@ -52,6 +57,103 @@ def validate_dates(
     return s, e
 
 
+def build_settings(
+    log_level: str,
+    *,
+    early_stop: bool = True,
+    early_stop_patience: Optional[int] = None,
+    fanout: bool = False,
+    cache: bool = False,
+    incremental: bool = False,
+    structured: bool = False,
+    adaptive_render: bool = False,
+    parallel_probe: bool = False,
+    resolver_cache: bool = False,
+    persistent_dedup: bool = False,
+    review_db: bool = False,
+    timing: bool = False,
+) -> Settings:
+    s = Settings()
+    s.setmodule(project_settings)
+    s.set("LOG_LEVEL", log_level)
+    s.set("EARLY_STOP_ENABLED", early_stop)
+    if early_stop_patience:
+        s.set("EARLY_STOP_PATIENCE", early_stop_patience)
+    s.set("FANOUT_ENABLED", fanout)
+    s.set("RENDER_CACHE_ENABLED", cache)
+    s.set("INCREMENTAL_ENABLED", incremental)
+    s.set("STRUCTURED_DATA_FIRST", structured)
+    s.set("ADAPTIVE_RENDER_ENABLED", adaptive_render)
+    s.set("CANDIDATE_PROBE_PARALLEL", parallel_probe)
+    s.set("RESOLVER_CACHE_ENABLED", resolver_cache)
+    if persistent_dedup:
+        s.set("DEDUP_BACKEND", "sqlite")
+    s.set("REVIEW_DB_ENABLED", review_db)
+    s.set("TIMING_ENABLED", timing)
+    s.set(
+        "ITEM_PIPELINES",
+        {
+            "scrap_reviews.pipelines.DataValidationPipeline": 300,
+            "scrap_reviews.pipelines.DuplicatesPipeline": 400,
+            "scrap_reviews.pipelines.IncrementalPipeline": 450,
+            "scrap_reviews.pipelines.LoggingPipeline": 500,
+            "scrap_reviews.pipelines.SqliteExportPipeline": 650,
+        },
+    )
+    return s
+
+
+def output_ext(fmt: str = "json", compression: Optional[str] = None) -> str:
+    return f".{fmt}" + COMPRESSION_SUFFIX[compression]
+
+
+def build_feeds(
+    out_path: str,
+    fmt: str = "json",
+    compression: Optional[str] = None,
+    columnar: Optional[str] = None,
+    settings: Optional[Settings] = None,
+) -> dict:
+    if fmt == "jsonl":
+        # Streaming exporter: one flushed line per item, optionally compressed.
+        feeds = {
+            out_path: {
+                "format": "jsonl",
+                "encoding": "utf-8",
+                "overwrite": True,
+                "item_export_kwargs": {"compression": compression},
+            }
+        }
+    else:
+        feeds = {
+            out_path: {
+                "format": "json",
+                "encoding": "utf-8",
+                "indent": 2,
+                "overwrite": True,
+            }
+        }
+    if columnar:
+        # Same items as a Parquet/Arrow file next to the JSON output.
+        kwargs = {}
+        if settings is not None:
+            kwargs = {
+                "row_group_size": settings.getint("COLUMNAR_ROW_GROUP_SIZE", 10000),
+                "compression": settings.get("COLUMNAR_COMPRESSION"),
+            }
+        feeds[columnar_path(out_path, output_ext(fmt, compression), columnar)] = {
+            "format": columnar,
+            "overwrite": True,
+            "item_export_kwargs": kwargs,
+        }
+    return feeds
+
+
+def columnar_path(out_path: str, ext: str, columnar: str) -> str:
+    base = out_path[: -len(ext)] if out_path.endswith(ext) else os.path.splitext(out_path)[0]
+    return f"{base}.{columnar}"
+
+
 def run(
     source: str,
     company_name: str,
@@ -62,6 +164,21 @@ def run(
     output: Optional[str],
     max_pages: Optional[int],
     log_level: str,
+    early_stop: bool = True,
+    early_stop_patience: Optional[int] = None,
+    fanout: bool = False,
+    cache: bool = False,
+    incremental: bool = False,
+    fmt: str = "json",
+    compression: Optional[str] = None,
+    structured: bool = False,
+    adaptive_render: bool = False,
+    parallel_probe: bool = False,
+    resolver_cache: bool = False,
+    persistent_dedup: bool = False,
+    columnar: Optional[str] = None,
+    review_db: bool = False,
+    timing: bool = False,
 ):
     spider_name = SPIDER_BY_SOURCE.get(source.lower())
     if not spider_name:
@@ -70,30 +187,26 @@ def run(
         )
 
     start_iso, end_iso = validate_dates(start_date, end_date)
-    out_path = build_output_path(source, company_name, start_iso, end_iso, output)
-
-    s = Settings()
-    s.setmodule(project_settings)
-    s.set("LOG_LEVEL", log_level)
-    s.set(
-        "FEEDS",
-        {
-            out_path: {
-                "format": "json",
-                "encoding": "utf-8",
-                "indent": 2,
-                "overwrite": True,
-            }
-        },
+    out_path = build_output_path(
+        source, company_name, start_iso, end_iso, output, output_ext(fmt, compression)
     )
-    s.set(
-        "ITEM_PIPELINES",
-        {
-            "scrap_reviews.pipelines.DataValidationPipeline": 300,
-            "scrap_reviews.pipelines.DuplicatesPipeline": 400,
-            "scrap_reviews.pipelines.LoggingPipeline": 500,
-        },
+
+    s = build_settings(
+        log_level,
+        early_stop=early_stop,
+        early_stop_patience=early_stop_patience,
+        fanout=fanout,
+        cache=cache,
+        incremental=incremental,
+        structured=structured,
+        adaptive_render=adaptive_render,
+        parallel_probe=parallel_probe,
+        resolver_cache=resolver_cache,
+        persistent_dedup=persistent_dedup,
+        review_db=review_db,
+        timing=timing,
     )
+    s.set("FEEDS", build_feeds(out_path, fmt, compression, columnar, s))
 
     process = CrawlerProcess(settings=s)
     process.crawl(
@@ -108,6 +221,202 @@ def run(
     process.start()
 
     print(f"Wrote: {out_path}")
+    if columnar:
+        print(f"Wrote: {columnar_path(out_path, output_ext(fmt, compression), columnar)}")
+
+
+def load_jobs(path: str) -> list[dict]:
+    """Read batch jobs from a CSV (with header), JSON Lines or JSON array file.
+
+    Columns/keys: source, company, url, start_date, end_date and optionally
+    product_slug, max_pages, output. A job that cannot be read gets an
+    ``error`` instead of failing the whole file.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            rows = json.load(f)
+            if not isinstance(rows, list):
+                raise SystemExit(f"{path}: expected a JSON array of jobs")
+        elif path.endswith((".jsonl", ".ndjson")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    jobs = []
+    for i, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            jobs.append({"id": i, "source": "", "company": "", "error": f"expected an object, got {row!r}"})
+            continue
+        row = {k.strip().lower(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+        job = {
+            "id": i,
+            "source": str(row.get("source") or "").lower(),
+            "company": row.get("company") or row.get("company_name") or "",
+            "product_url": row.get("url") or row.get("product_url") or None,
+            "product_slug": row.get("product_slug") or None,
+            "start_date": row.get("start_date") or row.get("start") or None,
+            "end_date": row.get("end_date") or row.get("end") or None,
+            "max_pages": None,
+            "output": row.get("output") or None,
+        }
+        # A bad job is reported in the batch summary; the others still run.
+        if row.get("max_pages"):
+            try:
+                job["max_pages"] = int(row["max_pages"])
+            except (TypeError, ValueError):
+                job["error"] = f"invalid max_pages {row['max_pages']!r}"
+        jobs.append(job)
+    return jobs
+
+
+def parse_source_limits(value: Optional[str]) -> dict[str, int]:
+    """Parse ``g2=2,capterra=1`` into a per-source concurrency dict."""
+    limits = {}
+    for part in (value or "").split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            limits[k.strip().lower()] = int(v)
+    return limits
+
+
+def run_batch(
+    jobs_path: str,
+    log_level: str,
+    concurrency: Optional[int] = None,
+    source_limits: Optional[dict[str, int]] = None,
+    summary_path: Optional[str] = None,
+    early_stop: bool = True,
+    early_stop_patience: Optional[int] = None,
+    fanout: bool = False,
+    cache: bool = False,
+    incremental: bool = False,
+    fmt: str = "json",
+    compression: Optional[str] = None,
+    structured: bool = False,
+    adaptive_render: bool = False,
+    parallel_probe: bool = False,
+    resolver_cache: bool = False,
+    persistent_dedup: bool = False,
+    columnar: Optional[str] = None,
+    review_db: bool = False,
+    timing: bool = False,
+):
+    """Run every job of ``jobs_path`` in one reactor and write a summary.
+
+    At most ``concurrency`` crawls run at once overall and
+    ``source_limits[source]`` per source (defaults: BATCH_CONCURRENCY and
+    BATCH_SOURCE_CONCURRENCY settings). Each job writes its own output file.
+    """
+    from twisted.internet import defer
+
+    s = build_settings(
+        log_level,
+        early_stop=early_stop,
+        early_stop_patience=early_stop_patience,
+        fanout=fanout,
+        cache=cache,
+        incremental=incremental,
+        structured=structured,
+        adaptive_render=adaptive_render,
+        parallel_probe=parallel_probe,
+        resolver_cache=resolver_cache,
+        persistent_dedup=persistent_dedup,
+        review_db=review_db,
+        timing=timing,
+    )
+    concurrency = concurrency or s.getint("BATCH_CONCURRENCY", 4)
+    limits = dict(s.getdict("BATCH_SOURCE_CONCURRENCY"))
+    limits.update(source_limits or {})
+
+    process = CrawlerProcess(settings=s)
+    global_sem = defer.DeferredSemaphore(concurrency)
+    source_sems = {
+        src: defer.DeferredSemaphore(max(1, int(limits.get(src, concurrency))))
+        for src in SPIDER_BY_SOURCE
+    }
+    results = []
+
+    def crawl_job(job: dict, result: dict):
+        spidercls = process.spider_loader.load(SPIDER_BY_SOURCE[job["source"]])
+        # Per-job FEEDS go through a subclass's custom_settings so every
+        # crawl can share the process-wide settings and reactor.
+        job_cls = type(
+            spidercls.__name__,
+            (spidercls,),
+            {"custom_settings": {**(spidercls.custom_settings or {}), "FEEDS": build_feeds(result["output"], fmt, compression, columnar, s)}},
+        )
+        crawler = process.create_crawler(job_cls)
+        result["crawler"] = crawler
+        return process.crawl(
+            crawler,
+            company_name=job["company"],
+            start_date=result["start_date"],
+            end_date=result["end_date"],
+            product_url=job["product_url"],
+            product_slug=job["product_slug"],
+            max_pages=job["max_pages"],
+        )
+
+    def schedule(job: dict):
+        result = {"id": job["id"], "source": job["source"], "company": job["company"]}
+        results.append(result)
+        if job.get("error"):
+            result["status"] = f"error: {job['error']}"
+            return defer.succeed(None)
+        if job["source"] not in SPIDER_BY_SOURCE:
+            result["status"] = f"error: unsupported source {job['source']!r}"
+            return defer.succeed(None)
+        try:
+            start_iso, end_iso = validate_dates(job["start_date"], job["end_date"])
+        except SystemExit as e:
+            result["status"] = f"error: {e}"
+            return defer.succeed(None)
+        result["start_date"], result["end_date"] = start_iso, end_iso
+        result["output"] = build_output_path(
+            job["source"], job["company"], start_iso, end_iso, job["output"], output_ext(fmt, compression)
+        )
+
+        def on_error(failure):
+            result["status"] = f"error: {failure.getErrorMessage()}"
+
+        d = source_sems[job["source"]].run(global_sem.run, crawl_job, job, result)
+        d.addErrback(on_error)
+        return d
+
+    jobs = load_jobs(jobs_path)
+    # The first jobs start synchronously, which installs the configured
+    # reactor before process.start() imports it.
+    done = defer.DeferredList([schedule(job) for job in jobs])
+
+    from twisted.internet import reactor
+
+    # With no job started (empty or all-invalid jobs file) ``done`` has
+    # already fired; stopping must wait until the reactor actually runs.
+    done.addBoth(lambda _: reactor.callWhenRunning(reactor.stop))
+    process.start(stop_after_crawl=False)
+
+    summary = []
+    for result in results:
+        crawler = result.pop("crawler", None)
+        if crawler is not None and crawler.stats:
+            stats = crawler.stats.get_stats()
+            result.setdefault("status", stats.get("finish_reason", "unknown"))
+            result["items"] = stats.get("item_scraped_count", 0)
+            result["pages"] = stats.get("response_received_count", 0)
+            result["stop_reason"] = stats.get("pagination/stop_reason")
+            result["elapsed_seconds"] = stats.get("elapsed_time_seconds")
+        summary.append(result)
+
+    if not summary_path:
+        root = os.path.dirname(os.path.abspath(__file__))
+        summary_path = os.path.join(
+            root, "data", f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+
+    ok = sum(1 for r in summary if r.get("status") == "finished")
+    print(f"Finished {ok}/{len(summary)} jobs. Summary: {summary_path}")
 
 
 def main():
@@ -117,29 +426,159 @@ def main():
     parser.add_argument(
         "--source",
         "-S",
-        required=True,
         choices=sorted(SPIDER_BY_SOURCE.keys()),
         help="g2, capterra, trustpilot",
     )
-    parser.add_argument("--company", "-c", required=True, help="Company/Product name")
+    parser.add_argument("--company", "-c", help="Company/Product name")
+    parser.add_argument("--start-date", "-s", help="Start date (e.g. 2024-01-01)")
+    parser.add_argument("--end-date", "-e", help="End date (e.g. 2024-12-31)")
     parser.add_argument(
-        "--start-date", "-s", required=True, help="Start date (e.g. 2024-01-01)"
+        "--jobs",
+        help="Batch mode: CSV, JSONL or JSON array of source, company, url, start_date, end_date",
     )
     parser.add_argument(
-        "--end-date", "-e", required=True, help="End date (e.g. 2024-12-31)"
+        "--concurrency",
+        type=int,
+        help="Batch mode: max crawls running at once (default: BATCH_CONCURRENCY)",
     )
+    parser.add_argument(
+        "--per-source",
+        help="Batch mode: per-source crawl limits, e.g. g2=2,capterra=1",
+    )
+    parser.add_argument("--summary", help="Batch mode: summary JSON path")
     parser.add_argument("--product-url", help="Explicit product reviews URL")
     parser.add_argument("--product-slug", help="Override slug if URL not provided")
     parser.add_argument(
         "--output",
         "-o",
-        help="Output JSON path (default: data/<source>_<company>_<start>_<end>.json)",
+        help="Output path (default: data/<source>_<company>_<start>_<end>.<format>)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="json: indented array (default); jsonl: one item per line, flushed as scraped",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=["gzip", "zstd"],
+        help="Compress --format jsonl output (zstd needs the 'zstandard' package)",
+    )
+    parser.add_argument(
+        "--columnar",
+        choices=["parquet", "arrow"],
+        help="Also write the reviews as a Parquet or Arrow IPC file next to the output (needs 'pyarrow')",
     )
     parser.add_argument("--max-pages", type=int, help="Limit number of pages to crawl")
+    parser.add_argument(
+        "--no-early-stop",
+        action="store_true",
+        help="Keep paginating after pages fall before --start-date",
+    )
+    parser.add_argument(
+        "--early-stop-patience",
+        type=int,
+        help="Consecutive out-of-window pages before stopping (default: 1)",
+    )
+    parser.add_argument(
+        "--fanout",
+        action="store_true",
+        help="Request all pages in parallel when the page count is known",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse rendered pages from the local cache (RENDER_CACHE_* settings)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only emit reviews newer than the last run (state: python -m scrap_reviews.state)",
+    )
+    parser.add_argument(
+        "--structured-first",
+        action="store_true",
+        help="Fetch pages without JS rendering and read embedded JSON-LD/__NEXT_DATA__ reviews first",
+    )
+    parser.add_argument(
+        "--adaptive-render",
+        action="store_true",
+        help="Fetch pages plain first and render (with longer waits) only when no reviews show",
+    )
+    parser.add_argument(
+        "--parallel-probe",
+        action="store_true",
+        help="Try candidate URLs concurrently and keep the first that shows reviews",
+    )
+    parser.add_argument(
+        "--resolver-cache",
+        action="store_true",
+        help="Reuse the reviews URL resolved by earlier runs (cache: python -m scrap_reviews.resolver)",
+    )
+    parser.add_argument(
+        "--persistent-dedup",
+        action="store_true",
+        help="Drop reviews already scraped by earlier runs (keys in .scrapy/dedup.sqlite)",
+    )
+    parser.add_argument(
+        "--db",
+        action="store_true",
+        help="Also upsert reviews into the review database (query: python -m scrap_reviews.reviewdb)",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Record download/parse/pipeline timing (timing/* stats, report in data/timing/)",
+    )
     parser.add_argument(
         "--log-level", default="INFO", help="Scrapy log level (default: INFO)"
     )
     args = parser.parse_args()
+    if args.compress and args.format != "jsonl":
+        parser.error("--compress requires --format jsonl")
+    if args.columnar:
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    if args.jobs:
+        run_batch(
+            args.jobs,
+            log_level=args.log_level,
+            concurrency=args.concurrency,
+            source_limits=parse_source_limits(args.per_source),
+            summary_path=args.summary,
+            early_stop=not args.no_early_stop,
+            early_stop_patience=args.early_stop_patience,
+            fanout=args.fanout,
+            cache=args.cache,
+            incremental=args.incremental,
+            fmt=args.format,
+            compression=args.compress,
+            structured=args.structured_first,
+            adaptive_render=args.adaptive_render,
+            parallel_probe=args.parallel_probe,
+            resolver_cache=args.resolver_cache,
+            persistent_dedup=args.persistent_dedup,
+            columnar=args.columnar,
+            review_db=args.db,
+            timing=args.timing,
+        )
+        return
+
+    missing = [
+        flag
+        for flag, value in (
+            ("--source", args.source),
+            ("--company", args.company),
+            ("--start-date", args.start_date),
+            ("--end-date", args.end_date),
+        )
+        if not value
+    ]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
 
     run(
         source=args.source,
@@ -151,6 +590,21 @@ def main():
         output=args.output,
         max_pages=args.max_pages,
         log_level=args.log_level,
+        early_stop=not args.no_early_stop,
+        early_stop_patience=args.early_stop_patience,
+        fanout=args.fanout,
+        cache=args.cache,
+        incremental=args.incremental,
+        fmt=args.format,
+        compression=args.compress,
+        structured=args.structured_first,
+        adaptive_render=args.adaptive_render,
+        parallel_probe=args.parallel_probe,
+        resolver_cache=args.resolver_cache,
+        persistent_dedup=args.persistent_dedup,
+        columnar=args.columnar,
+        review_db=args.db,
+        timing=args.timing,
     )
 
 
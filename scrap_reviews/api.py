@@ -0,0 +1,209 @@
+"""Async review-fetch API for asyncio services (no Scrapy CLI, no blocking ``start()``).
+
+    from scrap_reviews.api import fetch_reviews
+
+    async for review in fetch_reviews("g2", "NetSuite", "2025-01-01", "2025-03-31", max_pages=3):
+        print(review["date"], review["title"])
+
+Every call shares one Twisted reactor, started on first use in a daemon
+thread and kept running for the life of the process, so a service can
+run any number of scrapes (concurrently, too) without restarting.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from scrapy import signals
+from scrapy.settings import Settings
+
+from scrap_reviews import settings as project_settings
+from scrap_reviews.utils import parse_date
+
+__all__ = ["ReviewFetcher", "fetch_reviews", "get_fetcher"]
+
+
+def api_settings(overrides: Optional[Mapping[str, Any]] = None) -> Settings:
+    """Project settings without file outputs: no FEEDS and no ExportPipeline."""
+    s = Settings()
+    s.setmodule(project_settings)
+    s.set("FEEDS", {})
+    pipelines = dict(s.getdict("ITEM_PIPELINES"))
+    pipelines.pop("scrap_reviews.pipelines.ExportPipeline", None)
+    s.set("ITEM_PIPELINES", pipelines)
+    s.set("TELNETCONSOLE_ENABLED", False)
+    if overrides:
+        s.update(dict(overrides))
+    return s
+
+
+class _Done:
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class ReviewFetcher:
+    """Runs review crawls on one long-lived reactor thread.
+
+    The reactor (``TWISTED_REACTOR``) is installed and started by the
+    first :meth:`fetch` and never stopped until :meth:`close`; each fetch
+    adds a crawler to the same ``CrawlerRunner``. Items cross to the
+    caller's event loop as the pipelines finish with them.
+    """
+
+    def __init__(self, settings: Optional[Mapping[str, Any]] = None):
+        self.settings = settings if isinstance(settings, Settings) else api_settings(settings)
+        self.runner = None
+        self.reactor = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_reactor, name="scrap-reviews-reactor", daemon=True)
+                self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError("Could not start the crawl reactor") from self._error
+
+    def _run_reactor(self) -> None:
+        try:
+            from scrapy.crawler import CrawlerRunner
+            from scrapy.utils.reactor import install_reactor
+
+            if "twisted.internet.reactor" not in sys.modules and self.settings.get("TWISTED_REACTOR"):
+                install_reactor(self.settings["TWISTED_REACTOR"], self.settings.get("ASYNCIO_EVENT_LOOP"))
+            from twisted.internet import reactor
+
+            if reactor.running:
+                raise RuntimeError("A Twisted reactor is already running; use scrapy's CrawlerRunner on it instead")
+            self.reactor = reactor
+            self.runner = CrawlerRunner(self.settings)
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+            return
+        reactor.callWhenRunning(self._ready.set)
+        reactor.run(installSignalHandlers=False)
+
+    async def fetch(
+        self,
+        source: str,
+        company: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        *,
+        product_url: Optional[str] = None,
+        product_slug: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        settings: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[Any]:
+        """Scrape one product's reviews dated ``start``..``end``, yielding each item.
+
+        ``settings`` overrides project settings for this crawl only (e.g.
+        ``{"FANOUT_ENABLED": True}``). Leaving the loop early stops the crawl.
+        """
+        start_iso = parse_date(start) if start else None
+        end_iso = parse_date(end) if end else None
+        if (start and not start_iso) or (end and not end_iso):
+            raise ValueError(f"Unparseable date range: {start!r}..{end!r}")
+        if start_iso and end_iso and start_iso > end_iso:
+            raise ValueError(f"Invalid date range: start ({start_iso}) > end ({end_iso})")
+
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        put = queue.put_nowait
+        crawler_box: list = []
+
+        def on_item(item, response, spider):
+            loop.call_soon_threadsafe(put, item)
+
+        def start_crawl():
+            try:
+                try:
+                    spidercls = self.runner.spider_loader.load(f"{source.lower()}_reviews")
+                except KeyError:
+                    raise ValueError(f"Unsupported source: {source}") from None
+                if settings:
+                    # Per-call settings through a subclass, as main.run_batch does for FEEDS.
+                    spidercls = type(
+                        spidercls.__name__,
+                        (spidercls,),
+                        {"custom_settings": {**(spidercls.custom_settings or {}), **settings}},
+                    )
+                crawler = self.runner.create_crawler(spidercls)
+                crawler.signals.connect(on_item, signal=signals.item_scraped)
+                crawler_box.append(crawler)
+                d = self.runner.crawl(
+                    crawler,
+                    company_name=company,
+                    start_date=start_iso,
+                    end_date=end_iso,
+                    product_url=product_url,
+                    product_slug=product_slug,
+                    max_pages=max_pages,
+                )
+            except Exception as e:
+                loop.call_soon_threadsafe(put, _Done(e))
+                return
+            d.addCallbacks(
+                lambda _: loop.call_soon_threadsafe(put, _Done()),
+                lambda f: loop.call_soon_threadsafe(put, _Done(f.value)),
+            )
+
+        self.reactor.callFromThread(start_crawl)
+        finished = False
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, _Done):
+                    finished = True
+                    if item.error is not None:
+                        raise item.error
+                    return
+                yield item
+        finally:
+            if not finished:
+                self.reactor.callFromThread(lambda: crawler_box and crawler_box[0].stop())
+
+    def close(self, timeout: Optional[float] = 30) -> None:
+        """Stop running crawls and the reactor; the fetcher cannot be used after."""
+        if self.reactor is None or self._thread is None:
+            return
+
+        def shutdown():
+            d = self.runner.stop()
+            d.addBoth(lambda _: self.reactor.stop())
+
+        self.reactor.callFromThread(shutdown)
+        self._thread.join(timeout)
+
+
+_default: Optional[ReviewFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_fetcher() -> ReviewFetcher:
+    """The process-wide :class:`ReviewFetcher` used by :func:`fetch_reviews`."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ReviewFetcher()
+        return _default
+
+
+def fetch_reviews(
+    source: str,
+    company: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    **kwargs: Any,
+) -> AsyncIterator[Any]:
+    """Async iterator over the reviews of one scrape; see :meth:`ReviewFetcher.fetch`."""
+    return get_fetcher().fetch(source, company, start, end, **kwargs)
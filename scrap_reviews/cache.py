@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+__all__ = ["PageCache", "canonical_url"]
+
+
+# Query params that change how a page is fetched, not what it shows.
+_FETCH_PARAMS = {"render_js", "wait", "api_key"}
+
+
+def canonical_url(url: str) -> str:
+    """Cache key URL: unwrap the ScrapeOps proxy URL, drop fetch-only params.
+
+    ``render_js``/``wait`` do not change the reviews on a page, so a page
+    cached from a rendered fetch is reused whatever those are set to.
+    """
+    p = urlparse(url)
+    qs = parse_qsl(p.query, keep_blank_values=True)
+    if p.netloc.endswith("proxy.scrapeops.io"):
+        target = dict(qs).get("url")
+        if target:
+            return canonical_url(target)
+    qs = sorted((k, v) for k, v in qs if k not in _FETCH_PARAMS)
+    return urlunparse(
+        p._replace(netloc=p.netloc.lower(), query=urlencode(qs), fragment="")
+    )
+
+
+class PageCache:
+    """On-disk cache of downloaded pages with a size cap and LRU eviction.
+
+    Bodies are zlib-compressed and stored with their metadata in a single
+    SQLite file; when the compressed total exceeds ``max_bytes`` the least
+    recently used pages are evicted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "pages.sqlite")
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+        self.db.commit()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(canonical_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[dict]:
+        """Return the cached page for ``url`` (any age) or None."""
+        key = self.key(url)
+        row = self.db.execute(
+            "SELECT url, status, headers, body, stored_at FROM pages WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if not row:
+            return None
+        self.db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        return {
+            "url": row[0],
+            "status": row[1],
+            "headers": json.loads(row[2]),
+            "body": zlib.decompress(row[3]),
+            "stored_at": row[4],
+        }
+
+    def put(self, url: str, status: int, headers: dict, body: bytes) -> int:
+        """Store a page; return the number of pages evicted to stay under the cap."""
+        blob = zlib.compress(body, 6)
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.key(url), url, status, json.dumps(headers), blob, len(blob), now, now),
+        )
+        evicted = self._evict()
+        self.db.commit()
+        return evicted
+
+    def _evict(self) -> int:
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        evicted = 0
+        if total <= self.max_bytes:
+            return 0
+        for key, size in self.db.execute(
+            "SELECT key, size FROM pages ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM pages WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        return evicted
+
+    def close(self) -> None:
+        self.db.close()
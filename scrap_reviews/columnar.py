@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Iterable, Mapping, Optional
+
+from itemadapter import ItemAdapter
+from scrapy.exporters import BaseItemExporter
+
+from scrap_reviews.items import ReviewItem
+
+__all__ = [
+    "COLUMNAR_FORMATS",
+    "ArrowItemExporter",
+    "ColumnarWriter",
+    "ParquetItemExporter",
+    "arrow_schema",
+    "require_pyarrow",
+]
+
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Low-cardinality text columns stored as dictionary indices.
+DICTIONARY_FIELDS = frozenset({"source", "company_name"})
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "parquet/arrow export needs the optional 'pyarrow' package (pip install -e .[parquet])"
+        ) from e
+    return pyarrow
+
+
+def arrow_schema(field_names: Iterable[str], field_meta: Mapping[str, Mapping]):
+    """Arrow schema for items with ``field_names``.
+
+    ``source``/``company_name`` are dictionary-encoded strings, fields with
+    ``normalize="date"`` are ``date32`` and ``normalize="number"`` ones
+    ``float64``; everything else is a string.
+    """
+    pa = require_pyarrow()
+    columns = []
+    for name in field_names:
+        kind = (field_meta.get(name) or {}).get("normalize")
+        if name in DICTIONARY_FIELDS:
+            type_ = pa.dictionary(pa.int32(), pa.string())
+        elif kind == "date":
+            type_ = pa.date32()
+        elif kind == "number":
+            type_ = pa.float64()
+        else:
+            type_ = pa.string()
+        columns.append(pa.field(name, type_))
+    return pa.schema(columns)
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None or isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(value) -> Optional[str]:
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+class ColumnarWriter:
+    """Parquet or Arrow IPC file (a path or binary file) written ``row_group_size`` rows at a time.
+
+    Rows are buffered column by column and written as one Parquet row group
+    (or Arrow record batch) each time the buffer fills, and the remainder at
+    :meth:`close`. Dictionary columns keep one growing dictionary for the
+    whole file, so Arrow batches only ever add dictionary deltas.
+    """
+
+    def __init__(
+        self,
+        where,
+        fmt: str,
+        field_names: Iterable[str],
+        field_meta: Mapping[str, Mapping],
+        row_group_size: int = 10000,
+        compression: Optional[str] = "zstd",
+    ):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {fmt}")
+        pa = self.pa = require_pyarrow()
+        self.fmt = fmt
+        self.schema = arrow_schema(field_names, field_meta)
+        self.row_group_size = max(1, int(row_group_size))
+        self.columns: dict[str, list] = {name: [] for name in self.schema.names}
+        self.dictionaries: dict[str, dict[str, int]] = {
+            f.name: {} for f in self.schema if pa.types.is_dictionary(f.type)
+        }
+        self.converters = {}
+        for f in self.schema:
+            if f.name in self.dictionaries:
+                self.converters[f.name] = self._dictionary_code(self.dictionaries[f.name])
+            elif pa.types.is_date32(f.type):
+                self.converters[f.name] = _to_date
+            elif pa.types.is_float64(f.type):
+                self.converters[f.name] = _to_float
+            else:
+                self.converters[f.name] = _to_str
+        self.rows = 0
+        self.count = 0
+        if fmt == "parquet":
+            self.writer = pa.parquet.ParquetWriter(where, self.schema, compression=compression or "none")
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression or None, emit_dictionary_deltas=True)
+            self.writer = pa.ipc.new_file(where, self.schema, options=options)
+
+    @staticmethod
+    def _dictionary_code(codes: dict[str, int]):
+        def convert(value):
+            if value is None:
+                return None
+            value = _to_str(value)
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+            return code
+
+        return convert
+
+    def write(self, row: Mapping) -> None:
+        converters = self.converters
+        for name, values in self.columns.items():
+            values.append(converters[name](row.get(name)))
+        self.rows += 1
+        self.count += 1
+        if self.rows >= self.row_group_size:
+            self.write_row_group()
+
+    def write_row_group(self) -> None:
+        if not self.rows:
+            return
+        pa = self.pa
+        arrays = []
+        for f in self.schema:
+            values = self.columns[f.name]
+            if f.name in self.dictionaries:
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(values, pa.int32()),
+                        pa.array(list(self.dictionaries[f.name]), pa.string()),
+                    )
+                )
+            else:
+                arrays.append(pa.array(values, f.type))
+            values.clear()
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.fmt == "parquet":
+            self.writer.write_batch(batch, row_group_size=self.rows)
+        else:
+            self.writer.write_batch(batch)
+        self.rows = 0
+
+    def close(self) -> None:
+        self.write_row_group()
+        self.writer.close()
+
+
+class ColumnarItemExporter(BaseItemExporter):
+    """Feed exporter over :class:`ColumnarWriter`.
+
+    The schema comes from the first item's fields and their metadata
+    (ReviewItem's when the feed is empty).
+    """
+
+    fmt = "parquet"
+
+    def __init__(self, file, *, row_group_size: int = 10000, compression: Optional[str] = "zstd", **kwargs: Any):
+        super().__init__(dont_fail=True, **kwargs)
+        require_pyarrow()
+        self.file = file
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.writer: Optional[ColumnarWriter] = None
+
+    def _open(self, names: list[str], meta: Mapping[str, Mapping]) -> None:
+        self.writer = ColumnarWriter(self.file, self.fmt, names, meta, self.row_group_size, self.compression)
+
+    def export_item(self, item: Any) -> None:
+        adapter = ItemAdapter(item)
+        if self.writer is None:
+            names = list(self.fields_to_export or adapter.field_names())
+            self._open(names, {name: adapter.get_field_meta(name) for name in names})
+        self.writer.write(adapter)
+
+    def finish_exporting(self) -> None:
+        if self.writer is None:
+            self._open(list(ReviewItem.fields), ReviewItem.fields)
+        self.writer.close()
+
+
+class ParquetItemExporter(ColumnarItemExporter):
+    fmt = "parquet"
+
+
+class ArrowItemExporter(ColumnarItemExporter):
+    fmt = "arrow"
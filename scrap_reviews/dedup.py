@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import sqlite3
+from typing import Optional
+
+__all__ = [
+    "BloomFilter",
+    "MemoryKeyStore",
+    "SqliteKeyStore",
+    "dedup_key",
+    "open_key_store",
+    "review_dedup_key",
+]
+
+
+def dedup_key(*parts: Optional[str]) -> int:
+    """Fixed-size dedup key: signed 64-bit int of a hash over ``parts``.
+
+    Fits an SQLite INTEGER and takes a fraction of the memory of the
+    joined strings it replaces.
+    """
+    raw = "\x1f".join(p or "" for p in parts)
+    digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def review_dedup_key(
+    source: Optional[str], reviewer: Optional[str], date_iso: Optional[str], text: Optional[str]
+) -> int:
+    """:func:`dedup_key` of a review: source, reviewer, date and the first 50 chars of text.
+
+    The one review identity: dedup and the review database use it as is,
+    incremental state as hex (:func:`~scrap_reviews.utils.review_key`).
+    """
+    return dedup_key("review", source, reviewer, date_iso, (text or "")[:50])
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over :func:`dedup_key` keys.
+
+    Sized for ``capacity`` keys at ``error_rate`` false positives; the ``k``
+    bit positions are derived from the key's two 32-bit halves (double hashing).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: int):
+        key &= 0xFFFFFFFFFFFFFFFF
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: int) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class MemoryKeyStore:
+    """Keys seen by this crawl, as a set of 64-bit ints."""
+
+    persistent = False
+
+    def __init__(self):
+        self.keys: set[int] = set()
+
+    def add(self, key: int) -> bool:
+        """Record ``key``; True if it was not seen before."""
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def close(self) -> None:
+        self.keys.clear()
+
+
+class SqliteKeyStore:
+    """Keys seen by every run (and process) sharing one SQLite file.
+
+    SQLite is the source of truth: a key is new only if this store's
+    ``INSERT OR IGNORE`` added it, and each insert commits at once, so
+    other processes see it immediately and hold the write lock only for
+    one short transaction. A Bloom filter, if given, only spares the
+    write for likely repeats: a "maybe" is confirmed with a read first.
+    It is loaded from the stored keys on open and keeps its fixed size
+    whatever the file holds.
+    """
+
+    persistent = True
+    # Seconds to wait for another process's write transaction to finish.
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, path: str, bloom: Optional[BloomFilter] = None):
+        self.path = path
+        self.bloom = bloom
+        self.db = sqlite3.connect(path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+        if bloom is not None:
+            for (key,) in self.db.execute("SELECT key FROM seen"):
+                bloom.add(key)
+
+    def add(self, key: int) -> bool:
+        """Record ``key``; True if no run stored it before."""
+        if self.bloom is not None:
+            if key in self.bloom and self.db.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone():
+                return False
+            self.bloom.add(key)
+        # Autocommit: the insert is its own short write transaction.
+        return self.db.execute("INSERT OR IGNORE INTO seen VALUES (?)", (key,)).rowcount == 1
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def open_key_store(settings):
+    """Key store configured by the DEDUP_* settings."""
+    backend = (settings.get("DEDUP_BACKEND") or "memory").lower()
+    if backend == "memory":
+        return MemoryKeyStore()
+    if backend != "sqlite":
+        raise ValueError(f"Unknown DEDUP_BACKEND: {backend!r} (use 'memory' or 'sqlite')")
+    from scrapy.utils.project import data_path
+
+    path = data_path(settings.get("DEDUP_FILE"), createdir=True)
+    capacity = settings.getint("DEDUP_BLOOM_CAPACITY")
+    bloom = BloomFilter(capacity, settings.getfloat("DEDUP_BLOOM_ERROR_RATE")) if capacity > 0 else None
+    return SqliteKeyStore(path, bloom)
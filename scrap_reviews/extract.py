@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Mapping, Optional, Sequence
+
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+
+__all__ = ["LayoutPlan", "compile_css", "first_number", "first_text", "node_text"]
+
+
+_STRING = etree.XPath("string()")
+_WS_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_TRANSLATOR = HTMLTranslator()
+_NAMESPACES = {"re": "http://exslt.org/regular-expressions", "set": "http://exslt.org/sets"}
+
+
+def _raw_text(value) -> Optional[str]:
+    raw = value if isinstance(value, str) else _STRING(value)
+    v = _WS_RE.sub(" ", raw).strip()
+    return v or None
+
+
+def node_text(node) -> Optional[str]:
+    """Whitespace-collapsed text content of one selector result.
+
+    Reads the string value straight from the response's lxml tree (or the
+    attribute/text value for ``::attr``/``::text`` results) instead of
+    serializing the node and parsing it again.
+    """
+    return _raw_text(node.root)
+
+
+def first_text(sel, css_query: str) -> Optional[str]:
+    """Text of the first node matching ``css_query`` under ``sel``, or None."""
+    nodes = sel.css(css_query)
+    return node_text(nodes[0]) if nodes else None
+
+
+def first_number(text: str) -> Optional[str]:
+    """First decimal number in ``text`` (e.g. ``"4.5"`` from ``"Rated 4.5 out of 5"``)."""
+    m = _NUMBER_RE.search(text)
+    return m.group(0) if m else None
+
+
+def compile_css(css_query: str) -> etree.XPath:
+    """Precompile a (parsel-flavoured) CSS query to an lxml XPath evaluator."""
+    return etree.XPath(
+        _TRANSLATOR.css_to_xpath(css_query),
+        namespaces=_NAMESPACES,
+        smart_strings=False,
+    )
+
+
+class LayoutPlan:
+    """Card selector learned on the first page that matched, and compiled field queries.
+
+    ``cards`` is the ordered list of card container queries and ``fields``
+    maps each field to its ordered fallback queries (CSS, as the spiders
+    write them; compiled to XPath once). The first page is probed in full
+    and the card query that hit is recorded; later pages of the same crawl
+    start from it and fall back to full probing only when it stops
+    matching, at which point it is re-learned. Field queries are always
+    tried in their declared order: cards of one page can mix layouts, and a
+    fallback that matched one card must not shadow a better query on the next.
+    """
+
+    def __init__(
+        self,
+        cards: Sequence[str],
+        fields: Mapping[str, Sequence[str]],
+        *,
+        stats=None,
+        logger=None,
+        label: str = "",
+    ):
+        self.card_queries = list(cards)
+        self.card_xpaths = [compile_css(q) for q in self.card_queries]
+        self.field_queries = {name: list(qs) for name, qs in fields.items()}
+        self.field_xpaths = {name: [compile_css(q) for q in qs] for name, qs in fields.items()}
+        self.card_hit: Optional[int] = None
+        self.stats = stats
+        self.logger = logger
+        self.label = label
+        self._last: Optional[tuple] = None
+
+    @classmethod
+    def from_spider(cls, spider, label: str, cards, fields) -> "LayoutPlan":
+        crawler = getattr(spider, "crawler", None)
+        return cls(
+            cards,
+            fields,
+            stats=crawler.stats if crawler is not None else None,
+            logger=spider.logger,
+            label=label,
+        )
+
+    def _inc(self, key: str) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"layout/{key}")
+
+    def _cards_at(self, selector, i: int):
+        found = self.card_xpaths[i](selector.root)
+        cls = type(selector)
+        return selector.selectorlist_cls(
+            cls(root=el, type=selector.type, _expr=self.card_queries[i]) for el in found
+        )
+
+    def find_cards(self, response):
+        """Card selectors on ``response`` (an empty list when none match).
+
+        Repeated calls for the same response reuse the previous result.
+        """
+        if self._last is not None and self._last[0] is response:
+            return self._last[1]
+        selector = response.selector
+        found = None
+        if self.card_hit is not None:
+            found = self._cards_at(selector, self.card_hit)
+            if found:
+                self._inc("plan_hit")
+            else:
+                self._inc("relearned")
+                if self.logger is not None:
+                    self.logger.info(
+                        f"{self.label}: card selector {self.card_queries[self.card_hit]!r} "
+                        f"stopped matching on {response.url}, re-probing"
+                    )
+                self.card_hit = None
+        if not found:
+            found = []
+            for i in range(len(self.card_xpaths)):
+                cards = self._cards_at(selector, i)
+                if cards:
+                    self.card_hit, found = i, cards
+                    self._inc("learned")
+                    break
+        self._last = (response, found)
+        return found
+
+    def field(self, card, name: str, convert: Optional[Callable[[str], Optional[str]]] = None) -> Optional[str]:
+        """First non-empty value of field ``name`` in ``card``.
+
+        ``convert`` (e.g. :func:`~scrap_reviews.utils.parse_date`) turns the
+        text into the field value; a query whose value converts to None
+        counts as a miss.
+        """
+        root = card.root
+        for xpath in self.field_xpaths[name]:
+            found = xpath(root)
+            if not found:
+                continue
+            v = _raw_text(found[0])
+            if v and convert is not None:
+                v = convert(v)
+            if v:
+                return v
+        return None
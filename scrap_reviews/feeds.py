@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from typing import Any, Iterator, Optional
+
+from scrapy.exporters import JsonLinesItemExporter
+
+__all__ = ["StreamingJsonLinesItemExporter", "iter_jsonl", "open_compressed"]
+
+
+COMPRESSION_SUFFIX = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError(
+            "zstd compression needs the optional 'zstandard' package (pip install zstandard)"
+        ) from e
+    return zstandard
+
+
+def open_compressed(file, compression: Optional[str], level: Optional[int] = None):
+    """Wrap a binary file in a streaming compressor (or return it unchanged)."""
+    if not compression:
+        return file
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=level or 6)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor(level=level or 3).stream_writer(file, closefd=False)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class StreamingJsonLinesItemExporter(JsonLinesItemExporter):
+    """JSON Lines exporter that flushes every ``flush_every`` items.
+
+    Each flush pushes complete lines to disk (with a gzip sync flush or a
+    zstd block flush when compressed), so readers can consume the file while
+    it is being written and a crash loses at most the unflushed tail.
+    """
+
+    def __init__(
+        self,
+        file,
+        *,
+        compression: Optional[str] = None,
+        compresslevel: Optional[int] = None,
+        flush_every: int = 1,
+        **kwargs: Any,
+    ):
+        self.raw_file = file
+        self.compression = compression
+        self.flush_every = max(1, int(flush_every))
+        self.pending = 0
+        super().__init__(open_compressed(file, compression, compresslevel), **kwargs)
+
+    def _flush(self) -> None:
+        if self.compression == "zstd":
+            self.file.flush(_zstandard().FLUSH_BLOCK)
+        else:
+            self.file.flush()
+        self.raw_file.flush()
+        self.pending = 0
+
+    def export_item(self, item: Any) -> None:
+        super().export_item(item)
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self._flush()
+
+    def finish_exporting(self) -> None:
+        if self.compression:
+            # Ends the gzip member / zstd frame; the feed storage closes raw_file.
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    """Stream items from a (optionally .gz/.zst) JSON Lines file.
+
+    Tolerates files still being written or cut short by a crash: a truncated
+    compressed stream or a partial last line ends iteration quietly.
+    """
+    if path.endswith(".gz"):
+        raw = _iter_gzip_chunks(path)
+    elif path.endswith(".zst"):
+        raw = _iter_zstd_chunks(path)
+    else:
+        raw = _iter_plain_chunks(path)
+
+    buf = b""
+    for chunk in raw:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buf.strip():
+        try:
+            yield json.loads(buf)
+        except ValueError:
+            pass  # partially written last line
+
+
+def _iter_plain_chunks(path: str, size: int = 1 << 16) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def _iter_gzip_chunks(path: str, size: int = 1 << 16) -> Iterator[bytes]:
+    d = zlib.decompressobj(wbits=31)
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            while chunk:
+                yield d.decompress(chunk)
+                if not d.eof:
+                    break
+                # Concatenated gzip members (e.g. appended runs).
+                chunk = d.unused_data
+                d = zlib.decompressobj(wbits=31)
+
+
+def _iter_zstd_chunks(path: str, size: int = 1 << 16) -> Iterator[bytes]:
+    zstandard = _zstandard()
+    with open(path, "rb") as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        while True:
+            try:
+                chunk = reader.read(size)
+            except zstandard.ZstdError:
+                return
+            if not chunk:
+                return
+            yield chunk
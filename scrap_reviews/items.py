@@ -1,12 +1,149 @@
+from __future__ import annotations
+
+import weakref
+from collections.abc import KeysView
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Optional
+
 import scrapy
+from itemadapter import ItemAdapter
+from itemadapter.adapter import AdapterInterface
 
 
 class ReviewItem(scrapy.Item):
-    source = scrapy.Field()        # g2, capterra, etc.
-    company_name = scrapy.Field()
-    title = scrapy.Field()
-    review_text = scrapy.Field()
-    date = scrapy.Field()          # YYYY-MM-DD when possible
-    rating = scrapy.Field()
-    reviewer_name = scrapy.Field()
+    # normalize: how DataValidationPipeline cleans the field (see scrap_reviews.normalize)
+    source = scrapy.Field(normalize="text")        # g2, capterra, etc.
+    company_name = scrapy.Field(normalize="text")
+    title = scrapy.Field(normalize="text")
+    review_text = scrapy.Field(normalize="text")
+    date = scrapy.Field(normalize="date")          # YYYY-MM-DD when possible
+    rating = scrapy.Field(normalize="number")
+    reviewer_name = scrapy.Field(normalize="text")
     scraped_at = scrapy.Field()
+
+
+class _AdapterSlot:
+    # Holds the record's shared ItemAdapter; not a dataclass field, so never exported.
+    __slots__ = ("_adapter",)
+
+
+@dataclass(slots=True, weakref_slot=True)
+class ReviewRecord(_AdapterSlot):
+    """Slotted alternative to :class:`ReviewItem` (REVIEW_ITEM_CLASS).
+
+    Same fields and metadata, without a per-item dict; every pipeline stage
+    reuses one :class:`ReviewRecordAdapter` through :func:`adapter_for`.
+    """
+
+    source: Optional[str] = field(default=None, metadata={"normalize": "text"})
+    company_name: Optional[str] = field(default=None, metadata={"normalize": "text"})
+    title: Optional[str] = field(default=None, metadata={"normalize": "text"})
+    review_text: Optional[str] = field(default=None, metadata={"normalize": "text"})
+    date: Optional[str] = field(default=None, metadata={"normalize": "date"})
+    rating: Optional[float | str] = field(default=None, metadata={"normalize": "number"})
+    reviewer_name: Optional[str] = field(default=None, metadata={"normalize": "text"})
+    scraped_at: Optional[str] = None
+
+
+_RECORD_FIELDS = tuple(f.name for f in fields(ReviewRecord))
+_RECORD_META = {f.name: MappingProxyType(dict(f.metadata)) for f in fields(ReviewRecord)}
+
+
+class ReviewRecordAdapter(AdapterInterface):
+    """Adapter reading and writing :class:`ReviewRecord` slots directly.
+
+    Every field is always present (unset ones are None), so membership
+    tests need no lookup and deleting a field resets it to None.
+    """
+
+    @classmethod
+    def is_item(cls, item) -> bool:
+        return isinstance(item, ReviewRecord)
+
+    @classmethod
+    def is_item_class(cls, item_class: type) -> bool:
+        return isinstance(item_class, type) and issubclass(item_class, ReviewRecord)
+
+    @classmethod
+    def get_field_meta_from_class(cls, item_class: type, field_name: str) -> MappingProxyType:
+        return _RECORD_META[field_name]
+
+    @classmethod
+    def get_field_names_from_class(cls, item_class: type) -> list[str]:
+        return list(_RECORD_FIELDS)
+
+    def get_field_meta(self, field_name: str) -> MappingProxyType:
+        return _RECORD_META[field_name]
+
+    def field_names(self) -> KeysView:
+        return KeysView(_RECORD_META)
+
+    def __getitem__(self, field_name: str):
+        if field_name in _RECORD_META:
+            return getattr(self.item, field_name)
+        raise KeyError(field_name)
+
+    def get(self, field_name: str, default=None):
+        return getattr(self.item, field_name) if field_name in _RECORD_META else default
+
+    def __contains__(self, field_name) -> bool:
+        return field_name in _RECORD_META
+
+    def __setitem__(self, field_name: str, value) -> None:
+        if field_name not in _RECORD_META:
+            raise KeyError(f"{self.item.__class__.__name__} does not support field: {field_name}")
+        setattr(self.item, field_name, value)
+
+    def __delitem__(self, field_name: str) -> None:
+        self[field_name] = None
+
+    def __iter__(self):
+        return iter(_RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_RECORD_FIELDS)
+
+
+class _SharedRecordAdapter(ReviewRecordAdapter):
+    """The adapter :func:`adapter_for` caches on a record.
+
+    It refers back to the record weakly, so the pair forms no reference
+    cycle and both are freed by refcounting as soon as the record is
+    dropped, without waiting for the cyclic GC.
+    """
+
+    def __init__(self, item: ReviewRecord):
+        self._ref = weakref.ref(item)
+
+    @property
+    def item(self) -> ReviewRecord:
+        return self._ref()
+
+
+# Ahead of the generic dataclass adapter, so exporters use it too.
+ItemAdapter.ADAPTER_CLASSES.appendleft(ReviewRecordAdapter)
+
+
+def adapter_for(item):
+    """Adapter for ``item``; a :class:`ReviewRecord`'s one is created once and shared.
+
+    The shared adapter does not keep the record alive: hold on to the item
+    for as long as its adapter is used.
+    """
+    if isinstance(item, ReviewRecord):
+        try:
+            return item._adapter
+        except AttributeError:
+            item._adapter = _SharedRecordAdapter(item)
+            return item._adapter
+    return ItemAdapter(item)
+
+
+def item_class(settings=None) -> type:
+    """Review item class named by REVIEW_ITEM_CLASS (ReviewItem without settings)."""
+    if settings is None or not settings.get("REVIEW_ITEM_CLASS"):
+        return ReviewItem
+    from scrapy.utils.misc import load_object
+
+    return load_object(settings.get("REVIEW_ITEM_CLASS"))
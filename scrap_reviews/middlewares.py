@@ -6,6 +6,11 @@ from typing import Iterable
 
 from scrapy import signals
 from scrapy.downloadermiddlewares.useragent import UserAgentMiddleware
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse
+from scrapy.utils.defer import maybe_deferred_to_future
+from scrapy.utils.httpobj import urlparse_cached
+from twisted.internet.task import deferLater
 
 
 
@@ -80,20 +85,57 @@ class RandomUserAgentMiddleware(UserAgentMiddleware):
 
 
 class RandomDelayMiddleware:
-    def __init__(self, delay: float = 1.0, randomize: float = 2.0):
+    """Random per-slot delay that does not block the reactor.
+
+    Requests sharing a downloader slot are spaced ``delay`` plus up to
+    ``randomize`` seconds apart; the wait is an awaited timer, so requests
+    for other slots (and pipelines/feed exports) keep running meanwhile.
+    """
+
+    def __init__(self, delay: float = 1.0, randomize: float = 2.0, crawler=None):
         self.delay = delay
         self.randomize = randomize
+        self.crawler = crawler
+        self.next_slot_time: dict[str, float] = {}
 
     @classmethod
     def from_crawler(cls, crawler):
         base = float(crawler.settings.get("DOWNLOAD_DELAY", 1.0))
         rand = float(crawler.settings.get("RANDOMIZE_DOWNLOAD_DELAY", 2.0))
-        return cls(delay=base, randomize=rand)
+        return cls(delay=base, randomize=rand, crawler=crawler)
 
-    def process_request(self, request, spider):
-        # Simple blocking delay, acceptable for low concurrency
-        sleep_for = self.delay + random.uniform(0, self.randomize)
-        time.sleep(max(0.0, sleep_for))
+    def _slot_key(self, request) -> str:
+        engine = getattr(self.crawler, "engine", None)
+        downloader = getattr(engine, "downloader", None)
+        if downloader is not None and hasattr(downloader, "get_slot_key"):
+            return downloader.get_slot_key(request)
+        return request.meta.get("download_slot") or urlparse_cached(request).hostname or ""
+
+    def _reserve(self, key: str) -> float:
+        """Book the next free time on ``key`` and return how long to wait for it."""
+        now = time.monotonic()
+        start = max(now, self.next_slot_time.get(key, now))
+        self.next_slot_time[key] = start + self.delay + random.uniform(0, self.randomize)
+        return start - now
+
+    @staticmethod
+    def _attempt(request) -> tuple:
+        """Which download attempt ``request`` is: (retries, redirects) so far."""
+        return request.meta.get("retry_times", 0), len(request.meta.get("redirect_urls", ()))
+
+    async def process_request(self, request, spider):
+        # Proxy middlewares re-schedule a rewritten copy of the request with
+        # the same meta, so only delay the first pass of each attempt. Retries
+        # and redirects copy meta too, but count as a new attempt and wait.
+        attempt = self._attempt(request)
+        if request.meta.get("random_delay_done") == attempt:
+            return None
+        request.meta["random_delay_done"] = attempt
+        wait = self._reserve(self._slot_key(request))
+        if wait > 0:
+            from twisted.internet import reactor
+
+            await maybe_deferred_to_future(deferLater(reactor, wait, lambda: None))
         return None
 
 
@@ -110,3 +152,121 @@ class AntiBotDetectionMiddleware:
         if ref:
             request.headers.setdefault("Referer", ref)
         return None
+
+
+class RenderedPageCacheMiddleware:
+    """Serve review pages from a local on-disk cache.
+
+    Pages are keyed by their canonical URL (proxy wrapper and
+    ``render_js``/``wait`` ignored), so a rendered page is reused across
+    runs. Entries are fresh for ``RENDER_CACHE_TTL[source]`` seconds on the
+    first listing page and ``RENDER_CACHE_HISTORY_TTL[source]`` on deeper
+    pages, whose older reviews rarely change. With
+    ``RENDER_CACHE_WINDOW_REUSE`` an entry stored after the crawl's
+    ``end_date`` is also reused, since every review in the window already
+    existed when it was cached.
+
+    Plain (``render_js`` False) fetches from structured-data-first mode are
+    neither served nor stored, so they never stand in for a rendered page.
+    """
+
+    # Body is stored decoded, so these no longer describe it.
+    _DROP_HEADERS = {b"content-encoding", b"content-length", b"transfer-encoding"}
+
+    def __init__(self, cache, ttl: dict, history_ttl: dict, window_reuse: bool = True, stats=None):
+        self.cache = cache
+        self.ttl = ttl
+        self.history_ttl = history_ttl
+        self.window_reuse = window_reuse
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("RENDER_CACHE_ENABLED"):
+            raise NotConfigured
+        from scrapy.utils.project import data_path
+
+        from scrap_reviews.cache import PageCache
+
+        cache = PageCache(
+            data_path(settings.get("RENDER_CACHE_DIR"), createdir=True),
+            max_bytes=int(settings.getfloat("RENDER_CACHE_MAX_MB", 512) * 1024 * 1024),
+        )
+        mw = cls(
+            cache,
+            settings.getdict("RENDER_CACHE_TTL"),
+            settings.getdict("RENDER_CACHE_HISTORY_TTL"),
+            window_reuse=settings.getbool("RENDER_CACHE_WINDOW_REUSE", True),
+            stats=crawler.stats,
+        )
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    def spider_closed(self, spider):
+        self.cache.close()
+
+    def _inc(self, key: str, count: int = 1) -> None:
+        if self.stats is not None and count:
+            self.stats.inc_value(f"render_cache/{key}", count)
+
+    def _max_age(self, request, spider) -> float:
+        from scrap_reviews.cache import canonical_url
+        from scrap_reviews.pagination import page_number
+
+        source = spider.name.split("_")[0]
+        table = self.history_ttl if page_number(canonical_url(request.url)) > 1 else self.ttl
+        return float(table.get(source, table.get("default", 0)))
+
+    def _covers_window(self, stored_at: float, spider) -> bool:
+        from scrap_reviews.utils import DatePosition
+
+        window = getattr(spider, "window", None)
+        if not (self.window_reuse and window is not None and window.end_iso):
+            return False
+        stored_on = time.strftime("%Y-%m-%d", time.gmtime(stored_at))
+        return window.classify(stored_on) is DatePosition.AFTER
+
+    def process_request(self, request, spider):
+        if (
+            request.meta.get("dont_cache")
+            or request.meta.get("render_cache_checked")
+            or request.meta.get("render_js") is False
+        ):
+            return None
+        request.meta["render_cache_checked"] = True
+        entry = self.cache.get(request.url)
+        if entry is None:
+            self._inc("miss")
+            return None
+        age = time.time() - entry["stored_at"]
+        if age > self._max_age(request, spider) and not self._covers_window(entry["stored_at"], spider):
+            self._inc("stale")
+            return None
+        self._inc("hit")
+        return HtmlResponse(
+            url=entry["url"],
+            status=entry["status"],
+            headers=entry["headers"],
+            body=entry["body"],
+            request=request,
+            flags=["cached"],
+        )
+
+    def process_response(self, request, response, spider):
+        if (
+            response.status != 200
+            or "cached" in response.flags
+            or request.meta.get("dont_cache")
+            or request.meta.get("render_js") is False
+            or not isinstance(response, HtmlResponse)
+        ):
+            return response
+        headers = {
+            k.decode("latin-1"): [v.decode("latin-1") for v in vs]
+            for k, vs in response.headers.items()
+            if k.lower() not in self._DROP_HEADERS
+        }
+        self._inc("evicted", self.cache.put(response.url, response.status, headers, response.body))
+        self._inc("stored")
+        return response
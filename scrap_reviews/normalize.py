@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Mapping, Optional
+
+from scrap_reviews.utils import parse_date
+
+__all__ = ["ItemSchema", "normalize_date", "normalize_number", "normalize_text"]
+
+
+_NUMBER_RE = re.compile(r"\d+\.?\d*")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def normalize_text(value):
+    """Collapse whitespace; None for empty. Clean strings are returned as is."""
+    if value is None:
+        return None
+    # Whitespace other than " " is never printable, so this is the
+    # " ".join(value.split()) == value check without building the result.
+    if (
+        isinstance(value, str)
+        and value
+        and value[0] != " "
+        and value[-1] != " "
+        and "  " not in value
+        and value.isprintable()
+    ):
+        return value
+    return " ".join(str(value).split()) or None
+
+
+def normalize_number(value) -> Optional[float]:
+    """Float from a number or the first number in a string (``"4.5 out of 5"``)."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return value
+    if isinstance(value, int):
+        return float(value)
+    s = str(value)
+    if _NUMBER_RE.fullmatch(s):
+        return float(s)
+    m = _NUMBER_RE.search(s.replace(",", ""))
+    return float(m.group()) if m else None
+
+
+def normalize_date(value):
+    """ISO ``YYYY-MM-DD`` for a parseable date; unparseable text is kept cleaned."""
+    value = normalize_text(value)
+    if value is None or (len(value) == 10 and _ISO_DATE_RE.fullmatch(value)):
+        return value
+    return parse_date(value) or value
+
+
+NORMALIZERS: dict[str, Callable] = {
+    "text": normalize_text,
+    "number": normalize_number,
+    "date": normalize_date,
+}
+
+
+class ItemSchema:
+    """Per-field normalizers taken from an item class's ``Field(normalize=...)`` metadata.
+
+    Built once per item class; :meth:`apply` visits only the fields an
+    item actually has.
+    """
+
+    def __init__(self, fields: Mapping[str, Mapping]):
+        self.normalizers = {
+            name: NORMALIZERS[meta["normalize"]]
+            for name, meta in fields.items()
+            if meta.get("normalize")
+        }
+
+    def apply(self, adapter) -> None:
+        normalizers = self.normalizers
+        for name in list(adapter.keys()):
+            fn = normalizers.get(name)
+            if fn is None:
+                continue
+            value = adapter[name]
+            new = fn(value)
+            if new is not value:
+                adapter[name] = new
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from scrap_reviews.utils import DatePosition, DateWindow
+
+__all__ = [
+    "PageFanOut",
+    "PageTracker",
+    "card_key",
+    "detect_last_page",
+    "fanout_settings",
+    "last_page_number",
+    "page_number",
+    "page_url",
+]
+
+
+_PAGE_PARAM_RE = re.compile(r"[?&]page=(\d+)")
+
+
+def page_number(url: str) -> int:
+    """Return the ``page`` query param of ``url`` (1 when absent)."""
+    try:
+        return int(parse_qs(urlparse(url).query).get("page", ["1"])[0])
+    except ValueError:
+        return 1
+
+
+def page_url(url: str, page: int) -> str:
+    """Return ``url`` with its ``page`` query param set to ``page``."""
+    p = urlparse(url)
+    qs = parse_qs(p.query)
+    qs["page"] = [str(page)]
+    return urlunparse(p._replace(query=urlencode(qs, doseq=True)))
+
+
+def last_page_number(response) -> Optional[int]:
+    """Best-effort highest page number linked from the pagination controls."""
+    highest = None
+    for href in response.css("a::attr(href)").getall():
+        m = _PAGE_PARAM_RE.search(href)
+        if m:
+            n = int(m.group(1))
+            if highest is None or n > highest:
+                highest = n
+    return highest
+
+
+def card_key(card) -> bytes:
+    """Compact fingerprint of a review card's visible text."""
+    text = card.xpath("normalize-space(string(.))").get() or ""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+class PageTracker:
+    """Per-crawl pagination bookkeeping shared by the review spiders.
+
+    All three sources list newest reviews first, so once a page's newest
+    review falls before ``window`` every later page will too. The
+    tracker watches the dates seen on each page and sets ``stop_reason``
+    when pagination should end.
+
+    ``patience`` is the number of consecutive out-of-window pages required
+    before stopping (tolerates out-of-order listings), and ``pinned`` is the
+    number of newest cards per page to ignore (tolerates pinned/featured
+    reviews that repeat on every page).
+
+    It also detects exhausted listings: pagination stops after
+    ``max_empty`` consecutive pages with no cards or only already-seen
+    cards, or as soon as a page repeats the previous page's content (sites
+    often serve the last page again for out-of-range ``page=`` values).
+
+    In incremental mode ``known_date`` is the newest review date stored by
+    the previous run; pages older than it are treated like pages before
+    the window (stop reason ``reached_known``).
+    """
+
+    def __init__(
+        self,
+        source: str,
+        window: Optional[DateWindow] = None,
+        *,
+        early_stop: bool = True,
+        patience: int = 1,
+        pinned: int = 0,
+        max_empty: int = 2,
+        known_date: Optional[str] = None,
+        stats=None,
+        logger=None,
+    ):
+        self.source = source
+        self.window = window or DateWindow()
+        self.early_stop = early_stop
+        self.patience = max(1, int(patience))
+        self.pinned = max(0, int(pinned))
+        self.max_empty = max(1, int(max_empty))
+        self.known_date = known_date
+        self.stats = stats
+        self.logger = logger
+        self.pages_seen = 0
+        self.old_streak = 0
+        self.empty_streak = 0
+        self.keys_seen: set[bytes] = set()
+        self.last_fingerprint: Optional[int] = None
+        self.stop_reason: Optional[str] = None
+
+    @classmethod
+    def from_spider(cls, spider, source: str) -> "PageTracker":
+        settings = getattr(spider, "settings", None)
+        crawler = getattr(spider, "crawler", None)
+        kwargs = {}
+        if settings is not None:
+            kwargs = {
+                "early_stop": settings.getbool("EARLY_STOP_ENABLED", True),
+                "patience": settings.getint("EARLY_STOP_PATIENCE", 1),
+                "pinned": settings.getint("EARLY_STOP_PINNED", 0),
+                "max_empty": settings.getint("EXHAUSTION_MAX_EMPTY_PAGES", 2),
+            }
+        return cls(
+            source,
+            getattr(spider, "window", None) or DateWindow(spider.start_date, spider.end_date),
+            known_date=getattr(spider, "known_date", None),
+            stats=crawler.stats if crawler is not None else None,
+            logger=spider.logger,
+            **kwargs,
+        )
+
+    def _inc(self, key: str, count: int = 1) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"pagination/{key}", count)
+
+    def _set(self, key: str, value) -> None:
+        if self.stats is not None:
+            self.stats.set_value(f"pagination/{key}", value)
+
+    def stop(self, reason: str, response=None) -> None:
+        if self.stop_reason:
+            return
+        self.stop_reason = reason
+        self._set("stop_reason", reason)
+        msg = f"{self.source}: stopping pagination ({reason}) after {self.pages_seen} page(s)"
+        if response is not None:
+            last = last_page_number(response)
+            cur = page_number(response.url)
+            if last and last > cur:
+                self._set("pages_skipped", last - cur)
+                msg += f", skipped {last - cur} page(s) up to page {last}"
+        if self.logger is not None:
+            self.logger.info(msg)
+
+    def _cutoff(self) -> tuple[Optional[DateWindow], str]:
+        """Window whose start ends pagination, and the stop reason to report."""
+        start = self.window.start_iso if self.early_stop else None
+        if self.known_date and (not start or self.known_date > start):
+            return DateWindow(self.known_date), "reached_known"
+        return (self.window if start else None), "before_window"
+
+    def observe(
+        self,
+        response,
+        dates: Iterable[Optional[str]],
+        keys: Iterable[bytes] = (),
+    ) -> None:
+        """Record one listing page.
+
+        ``dates`` are the ISO dates and ``keys`` the :func:`card_key`
+        fingerprints of every card on it.
+        """
+        self.pages_seen += 1
+        self._inc("pages_crawled")
+
+        keys = list(keys)
+        fingerprint = hash(tuple(keys)) if keys else None
+        if fingerprint is not None and fingerprint == self.last_fingerprint:
+            self._inc("pages_repeated")
+            self.stop("repeated_page", response)
+            return
+        self.last_fingerprint = fingerprint
+
+        if not keys:
+            self.empty_streak += 1
+            self._inc("pages_empty")
+            reason = "empty_pages"
+        elif self.keys_seen.issuperset(keys):
+            self.empty_streak += 1
+            self._inc("pages_duplicate")
+            reason = "duplicate_pages"
+        else:
+            self.empty_streak = 0
+            reason = None
+        self.keys_seen.update(keys)
+        if reason and self.empty_streak >= self.max_empty:
+            self.stop(reason, response)
+            return
+
+        cutoff, reason = self._cutoff()
+        if cutoff is None:
+            return
+        dated = sorted((d for d in dates if d), reverse=True)[self.pinned:]
+        if not dated:
+            return
+        if cutoff.classify(dated[0]) is DatePosition.BEFORE:
+            self.old_streak += 1
+            self._inc("pages_before_window")
+            if self.old_streak >= self.patience:
+                self.stop(reason, response)
+        else:
+            self.old_streak = 0
+
+
+_REVIEW_COUNT_RE = re.compile(r'"reviewCount"\s*:\s*"?([\d,]+)')
+
+
+def detect_last_page(
+    response,
+    per_page: int,
+    count_queries: Iterable[str] = (),
+) -> Optional[int]:
+    """Number of the last listing page, if the first page exposes it.
+
+    Uses the pagination links when present, otherwise a total review count
+    from ``count_queries`` (CSS), microdata or JSON-LD divided by
+    ``per_page``.
+    """
+    last = last_page_number(response)
+    if last:
+        return last
+    if per_page <= 0:
+        return None
+    raw = None
+    for q in list(count_queries) + [
+        '[itemprop="reviewCount"]::attr(content)',
+        '[itemprop="reviewCount"]::text',
+    ]:
+        raw = response.css(q).get()
+        if raw:
+            break
+    if not raw:
+        for script in response.css('script[type="application/ld+json"]::text').getall():
+            m = _REVIEW_COUNT_RE.search(script)
+            if m:
+                raw = m.group(1)
+                break
+    m = re.search(r"\d[\d,]*", raw or "")
+    if not m:
+        return None
+    total = int(m.group(0).replace(",", ""))
+    return -(-total // per_page) if total else None
+
+
+def fanout_settings(settings, source: str) -> None:
+    """Size the ``<source>-pages`` download slot used by :class:`PageFanOut`.
+
+    Call from a spider's ``update_settings``; no-op unless FANOUT_ENABLED.
+    """
+    if not settings.getbool("FANOUT_ENABLED"):
+        return
+    concurrency = int(settings.getdict("FANOUT_CONCURRENCY").get(source, 1))
+    slots = dict(settings.getdict("DOWNLOAD_SLOTS"))
+    slots[f"{source}-pages"] = {
+        "concurrency": concurrency,
+        "delay": settings.getfloat("DOWNLOAD_DELAY"),
+    }
+    settings.set("DOWNLOAD_SLOTS", slots, priority="spider")
+    if settings.getint("CONCURRENT_REQUESTS") < concurrency:
+        settings.set("CONCURRENT_REQUESTS", concurrency, priority="spider")
+
+
+class PageFanOut:
+    """Windowed parallel pagination with in-order emission.
+
+    Pages ``first + 1 .. last`` are requested at most ``concurrency`` ahead
+    of the oldest page not yet emitted. Completed pages are buffered and
+    released strictly in page order (so items keep the listing's
+    newest-first order), feeding the :class:`PageTracker` in order too; once
+    it sets ``stop_reason`` no further pages are requested or emitted.
+    """
+
+    def __init__(self, tracker: PageTracker, first: int, last: int, concurrency: int):
+        self.tracker = tracker
+        self.last = last
+        self.concurrency = max(1, int(concurrency))
+        self.next_emit = first + 1
+        self.requested = first
+        self.done: dict[int, Optional[tuple]] = {}
+
+    def _schedule(self) -> list[int]:
+        if self.tracker.stop_reason:
+            return []
+        high = min(self.last, self.next_emit + self.concurrency - 1)
+        pages = list(range(self.requested + 1, high + 1))
+        self.requested = max(self.requested, high)
+        return pages
+
+    def start(self) -> list[int]:
+        """Page numbers to request up front."""
+        return self._schedule()
+
+    def complete(self, page: int, result: Optional[tuple]) -> tuple[list, list[int]]:
+        """Record a finished page and return ``(items, pages_to_request)``.
+
+        ``result`` is ``(response, items, dates, keys)``, or ``None`` for a
+        page whose download failed.
+        """
+        self.done[page] = result
+        items = []
+        while self.next_emit in self.done and not self.tracker.stop_reason:
+            result = self.done.pop(self.next_emit)
+            self.next_emit += 1
+            if result is None:
+                continue
+            response, page_items, dates, keys = result
+            items.extend(page_items)
+            self.tracker.observe(response, dates, keys)
+        if self.tracker.stop_reason:
+            self.done.clear()
+        return items, self._schedule()
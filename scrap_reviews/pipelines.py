@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import csv
+import io
+import json
 import os
-import re
 from datetime import datetime
 
 from itemadapter import ItemAdapter
-from scrapy.exporters import JsonItemExporter
-from scrapy.exceptions import DropItem
-from scrap_reviews.utils import parse_date
+from scrapy import signals
+from scrapy.exceptions import DropItem, NotConfigured
+from twisted.internet import task
+from scrap_reviews.columnar import COLUMNAR_FORMATS, ColumnarWriter, require_pyarrow
+from scrap_reviews.dedup import MemoryKeyStore, dedup_key, open_key_store, review_dedup_key
+from scrap_reviews.items import ReviewItem, adapter_for
+from scrap_reviews.normalize import ItemSchema
+from scrap_reviews.reviewdb import ReviewDatabase
+from scrap_reviews.state import ReviewState
+from scrap_reviews.utils import DatePosition, DateWindow, parse_date, review_key
 
 
 class ScrapReviewsPipeline:
@@ -16,54 +24,73 @@ class ScrapReviewsPipeline:
         return item
 
 
-class DataValidationPipeline:
-    def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
-
-        text_fields = [
-            "source",
-            "company_name",
+# Schema for plain dict items: ReviewItem's fields plus those of the
+# product/category items other spiders emit.
+DICT_ITEM_FIELDS = {
+    **ReviewItem.fields,
+    **{
+        f: {"normalize": "text"}
+        for f in (
             "product_name",
             "product_url",
             "category",
             "product_description",
             "pricing",
-            "reviewer_name",
             "reviewer_role",
             "reviewer_company",
             "reviewer_company_size",
             "reviewer_industry",
             "review_title",
-            "review_text",
             "pros",
             "cons",
             "recommendations",
-            "date",
             "review_date",
-        ]
-        for f in text_fields:
-            if f in adapter:
-                val = adapter.get(f)
-                if val is None:
-                    continue
-                cleaned = " ".join(str(val).split())
-                adapter[f] = cleaned if cleaned else None
-
-        numeric_fields = ["rating", "total_reviews", "total_products", "review_count"]
-        for f in numeric_fields:
-            if f in adapter:
-                val = adapter.get(f)
-                if val is None:
-                    adapter[f] = None
-                    continue
-                try:
-                    if isinstance(val, (int, float)):
-                        adapter[f] = float(val)
-                    else:
-                        nums = re.findall(r"\d+\.?\d*", str(val).replace(",", ""))
-                        adapter[f] = float(nums[0]) if nums else None
-                except (ValueError, TypeError):
-                    adapter[f] = None
+        )
+    },
+    **{f: {"normalize": "number"} for f in ("total_reviews", "total_products", "review_count")},
+}
+
+SOURCE_HOSTS = {"g2": "g2.com", "capterra": "capterra.com", "trustpilot": "trustpilot.com"}
+
+
+class DataValidationPipeline:
+    """Normalize fields per the item class schema and enforce required review fields.
+
+    The :class:`~scrap_reviews.normalize.ItemSchema` is built once per item
+    class from its ``Field(normalize=...)`` metadata; values already in
+    normalized form (clean text, ISO dates, floats) are left untouched.
+    """
+
+    def __init__(self):
+        self.schemas: dict[type, ItemSchema] = {}
+        self.spider_sources: dict[str, str | None] = {}
+
+    def _schema(self, item) -> ItemSchema:
+        cls = type(item)
+        schema = self.schemas.get(cls)
+        if schema is None:
+            names = ItemAdapter.get_field_names_from_class(cls)
+            if names is None:
+                fields = DICT_ITEM_FIELDS
+            else:
+                fields = {name: ItemAdapter.get_field_meta_from_class(cls, name) for name in names}
+            schema = self.schemas[cls] = ItemSchema(fields)
+        return schema
+
+    def _infer_source(self, adapter, spider) -> str | None:
+        name = getattr(spider, "name", "") or ""
+        if name not in self.spider_sources:
+            lowered = name.lower()
+            self.spider_sources[name] = next((src for src in SOURCE_HOSTS if src in lowered), None)
+        src = self.spider_sources[name]
+        if src is None:
+            pu = adapter.get("product_url") or ""
+            src = next((s for s, host in SOURCE_HOSTS.items() if host in pu), None)
+        return src
+
+    def process_item(self, item, spider):
+        adapter = adapter_for(item)
+        self._schema(item).apply(adapter)
 
         # Normalize to minimal ReviewItem schema across sources
         if "review_text" in adapter:
@@ -79,31 +106,14 @@ class DataValidationPipeline:
                     title = (text[:80] + "...") if len(text) > 80 else text
                 adapter["title"] = title
 
-            # date normalization
-            raw_date = adapter.get("date") or adapter.get("review_date")
-            if raw_date:
-                iso = parse_date(raw_date)
+            # date fallback (the schema already normalized "date" itself)
+            if not adapter.get("date") and adapter.get("review_date"):
+                iso = parse_date(adapter["review_date"])
                 if iso:
                     adapter["date"] = iso
 
-            # infer source from spider name or URL
             if not adapter.get("source"):
-                name = (getattr(spider, "name", "") or "").lower()
-                src = None
-                if "g2" in name:
-                    src = "g2"
-                elif "capterra" in name:
-                    src = "capterra"
-                elif "trustpilot" in name:
-                    src = "trustpilot"
-                else:
-                    pu = adapter.get("product_url") or ""
-                    if "g2.com" in pu:
-                        src = "g2"
-                    elif "capterra.com" in pu:
-                        src = "capterra"
-                    elif "trustpilot.com" in pu:
-                        src = "trustpilot"
+                src = self._infer_source(adapter, spider)
                 if src:
                     adapter["source"] = src
 
@@ -112,103 +122,271 @@ class DataValidationPipeline:
                 raise DropItem("Review missing review_text")
             if not adapter.get("date"):
                 raise DropItem("Review missing date")
-            if not adapter.get("title"):
-                text = adapter.get("review_text") or ""
-                adapter["title"] = (text[:80] + "...") if len(text) > 80 else text
 
         adapter["scraped_at"] = datetime.now().isoformat()
         return item
 
 
 class DuplicatesPipeline:
-    def __init__(self):
-        self.ids_seen = set()
+    """Drop items whose dedup key was seen before.
 
-    def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
+    Keys are 64-bit hashes (:func:`~scrap_reviews.dedup.dedup_key`) kept
+    per crawl in memory, or with DEDUP_BACKEND = "sqlite" in a file shared
+    by every run and process, optionally behind a Bloom filter.
+    """
 
-        item_id = None
+    def __init__(self, store=None, stats=None):
+        self.store = store if store is not None else MemoryKeyStore()
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(open_key_store(crawler.settings), crawler.stats)
+
+    def close_spider(self, spider):
+        if self.stats is not None and self.store.persistent:
+            self.stats.set_value("dedup/stored_keys", len(self.store))
+        self.store.close()
+
+    @staticmethod
+    def item_key(adapter: ItemAdapter) -> int | None:
         # Normalized review item
         if "review_text" in adapter and ("date" in adapter or "review_date" in adapter):
-            d = adapter.get("date") or adapter.get("review_date") or ""
-            reviewer = adapter.get("reviewer_name") or ""
-            src = adapter.get("source") or ""
-            snippet = (adapter.get("review_text") or "")[:50]
-            item_id = f"review_{src}_{reviewer}_{d}_{snippet}"
+            return review_dedup_key(
+                adapter.get("source"),
+                adapter.get("reviewer_name"),
+                adapter.get("date") or adapter.get("review_date"),
+                adapter.get("review_text"),
+            )
         # G2 product vs review items
-        elif "product_name" in adapter and "product_url" in adapter and "reviewer_name" not in adapter:
-            item_id = f"product_{adapter.get('product_name')}_{adapter.get('product_url')}"
-        elif "category_name" in adapter:
-            item_id = f"category_{adapter.get('category_name')}"
+        if "product_name" in adapter and "product_url" in adapter and "reviewer_name" not in adapter:
+            return dedup_key("product", str(adapter.get("product_name")), str(adapter.get("product_url")))
+        if "category_name" in adapter:
+            return dedup_key("category", str(adapter.get("category_name")))
+        return None
 
-        if not item_id:
+    def process_item(self, item, spider):
+        key = self.item_key(adapter_for(item))
+        if key is None:
             return item
-
-        if item_id in self.ids_seen:
-            raise DropItem(f"Duplicate item: {item_id}")
-        self.ids_seen.add(item_id)
+        if not self.store.add(key):
+            if self.stats is not None:
+                self.stats.inc_value("dedup/dropped")
+            raise DropItem(f"Duplicate item: {key & 0xFFFFFFFFFFFFFFFF:016x}")
         return item
 
 
-class JsonExportPipeline:
-    def __init__(self):
-        self.files = {}
-        self.exporters = {}
-        self.active_types = set()
+class IncrementalPipeline:
+    """Emit only reviews newer than the previous run's high-water mark.
+
+    The mark is loaded per (source, product) when the spider opens and
+    exposed as ``spider.known_date`` so pagination can stop at known
+    reviews. It is raised to the newest review seen only when the crawl
+    finishes cleanly, so an interrupted run never hides older reviews.
+    Only reviews from the covered start up to the mark count as known: a
+    window reaching before the covered start is a backfill, so reviews
+    there are emitted and pagination does not stop at the mark.
+    """
+
+    def __init__(self, state: ReviewState, stats=None):
+        self.state = state
+        self.stats = stats
+        self.known_date = None
+        self.known_window = DateWindow()
+        self.known_ids: set[str] = set()
+        self.window = DateWindow()
+        self.newest: dict[tuple[str, str], tuple[str, set[str]]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("INCREMENTAL_ENABLED"):
+            raise NotConfigured
+        p = cls(ReviewState.from_settings(crawler.settings), crawler.stats)
+        crawler.signals.connect(p.spider_closed, signal=signals.spider_closed)
+        return p
 
     def open_spider(self, spider):
-        os.makedirs("data", exist_ok=True)
-
-    def close_spider(self, spider):
-        for exporter in self.exporters.values():
-            exporter.finish_exporting()
-        for f in self.files.values():
-            f.close()
-
-    def _item_type(self, adapter: ItemAdapter) -> str | None:
-        if "product_name" in adapter:
-            return "review" if "reviewer_name" in adapter else "product"
-        if "category_name" in adapter:
-            return "category"
-        if "review_text" in adapter:
-            return "review"
-        return None
+        self.source = spider.name.split("_")[0]
+        self.product = ReviewState.product_key(getattr(spider, "company_name", ""))
+        self.known_date, self.known_ids, covered = self.state.get(self.source, self.product)
+        self.window = getattr(spider, "window", None) or DateWindow()
+        self.known_window = DateWindow(covered, self.known_date)
+        spider.known_date = self.known_date
+        if not self.known_date:
+            return
+        start = self.window.start_iso
+        if covered and (start is None or start < covered):
+            # The window reaches dates no run has crawled: emit those and keep
+            # paginating past the mark down to them.
+            spider.logger.info(
+                f"Incremental: {self.source}/{self.product} covered {covered}..{self.known_date}; "
+                f"window {self.window} reaches before it, backfilling"
+            )
+            if self.stats is not None:
+                self.stats.set_value("incremental/backfill", True)
+            spider.known_date = None
+        else:
+            spider.logger.info(
+                f"Incremental: {self.source}/{self.product} known up to {self.known_date}"
+            )
 
     def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
-
-        t = self._item_type(adapter)
-        if not t:
+        adapter = adapter_for(item)
+        d = adapter.get("date")
+        if "review_text" not in adapter or not d:
             return item
-
-        if t not in self.active_types:
-            filename = f"data/{t}s_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            f = open(filename, "wb")
-            exp = JsonItemExporter(f, encoding="utf-8", ensure_ascii=False, indent=2)
-            exp.start_exporting()
-            self.files[t] = f
-            self.exporters[t] = exp
-            self.active_types.add(t)
-
-        self.exporters[t].export_item(item)
+        src = adapter.get("source") or self.source
+        rid = review_key(src, adapter.get("reviewer_name"), d, adapter.get("review_text"))
+        # Known: from the covered start up to the mark; on the mark, by ID.
+        known = bool(self.known_date) and d != self.known_date and self.known_window.classify(d) is DatePosition.INSIDE
+        if known or (d == self.known_date and rid in self.known_ids):
+            if self.stats is not None:
+                self.stats.inc_value("incremental/known_dropped")
+            raise DropItem(f"Already scraped: {rid}")
+
+        key = (src, self.product)
+        best = self.newest.get(key)
+        if best is None or d > best[0]:
+            self.newest[key] = (d, {rid})
+        elif d == best[0]:
+            best[1].add(rid)
+        if self.stats is not None:
+            self.stats.inc_value("incremental/new")
         return item
 
-
-class CsvExportPipeline:
-    def __init__(self):
-        self.files = {}
-        self.csv_writers = {}
-        self.headers_written = set()
+    def spider_closed(self, spider, reason):
+        try:
+            if reason == "finished":
+                for (src, product), (d, ids) in self.newest.items():
+                    self.state.update(src, product, d, ids, self.window.start_iso, self.window.end_iso)
+        finally:
+            self.state.close()
+
+
+class _ExportSink:
+    """One output file with an in-memory write buffer."""
+
+    def __init__(self, path: str, fmt: str):
+        self.fmt = fmt
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.buffer = io.StringIO()
+        self.csv = csv.writer(self.buffer) if fmt == "csv" else None
+        self.header: list[str] | None = None
+        self.count = 0
+
+    def write(self, row: dict, line: str | None, field_names) -> None:
+        if self.fmt == "csv":
+            if self.header is None:
+                self.header = list(field_names)
+                self.csv.writerow(self.header)
+            self.csv.writerow([row.get(k) for k in self.header])
+        elif self.fmt == "jsonl":
+            self.buffer.write(line)
+            self.buffer.write("\n")
+        else:
+            self.buffer.write(",\n" if self.count else "[\n")
+            self.buffer.write(line)
+        self.count += 1
+
+    def flush(self) -> None:
+        if self.buffer.tell():
+            self.file.write(self.buffer.getvalue())
+            self.buffer.seek(0)
+            self.buffer.truncate()
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.fmt == "json":
+            self.buffer.write("\n]\n" if self.count else "[]\n")
+        self.flush()
+        self.file.close()
+
+
+class _ColumnarSink:
+    """Parquet/Arrow output; rows go out a row group at a time, not on every flush."""
+
+    def __init__(self, path: str, fmt: str, adapter, row_group_size: int, compression: str | None):
+        names = list(adapter.field_names())
+        meta = {name: adapter.get_field_meta(name) or DICT_ITEM_FIELDS.get(name, {}) for name in names}
+        self.writer = ColumnarWriter(path, fmt, names, meta, row_group_size, compression)
+
+    def write(self, row: dict, line: str | None, field_names) -> None:
+        self.writer.write(row)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ExportPipeline:
+    """Write every item to ``data/<type>s_<start>.<fmt>`` in each of EXPORT_FORMATS.
+
+    Each item is converted to a row once and JSON-encoded once; the json
+    (array, one item per line), jsonl and csv outputs are all written from
+    that. Writes are buffered and flushed every EXPORT_FLUSH_ITEMS items, by
+    a timer every EXPORT_FLUSH_INTERVAL seconds (so a slow crawl's output
+    still lands on disk while no items arrive), and at close.
+    The columnar parquet and arrow outputs (optional ``pyarrow``) are written
+    COLUMNAR_ROW_GROUP_SIZE rows at a time instead.
+    """
+
+    FORMATS = ("json", "jsonl", "csv", *COLUMNAR_FORMATS)
+
+    def __init__(
+        self,
+        formats=("json", "csv"),
+        flush_items: int = 500,
+        flush_interval: float = 5.0,
+        directory: str = "data",
+        row_group_size: int = 10000,
+        compression: str | None = "zstd",
+    ):
+        unknown = set(formats) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported export format(s): {sorted(unknown)} (use {', '.join(self.FORMATS)})")
+        self.formats = list(dict.fromkeys(formats))
+        if set(self.formats) & set(COLUMNAR_FORMATS):
+            require_pyarrow()
+        self.flush_items = max(1, int(flush_items))
+        self.flush_interval = flush_interval
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.sinks: dict[str, list[_ExportSink]] = {}
+        self.pending = 0
+        self.flush_loop = None
         self.spider_start_time = None
-        self.active_types = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        formats = settings.getlist("EXPORT_FORMATS")
+        if not formats:
+            raise NotConfigured
+        return cls(
+            formats,
+            settings.getint("EXPORT_FLUSH_ITEMS", 500),
+            settings.getfloat("EXPORT_FLUSH_INTERVAL", 5.0),
+            row_group_size=settings.getint("COLUMNAR_ROW_GROUP_SIZE", 10000),
+            compression=settings.get("COLUMNAR_COMPRESSION", "zstd"),
+        )
 
     def open_spider(self, spider):
-        os.makedirs("data", exist_ok=True)
+        os.makedirs(self.directory, exist_ok=True)
         self.spider_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.flush_interval > 0:
+            self.flush_loop = task.LoopingCall(self.flush)
+            self.flush_loop.start(self.flush_interval, now=False)
 
     def close_spider(self, spider):
-        for f in self.files.values():
-            f.close()
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        self.flush_loop = None
+        for sinks in self.sinks.values():
+            for sink in sinks:
+                sink.close()
 
     def _item_type(self, adapter: ItemAdapter) -> str | None:
         if "product_name" in adapter:
@@ -219,38 +397,100 @@ class CsvExportPipeline:
             return "review"
         return None
 
+    def _sinks(self, t: str, adapter) -> list:
+        sinks = self.sinks.get(t)
+        if sinks is None:
+            sinks = self.sinks[t] = []
+            for fmt in self.formats:
+                path = os.path.join(self.directory, f"{t}s_{self.spider_start_time}.{fmt}")
+                if fmt in COLUMNAR_FORMATS:
+                    sinks.append(_ColumnarSink(path, fmt, adapter, self.row_group_size, self.compression))
+                else:
+                    sinks.append(_ExportSink(path, fmt))
+        return sinks
+
+    def flush(self) -> None:
+        for sinks in self.sinks.values():
+            for sink in sinks:
+                sink.flush()
+        self.pending = 0
+
     def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
+        adapter = adapter_for(item)
         t = self._item_type(adapter)
         if not t:
             return item
 
         row = {}
-        for k in adapter.field_names():
-            v = adapter.get(k)
-            if isinstance(v, bytes):
-                row[k] = v.decode("utf-8", errors="ignore")
-            elif v is None:
-                row[k] = ""
-            else:
-                row[k] = str(v)
-
-        if t not in self.active_types:
-            filename = f"data/{t}s_{self.spider_start_time}.csv"
-            f = open(filename, "w", newline="", encoding="utf-8")
-            w = csv.writer(f)
-            self.files[t] = f
-            self.csv_writers[t] = w
-            self.active_types.add(t)
-            w.writerow(row.keys())
-
-        self.csv_writers[t].writerow(row.values())
+        for k, v in adapter.items():
+            row[k] = v.decode("utf-8", errors="ignore") if isinstance(v, bytes) else v
+        line = None
+        if "json" in self.formats or "jsonl" in self.formats:
+            line = json.dumps(row, ensure_ascii=False, default=str)
+        for sink in self._sinks(t, adapter):
+            sink.write(row, line, adapter.field_names())
+
+        self.pending += 1
+        if self.pending >= self.flush_items:
+            self.flush()
+        return item
+
+
+class JsonExportPipeline(ExportPipeline):
+    """JSON-only :class:`ExportPipeline` (JSON_EXPORT_FORMAT: "json" or "jsonl")."""
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            [settings.get("JSON_EXPORT_FORMAT", "json")],
+            settings.getint("EXPORT_FLUSH_ITEMS", 500),
+            settings.getfloat("EXPORT_FLUSH_INTERVAL", 5.0),
+        )
+
+
+class CsvExportPipeline(ExportPipeline):
+    """CSV-only :class:`ExportPipeline`."""
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(["csv"], settings.getint("EXPORT_FLUSH_ITEMS", 500), settings.getfloat("EXPORT_FLUSH_INTERVAL", 5.0))
+
+
+class SqliteExportPipeline:
+    """Upsert reviews into the REVIEW_DB_FILE database (REVIEW_DB_ENABLED).
+
+    Rows are keyed on :meth:`DuplicatesPipeline.item_key` and written
+    REVIEW_DB_BATCH at a time in one transaction; query them with
+    ``python -m scrap_reviews.reviewdb``.
+    """
+
+    def __init__(self, db: ReviewDatabase, stats=None):
+        self.db = db
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("REVIEW_DB_ENABLED"):
+            raise NotConfigured
+        return cls(ReviewDatabase.from_settings(crawler.settings), crawler.stats)
+
+    def close_spider(self, spider):
+        self.db.close()
+        if self.stats is not None:
+            self.stats.set_value("reviewdb/upserted", self.db.written)
+
+    def process_item(self, item, spider):
+        adapter = adapter_for(item)
+        if "review_text" in adapter and adapter.get("date"):
+            self.db.add(adapter, DuplicatesPipeline.item_key(adapter))
         return item
 
 
 class LoggingPipeline:
     def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
+        adapter = adapter_for(item)
         if "product_name" in adapter and "reviewer_name" not in adapter:
             spider.logger.info(f"Product: {adapter.get('product_name')}")
         elif "category_name" in adapter:
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Callable, Optional, Sequence
+from urllib.parse import urlparse
+
+from scrap_reviews.cache import canonical_url
+from scrap_reviews.resolver import ResolverCache
+
+__all__ = ["CandidateProbe", "CandidateState", "definitive_miss", "first_page", "probe_settings"]
+
+# Statuses that say a candidate URL does not exist. Other failures (DNS,
+# timeouts, 403/429 blocks, proxy 5xx) may be temporary.
+GONE_STATUSES = frozenset({404, 410})
+
+
+def first_page(url: str) -> str:
+    """``url`` with ``page=1`` appended unless it already names a page."""
+    if "page=" in url:
+        return url
+    sep = "&" if urlparse(url).query else "?"
+    return f"{url}{sep}page=1"
+
+
+def definitive_miss(status: Optional[int]) -> bool:
+    """Whether a failed candidate's ``status`` (None for a transport error) settles it.
+
+    True for a page fetched and judged to have no reviews (below 400) and
+    for 404/410; only those are cached as failures by the resolver.
+    """
+    return status is not None and (status < 400 or status in GONE_STATUSES)
+
+
+def probe_settings(settings, source: str) -> None:
+    """Size the ``<source>-probe`` download slot used by :class:`CandidateProbe`.
+
+    Call from a spider's ``update_settings``; no-op unless CANDIDATE_PROBE_PARALLEL.
+    """
+    if not settings.getbool("CANDIDATE_PROBE_PARALLEL"):
+        return
+    concurrency = int(settings.getdict("CANDIDATE_PROBE_CONCURRENCY").get(source, 1))
+    slots = dict(settings.getdict("DOWNLOAD_SLOTS"))
+    slots[f"{source}-probe"] = {
+        "concurrency": concurrency,
+        "delay": settings.getfloat("DOWNLOAD_DELAY"),
+    }
+    settings.set("DOWNLOAD_SLOTS", slots, priority="spider")
+    if settings.getint("CONCURRENT_REQUESTS") < concurrency:
+        settings.set("CONCURRENT_REQUESTS", concurrency, priority="spider")
+
+
+class CandidateState(Enum):
+    """Outcome of one candidate response, see :meth:`CandidateProbe.judge`."""
+
+    LATE = "late"  # another candidate already won; drop the response
+    RETRY = "retry"  # fetch the same candidate again (rendered / longer wait)
+    HIT = "hit"  # this candidate is the start URL; parse the response
+    MISS = "miss"  # no reviews here; move on to the next candidates
+
+
+class CandidateProbe:
+    """Resolution of a spider's start URL from its ``candidate_urls``.
+
+    Sequentially, candidate ``i + 1`` is requested once candidate ``i``
+    failed. With ``concurrency`` > 1, up to that many candidates are in
+    flight at once and each failure starts the next untried one; the first
+    candidate to show reviews wins and responses for the others arriving
+    later are ignored (``probe/ignored``).
+
+    With a ``resolver`` (:class:`~scrap_reviews.resolver.ResolverCache`) and
+    the spider's ``resolve_key``, the cached URL for the product is tried
+    first, recently failed candidates are skipped, and hits and definitive
+    failures (see :func:`definitive_miss`) are recorded for the next run.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        urls: Sequence[str],
+        concurrency: int = 1,
+        *,
+        stats=None,
+        logger=None,
+        resolver=None,
+        resolve_key: Optional[str] = None,
+    ):
+        self.source = source
+        self.urls = list(urls)
+        self.concurrency = max(1, int(concurrency))
+        self.stats = stats
+        self.logger = logger
+        self.resolver = resolver if resolve_key else None
+        self.resolve_key = resolve_key
+        self.resolved: Optional[int] = None
+        self.started = 0
+        self.failures: set[int] = set()
+        if self.resolver is not None:
+            self._order_from_cache()
+
+    @classmethod
+    def from_spider(cls, spider, source: str) -> "CandidateProbe":
+        settings = getattr(spider, "settings", None)
+        crawler = getattr(spider, "crawler", None)
+        concurrency = 1
+        resolver = None
+        if settings is not None and settings.getbool("CANDIDATE_PROBE_PARALLEL"):
+            concurrency = int(settings.getdict("CANDIDATE_PROBE_CONCURRENCY").get(source.lower(), 1))
+        if settings is not None and settings.getbool("RESOLVER_CACHE_ENABLED"):
+            resolver = ResolverCache.from_settings(settings)
+        return cls(
+            source,
+            getattr(spider, "candidate_urls", []),
+            concurrency,
+            stats=crawler.stats if crawler is not None else None,
+            logger=spider.logger,
+            resolver=resolver,
+            resolve_key=getattr(spider, "resolve_key", None),
+        )
+
+    def _order_from_cache(self) -> None:
+        """Put the product's cached URL first and drop recently failed candidates."""
+        key = self.source.lower()
+        resolved, failed = self.resolver.lookup(key, self.resolve_key)
+        keyed = [(canonical_url(u), u) for u in self.urls]
+        urls = [u for c, u in keyed if c not in failed and c != resolved]
+        skipped = sum(1 for c, _ in keyed if c in failed)
+        if resolved:
+            urls.insert(0, next((u for c, u in keyed if c == resolved), resolved))
+            self._inc("cache_hit")
+            self._log(f"{self.source}: resolver cache has {resolved}, trying it first")
+        if skipped:
+            self._inc("cache_skipped", skipped)
+            self._log(f"{self.source}: skipping {skipped} candidate(s) that failed recently")
+        self.urls = urls
+
+    def _log(self, msg: str) -> None:
+        if self.logger is not None:
+            self.logger.info(msg)
+
+    def _record(self, idx: int, ok: bool, cache: bool = True) -> None:
+        if self.resolver is None:
+            return
+        if cache:
+            self.resolver.record(self.source.lower(), self.resolve_key, self.urls[idx], ok)
+        if ok or self.exhausted:
+            self.resolver.close()
+            self.resolver = None
+
+    @property
+    def parallel(self) -> bool:
+        return self.concurrency > 1
+
+    @property
+    def slot(self) -> Optional[str]:
+        """Download slot for probe requests (None when sequential)."""
+        return f"{self.source.lower()}-probe" if self.parallel else None
+
+    def _inc(self, key: str, count: int = 1) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"probe/{key}", count)
+
+    def _next(self) -> list[int]:
+        if self.resolved is not None:
+            return []
+        in_flight = self.started - len(self.failures)
+        high = min(len(self.urls), self.started + self.concurrency - in_flight)
+        idxs = list(range(self.started, high))
+        self.started = max(self.started, high)
+        for _ in idxs:
+            self._inc("requested")
+        return idxs
+
+    def start(self) -> list[int]:
+        """Candidate indexes to request up front."""
+        if not self.urls and self.resolver is not None and self.logger is not None:
+            self.logger.warning(
+                f"{self.source}: every candidate URL failed recently (resolver cache); "
+                "pass --product-url or run `python -m scrap_reviews.resolver forget`"
+            )
+        return self._next()
+
+    def late(self, response) -> bool:
+        """True for a candidate response arriving after another candidate won."""
+        if self.resolved is None:
+            return False
+        self._inc("ignored")
+        if self.logger is not None:
+            self.logger.debug(f"{self.source}: ignoring candidate {response.url}, start URL already resolved")
+        return True
+
+    def judge(
+        self,
+        response,
+        rerender: Callable,
+        has_reviews: Callable,
+    ) -> tuple[CandidateState, Optional[object]]:
+        """Decide once what to do with a candidate response.
+
+        Returns the state and, for RETRY, the re-fetch request. ``rerender``
+        is the spider's re-fetch hook and ``has_reviews`` returns a short
+        description of what matched (falsy when nothing did). A HIT resolves
+        the probe, so any later call, for this or another candidate, is LATE.
+        """
+        if self.late(response):
+            return CandidateState.LATE, None
+        if response.status >= 400:
+            self._log(f"{self.source}: HTTP {response.status} on {response.url}; trying next candidate")
+            return CandidateState.MISS, None
+        request = rerender(response)
+        if request is not None:
+            return CandidateState.RETRY, request
+        found = has_reviews(response)
+        if found:
+            self._log(f"{self.source}: found reviews on {response.url}, proceeding ({found})")
+            self.resolve(int(response.meta.get("cand_idx", 0)))
+            return CandidateState.HIT, None
+        self._log(f"{self.source}: no reviews detected on {response.url}")
+        return CandidateState.MISS, None
+
+    def resolve(self, idx: int) -> None:
+        """Record candidate ``idx`` as the start URL."""
+        self.resolved = idx
+        self._inc("resolved")
+        if self.stats is not None:
+            self.stats.set_value("probe/resolved_index", idx)
+        self._record(idx, True)
+
+    def fail(self, idx: int, definitive: bool = False) -> list[int]:
+        """Record candidate ``idx`` as failed and return the indexes to request next.
+
+        Only a ``definitive`` failure is cached by the resolver; a transient
+        one (``probe/failed_transient``) is retried on the next run.
+        """
+        if idx in self.failures or self.resolved is not None:
+            return []
+        self.failures.add(idx)
+        self._inc("failed")
+        if not definitive:
+            self._inc("failed_transient")
+        self._record(idx, False, cache=definitive)
+        return self._next()
+
+    @property
+    def exhausted(self) -> bool:
+        """True once every candidate failed."""
+        return len(self.failures) == len(self.urls)
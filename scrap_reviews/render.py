@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import time
+from typing import Optional, Sequence
+
+from scrap_reviews.pagination import page_number
+from scrap_reviews.structured import plain_url, refetch_meta, rendered_url
+
+__all__ = ["RenderLadder", "page_kind"]
+
+
+def page_kind(url: str) -> str:
+    """``"first"`` for the first listing page, ``"deeper"`` for later ones."""
+    return "deeper" if page_number(url) > 1 else "first"
+
+
+class RenderLadder:
+    """Adaptive JS rendering for one crawl's listing pages.
+
+    Level 0 is a plain fetch and level ``n`` a rendered one waiting
+    ``waits[n - 1]`` ms. A page whose level shows no reviews is fetched
+    again one level up; the level that worked is remembered for this crawl
+    per page kind (first listing page vs deeper pages) for ``ttl`` seconds,
+    so later requests start there and climb at most one level past it.
+    Other crawls (other products, or other waits) learn their own. Once
+    the level expires, pages start from a plain fetch again and the ladder
+    is re-learned, stepping back down if a lower level works by then.
+    Levels are passed to the ScrapeOps proxy as ``sops_render_js``/``sops_wait``.
+
+    Counts pages with reviews per level as ``render/level_<n>``, re-fetches
+    as ``render/escalated``, pages left empty as ``render/exhausted`` and
+    expired working levels as ``render/expired``.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        waits: Sequence[int] = (),
+        enabled: bool = False,
+        ttl: float = 3600,
+        *,
+        stats=None,
+        logger=None,
+    ):
+        self.source = source
+        self.waits = [int(w) for w in waits]
+        self.enabled = enabled
+        self.ttl = ttl
+        self.stats = stats
+        self.logger = logger
+        # Working level per page kind and when it was learned.
+        self.working: dict[str, tuple[int, float]] = {}
+        self._last = None
+
+    @classmethod
+    def from_spider(cls, spider, source: str) -> "RenderLadder":
+        settings = getattr(spider, "settings", None)
+        crawler = getattr(spider, "crawler", None)
+        return cls(
+            source,
+            settings.getlist("ADAPTIVE_RENDER_WAITS") if settings is not None else (),
+            settings.getbool("ADAPTIVE_RENDER_ENABLED") if settings is not None else False,
+            settings.getfloat("ADAPTIVE_RENDER_TTL", 3600) if settings is not None else 3600,
+            stats=crawler.stats if crawler is not None else None,
+            logger=spider.logger,
+        )
+
+    def _inc(self, key: str) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"render/{key}")
+
+    @property
+    def top(self) -> int:
+        return len(self.waits)
+
+    def _working(self, kind: str) -> Optional[int]:
+        """Unexpired working level for page ``kind``, if any."""
+        entry = self.working.get(kind)
+        if entry is None:
+            return None
+        level, learned_at = entry
+        if time.monotonic() - learned_at > self.ttl:
+            del self.working[kind]
+            self._inc("expired")
+            if self.logger is not None:
+                self.logger.info(f"{self.source}: {kind} page render level {level} expired, re-learning it")
+            return None
+        return level
+
+    def start_level(self, url: str) -> int:
+        """Level to fetch ``url`` at: the working level for its kind, if known."""
+        kind = page_kind(url)
+        level = self._working(kind)
+        if level is not None:
+            return level
+        # Deeper pages render like the first page until they learn otherwise.
+        return (self._working("first") or 0) if kind == "deeper" else 0
+
+    def _apply(self, url: str, meta: dict, level: int) -> tuple[str, dict]:
+        meta = {k: v for k, v in meta.items() if k not in ("wait", "sops_render_js", "sops_wait")}
+        meta["render_level"] = level
+        if level == 0:
+            meta["render_js"] = False
+            return plain_url(url), meta
+        wait = self.waits[level - 1]
+        meta.update(render_js=True, wait=wait, sops_render_js=True, sops_wait=wait)
+        return rendered_url(url), meta
+
+    def prepare(self, url: str, meta: dict) -> tuple[str, dict]:
+        """Set a listing request's rendering to its start level when enabled."""
+        if not self.enabled:
+            return url, meta
+        level = meta.get("render_level")
+        return self._apply(url, meta, self.start_level(url) if level is None else min(level, self.top))
+
+    def escalate(self, response, found: bool):
+        """Re-fetch of ``response`` one level up when it shows no reviews, else None.
+
+        ``found`` tells whether the page had review cards or embedded reviews;
+        when it did, its level is recorded as working. A response handed on
+        to another callback is only looked at once.
+        """
+        if not self.enabled or response.status != 200 or response is self._last:
+            return None
+        self._last = response
+        level = int(response.meta.get("render_level", 0))
+        kind = page_kind(response.url)
+        working = self._working(kind)
+        if found:
+            self._inc(f"level_{level}")
+            # Any other level that works replaces the mark, lower ones too; the
+            # same level keeps its learn time, so the mark still expires.
+            if working != level:
+                self.working[kind] = (level, time.monotonic())
+                if self.logger is not None:
+                    self.logger.info(f"{self.source}: {kind} pages render at level {level} ({self._describe(level)})")
+            return None
+        # Past a known working level, an empty page is more likely past the
+        # last page than under-rendered: try one level up at most.
+        ceiling = min(self.top, working + 1) if working is not None else self.top
+        if level >= ceiling:
+            self._inc("exhausted")
+            return None
+        self._inc("escalated")
+        if self.logger is not None:
+            self.logger.info(
+                f"{self.source}: no reviews on {response.url} at {self._describe(level)}, "
+                f"retrying with {self._describe(level + 1)}"
+            )
+        url, meta = self._apply(response.url, refetch_meta(response.meta), level + 1)
+        # Skip the render cache lookup (it may hold this very page) but still store the result.
+        meta["render_cache_checked"] = True
+        return response.request.replace(url=url, meta=meta, dont_filter=True)
+
+    def _describe(self, level: int) -> str:
+        return "a plain fetch" if level == 0 else f"rendering with a {self.waits[level - 1]} ms wait"
@@ -0,0 +1,179 @@
+"""Persistent cache of resolved product review URLs.
+
+    python -m scrap_reviews.resolver show [--source g2]
+    python -m scrap_reviews.resolver set g2 "NetSuite" https://www.g2.com/products/netsuite/reviews
+    python -m scrap_reviews.resolver warm g2 "NetSuite" "Asana"
+    python -m scrap_reviews.resolver forget g2 [--company "NetSuite"]
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from typing import Optional, Sequence
+
+from scrap_reviews.cache import canonical_url
+from scrap_reviews.utils import slugify
+
+__all__ = ["ResolverCache", "resolve_key"]
+
+
+def resolve_key(product_url: Optional[str], product_slug: Optional[str], company_name: Optional[str]) -> Optional[str]:
+    """Resolver cache key for a spider's product, None with an explicit URL."""
+    if product_url:
+        return None
+    return slugify(product_slug or company_name or "") or None
+
+
+class ResolverCache:
+    """SQLite store of candidate URL outcomes per (source, product).
+
+    A candidate that showed reviews is stored as a positive entry, fresh for
+    ``ttl`` seconds; one that failed as a negative entry, fresh for
+    ``negative_ttl``. URLs are compared in :func:`canonical_url` form, so
+    the proxy wrapper and ``render_js``/``wait`` params do not matter.
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 86400, negative_ttl: float = 86400):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resolved (
+                source TEXT NOT NULL,
+                product TEXT NOT NULL,
+                url TEXT NOT NULL,
+                ok INTEGER NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (source, product, url)
+            )
+            """
+        )
+        self.db.commit()
+
+    @classmethod
+    def from_settings(cls, settings) -> "ResolverCache":
+        from scrapy.utils.project import data_path
+
+        return cls(
+            data_path(settings.get("RESOLVER_CACHE_FILE"), createdir=True),
+            settings.getfloat("RESOLVER_CACHE_TTL"),
+            settings.getfloat("RESOLVER_CACHE_NEGATIVE_TTL"),
+        )
+
+    def lookup(self, source: str, product: str) -> tuple[Optional[str], set[str]]:
+        """Fresh ``(resolved_url, failed_urls)`` for a product; URLs canonical."""
+        now = time.time()
+        resolved, failed = None, set()
+        for url, ok, checked_at in self.db.execute(
+            "SELECT url, ok, checked_at FROM resolved WHERE source = ? AND product = ? ORDER BY checked_at",
+            (source, product),
+        ):
+            if ok and now - checked_at <= self.ttl:
+                resolved = url
+            elif not ok and now - checked_at <= self.negative_ttl:
+                failed.add(url)
+        return resolved, failed
+
+    def record(self, source: str, product: str, url: str, ok: bool) -> None:
+        """Store the outcome of probing ``url``; a hit replaces earlier hits."""
+        url = canonical_url(url)
+        if ok:
+            self.db.execute(
+                "DELETE FROM resolved WHERE source = ? AND product = ? AND ok = 1",
+                (source, product),
+            )
+        self.db.execute(
+            "INSERT OR REPLACE INTO resolved VALUES (?, ?, ?, ?, ?)",
+            (source, product, url, int(ok), time.time()),
+        )
+        self.db.commit()
+
+    def forget(self, source: str, product: Optional[str] = None) -> int:
+        """Delete a source's entries (one product's if given); return rows deleted."""
+        if product is None:
+            cur = self.db.execute("DELETE FROM resolved WHERE source = ?", (source,))
+        else:
+            cur = self.db.execute("DELETE FROM resolved WHERE source = ? AND product = ?", (source, product))
+        self.db.commit()
+        return cur.rowcount
+
+    def rows(self, source: Optional[str] = None) -> list[tuple]:
+        sql = "SELECT source, product, url, ok, checked_at FROM resolved"
+        args: tuple = ()
+        if source:
+            sql += " WHERE source = ?"
+            args = (source,)
+        return self.db.execute(sql + " ORDER BY source, product, ok DESC, url", args).fetchall()
+
+    def is_fresh(self, ok: bool, checked_at: float) -> bool:
+        return time.time() - checked_at <= (self.ttl if ok else self.negative_ttl)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def warm(source: str, companies: Sequence[str], log_level: str = "WARNING") -> None:
+    """Resolve each company's reviews URL by crawling its first candidate page."""
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    spider_name = f"{source}_reviews"
+    settings = get_project_settings()
+    settings.set("RESOLVER_CACHE_ENABLED", True)
+    settings.set("ITEM_PIPELINES", {})
+    settings.set("FEEDS", {})
+    settings.set("LOG_LEVEL", log_level)
+    process = CrawlerProcess(settings=settings)
+    for company in companies:
+        process.crawl(spider_name, company_name=company, max_pages=1)
+    process.start()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from scrapy.utils.project import get_project_settings
+
+    parser = argparse.ArgumentParser(prog="python -m scrap_reviews.resolver", description=__doc__.splitlines()[0])
+    parser.add_argument("--path", help="Cache DB (default: RESOLVER_CACHE_FILE under .scrapy/)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sh = sub.add_parser("show", help="List cached URLs (* = fresh)")
+    sh.add_argument("--source")
+    st = sub.add_parser("set", help="Record a known reviews URL for a company")
+    st.add_argument("source")
+    st.add_argument("company")
+    st.add_argument("url")
+    wm = sub.add_parser("warm", help="Resolve companies by probing their candidate URLs")
+    wm.add_argument("source")
+    wm.add_argument("companies", nargs="+")
+    wm.add_argument("--log-level", default="WARNING")
+    fg = sub.add_parser("forget", help="Drop cached entries for a source or company")
+    fg.add_argument("source")
+    fg.add_argument("--company")
+    args = parser.parse_args(argv)
+
+    if args.command == "warm":
+        if args.path:
+            parser.error("warm uses RESOLVER_CACHE_FILE; --path is not supported")
+        warm(args.source, args.companies, args.log_level)
+        args.command = "show"
+
+    cache = ResolverCache(args.path) if args.path else ResolverCache.from_settings(get_project_settings())
+    try:
+        if args.command == "set":
+            cache.record(args.source, resolve_key(None, None, args.company) or "company", args.url, True)
+        elif args.command == "forget":
+            product = resolve_key(None, None, args.company) if args.company else None
+            print(f"Deleted {cache.forget(args.source, product)} entries")
+            return
+        for src, product, url, ok, checked_at in cache.rows(getattr(args, "source", None)):
+            mark = "*" if cache.is_fresh(ok, checked_at) else " "
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(checked_at))
+            print(f"{mark} {src}\t{product}\t{'ok' if ok else 'failed'}\t{when}\t{url}")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
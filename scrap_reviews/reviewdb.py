@@ -0,0 +1,225 @@
+"""SQLite database of every review scraped, keyed on the dedup key.
+
+    python -m scrap_reviews.reviewdb query --company "NetSuite" --start 2025-01-01 --end 2025-03-31
+    python -m scrap_reviews.reviewdb query --source g2 --start 2025-01-01 --format csv
+    python -m scrap_reviews.reviewdb import data/*.json*
+    python -m scrap_reviews.reviewdb stats
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from functools import lru_cache
+from typing import Iterable, Iterator, Mapping, Optional
+
+from scrap_reviews.dedup import review_dedup_key
+from scrap_reviews.state import iter_output_items
+from scrap_reviews.utils import parse_date, slugify
+
+__all__ = ["COLUMNS", "ReviewDatabase"]
+
+
+# Review fields stored, in output order.
+COLUMNS = ("source", "company_name", "title", "review_text", "date", "rating", "reviewer_name", "scraped_at")
+
+_UPSERT = f"""
+    INSERT INTO reviews (key, company, {", ".join(COLUMNS)}, updated_at)
+    VALUES (?, ?, {", ".join("?" for _ in COLUMNS)}, ?)
+    ON CONFLICT (key) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in COLUMNS if c not in ("source", "date"))},
+        updated_at = excluded.updated_at
+"""
+
+
+class ReviewDatabase:
+    """SQLite table of reviews, one row per dedup key.
+
+    Rows are buffered and upserted ``batch`` at a time in one transaction;
+    a review scraped again updates its row. ``company`` is the slugged
+    company name, so "NetSuite" and "netsuite" share rows. Indexes on
+    (company, date), (source, company, date) and (date) serve the
+    date-range slices of :meth:`query`.
+    """
+
+    def __init__(self, path: str, batch: int = 500):
+        self.path = path
+        self.batch = max(1, int(batch))
+        self.pending: list[tuple] = []
+        self.written = 0
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reviews (
+                    key INTEGER PRIMARY KEY,
+                    company TEXT NOT NULL,
+                    source TEXT,
+                    company_name TEXT,
+                    title TEXT,
+                    review_text TEXT,
+                    date TEXT,
+                    rating REAL,
+                    reviewer_name TEXT,
+                    scraped_at TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS reviews_company_date ON reviews (company, date)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS reviews_source_company_date ON reviews (source, company, date)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS reviews_date ON reviews (date)")
+
+    @classmethod
+    def from_settings(cls, settings) -> "ReviewDatabase":
+        path = settings.get("REVIEW_DB_FILE")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return cls(path, settings.getint("REVIEW_DB_BATCH", 500))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def company_key(company_name: Optional[str]) -> str:
+        return slugify(company_name or "") or "company"
+
+    def add(self, review: Mapping, key: Optional[int] = None) -> None:
+        """Queue an upsert of ``review`` (a dict or ItemAdapter) under its dedup key."""
+        if key is None:
+            key = review_dedup_key(
+                review.get("source"), review.get("reviewer_name"), review.get("date"), review.get("review_text")
+            )
+        row = [key, self.company_key(review.get("company_name"))]
+        row.extend(review.get(c) for c in COLUMNS)
+        row.append(time.time())
+        self.pending.append(tuple(row))
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        with self.db:
+            self.db.executemany(_UPSERT, self.pending)
+        self.written += len(self.pending)
+        self.pending.clear()
+
+    def query(
+        self,
+        company: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """Reviews dated ``start``..``end`` (inclusive, ISO), newest first."""
+        self.flush()
+        sql, args = self._where(company, start, end, source)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM reviews{sql} ORDER BY date DESC, key"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        for row in self.db.execute(sql, args):
+            yield dict(row)
+
+    def explain(self, company=None, start=None, end=None, source=None) -> list[str]:
+        """SQLite's query plan for :meth:`query` with these filters."""
+        sql, args = self._where(company, start, end, source)
+        plan = self.db.execute(f"EXPLAIN QUERY PLAN SELECT * FROM reviews{sql} ORDER BY date DESC", args)
+        return [row["detail"] for row in plan]
+
+    def _where(self, company, start, end, source) -> tuple[str, list]:
+        clauses, args = [], []
+        if source:
+            clauses.append("source = ?")
+            args.append(source)
+        if company:
+            clauses.append("company = ?")
+            args.append(self.company_key(company))
+        if start:
+            clauses.append("date >= ?")
+            args.append(start)
+        if end:
+            clauses.append("date <= ?")
+            args.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def counts(self) -> list[tuple]:
+        """(source, company, reviews, oldest date, newest date) per source and company."""
+        self.flush()
+        return self.db.execute(
+            "SELECT source, company, COUNT(*), MIN(date), MAX(date) FROM reviews GROUP BY source, company ORDER BY source, company"
+        ).fetchall()
+
+    def load(self, paths: Iterable[str]) -> int:
+        """Upsert the reviews in existing output files; return reviews read."""
+        count = 0
+        for path in paths:
+            for item in iter_output_items(path):
+                if item.get("review_text") and item.get("date"):
+                    self.add(item)
+                    count += 1
+        self.flush()
+        return count
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from scrapy.utils.project import get_project_settings
+
+    parser = argparse.ArgumentParser(prog="python -m scrap_reviews.reviewdb", description=__doc__.splitlines()[0])
+    parser.add_argument("--path", help="Review DB (default: REVIEW_DB_FILE)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    q = sub.add_parser("query", help="Print reviews in a date range")
+    q.add_argument("--company")
+    q.add_argument("--source")
+    q.add_argument("--start", help="Earliest date (inclusive)")
+    q.add_argument("--end", help="Latest date (inclusive)")
+    q.add_argument("--limit", type=int)
+    q.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    q.add_argument("--explain", action="store_true", help="Show the query plan instead of the reviews")
+    im = sub.add_parser("import", help="Upsert reviews from output files")
+    im.add_argument("files", nargs="*", help="Output files (default: data/*.json*)")
+    sub.add_parser("stats", help="Review counts and date spans per source and company")
+    args = parser.parse_args(argv)
+
+    store = ReviewDatabase(args.path) if args.path else ReviewDatabase.from_settings(get_project_settings())
+    try:
+        if args.command == "import":
+            files = args.files or sorted(glob.glob("data/*.json*"))
+            n = store.load(files)
+            print(f"Read {n} reviews from {len(files)} file(s) into {store.path}")
+        elif args.command == "query":
+            start = parse_date(args.start) if args.start else None
+            end = parse_date(args.end) if args.end else None
+            if args.explain:
+                for line in store.explain(args.company, start, end, args.source):
+                    print(line)
+                return
+            rows = store.query(args.company, start, end, args.source, args.limit)
+            if args.format == "csv":
+                writer = csv.writer(sys.stdout)
+                writer.writerow(COLUMNS)
+                for row in rows:
+                    writer.writerow(row.values())
+            else:
+                for row in rows:
+                    print(json.dumps(row, ensure_ascii=False))
+            return
+        for src, company, n, oldest, newest in store.counts():
+            print(f"{src}\t{company}\t{n}\t{oldest}..{newest}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
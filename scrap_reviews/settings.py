@@ -46,11 +46,14 @@ DEFAULT_REQUEST_HEADERS = {
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 SPIDER_MIDDLEWARES = {
     "scrap_reviews.middlewares.ScrapReviewsSpiderMiddleware": 543,
+    # Closest to the spider: times the callbacks themselves (TIMING_ENABLED)
+    "scrap_reviews.timing.ParseTimingMiddleware": 950,
 }
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
+    "scrap_reviews.middlewares.RenderedPageCacheMiddleware": 350,
     "scrap_reviews.middlewares.ScrapReviewsDownloaderMiddleware": 543,
     "scrap_reviews.middlewares.RandomUserAgentMiddleware": 400,
     "scrap_reviews.middlewares.RandomDelayMiddleware": 401,
@@ -60,18 +63,19 @@ DOWNLOADER_MIDDLEWARES = {
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-#EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-#}
+EXTENSIONS = {
+    "scrap_reviews.timing.StageTiming": 500,
+}
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 ITEM_PIPELINES = {
     "scrap_reviews.pipelines.DataValidationPipeline": 300,
     "scrap_reviews.pipelines.DuplicatesPipeline": 400,
+    "scrap_reviews.pipelines.IncrementalPipeline": 450,
     "scrap_reviews.pipelines.LoggingPipeline": 500,
-    "scrap_reviews.pipelines.JsonExportPipeline": 600,
-    "scrap_reviews.pipelines.CsvExportPipeline": 700,
+    "scrap_reviews.pipelines.ExportPipeline": 600,
+    "scrap_reviews.pipelines.SqliteExportPipeline": 650,
 }
 
 
@@ -80,11 +84,135 @@ AUTOTHROTTLE_ENABLED = True
 # Set settings whose default value is deprecated to a future-proof value
 FEED_EXPORT_ENCODING = "utf-8"
 
+# Streaming JSON Lines feed format (FEEDS "format": "jsonl")
+FEED_EXPORTERS = {
+    "jsonl": "scrap_reviews.feeds.StreamingJsonLinesItemExporter",
+    "parquet": "scrap_reviews.columnar.ParquetItemExporter",
+    "arrow": "scrap_reviews.columnar.ArrowItemExporter",
+}
+
+# ExportPipeline: data/<type>s_<start>.<format> for each of EXPORT_FORMATS
+# ("json" array, "jsonl", "csv", and with pyarrow installed "parquet" and
+# "arrow"), all written from one serialization of each item. The json array
+# holds one compact item per line. Buffered; flushed every EXPORT_FLUSH_ITEMS
+# items and every EXPORT_FLUSH_INTERVAL seconds (0: only by count and at
+# close). (JsonExportPipeline/CsvExportPipeline are single-format variants;
+# JSON_EXPORT_FORMAT picks "json" or "jsonl" for the former.)
+EXPORT_FORMATS = ["json", "csv"]
+EXPORT_FLUSH_ITEMS = 500
+EXPORT_FLUSH_INTERVAL = 5.0
+
+# Columnar outputs (ExportPipeline "parquet"/"arrow" formats, --columnar feeds):
+# rows per Parquet row group / Arrow record batch, and the codec for both
+# ("zstd", "snappy" (parquet only), "lz4", or None). source/company_name are
+# dictionary-encoded and date is a date32 column. Needs pip install -e .[parquet].
+COLUMNAR_ROW_GROUP_SIZE = 10000
+COLUMNAR_COMPRESSION = "zstd"
+
 # Retry settings
 RETRY_ENABLED = True
 RETRY_TIMES = 3
 RETRY_HTTP_CODES = [500, 502, 503, 504, 408, 429, 403]
 
+# Pagination early stop: sources list newest first, so stop once a page's
+# newest review is before start_date. PATIENCE = consecutive old pages to
+# tolerate, PINNED = newest cards per page to ignore (pinned/featured).
+EARLY_STOP_ENABLED = True
+EARLY_STOP_PATIENCE = 1
+EARLY_STOP_PINNED = 0
+
+# Stop after this many consecutive pages with no cards or only already-seen
+# cards; a page identical to the previous one stops immediately.
+EXHAUSTION_MAX_EMPTY_PAGES = 2
+
+# Parallel pagination: when the first page exposes the last page number or
+# total review count, request the remaining pages up front, at most
+# FANOUT_CONCURRENCY[source] at a time. Items are still emitted in page order.
+FANOUT_ENABLED = False
+FANOUT_CONCURRENCY = {"g2": 4, "capterra": 2, "trustpilot": 4}
+
+# Local cache of rendered pages (see RenderedPageCacheMiddleware). TTLs in
+# seconds per source: *_TTL for the first listing page, *_HISTORY_TTL for
+# deeper pages whose older reviews rarely change.
+RENDER_CACHE_ENABLED = False
+RENDER_CACHE_DIR = "render_cache"  # under the project .scrapy/ dir
+RENDER_CACHE_MAX_MB = 512
+RENDER_CACHE_TTL = {"g2": 6 * 3600, "capterra": 6 * 3600, "trustpilot": 3600}
+RENDER_CACHE_HISTORY_TTL = {"g2": 7 * 86400, "capterra": 7 * 86400, "trustpilot": 2 * 86400}
+RENDER_CACHE_WINDOW_REUSE = True
+
+# Incremental mode: only emit reviews newer than the previous run's
+# high-water mark per (source, product), stored in .scrapy/<file>.
+INCREMENTAL_ENABLED = False
+INCREMENTAL_STATE_FILE = "review_state.sqlite"
+
+# Structured-data-first: fetch listing pages without JS rendering and take
+# reviews from embedded __NEXT_DATA__ state or JSON-LD; pages without them are
+# re-fetched rendered. structured/pages_rendered vs pages_plain stats show the mix.
+STRUCTURED_DATA_FIRST = False
+
+# Adaptive rendering: fetch listing pages plain first and re-fetch rendered,
+# waiting each of ADAPTIVE_RENDER_WAITS (ms) in turn, only while no reviews show.
+# The level that worked is reused by the crawl per page kind for
+# ADAPTIVE_RENDER_TTL seconds, then re-learned from a plain fetch (render/level_<n>,
+# render/expired stats). Takes over from STRUCTURED_DATA_FIRST's re-fetch.
+ADAPTIVE_RENDER_ENABLED = False
+ADAPTIVE_RENDER_WAITS = [2000, 4000, 8000]
+ADAPTIVE_RENDER_TTL = 3600
+
+# Candidate URL probing (no --product-url): request up to
+# CANDIDATE_PROBE_CONCURRENCY[source] candidates at once and keep the first that
+# shows reviews; the others are ignored (probe/* stats). Off: one by one.
+CANDIDATE_PROBE_PARALLEL = False
+CANDIDATE_PROBE_CONCURRENCY = {"g2": 4, "capterra": 6, "trustpilot": 2}
+
+# Resolver cache (no --product-url): remember per (source, company/slug) the
+# candidate URL that showed reviews and the ones that failed, in .scrapy/<file>.
+# Hits are tried first for RESOLVER_CACHE_TTL seconds; definitive failures (no
+# reviews on the page, 404/410) are skipped for RESOLVER_CACHE_NEGATIVE_TTL, while
+# transport errors, blocks and 5xx are not cached. Inspect/pre-warm: python -m scrap_reviews.resolver
+RESOLVER_CACHE_ENABLED = False
+RESOLVER_CACHE_FILE = "resolver_cache.sqlite"
+RESOLVER_CACHE_TTL = 30 * 86400
+RESOLVER_CACHE_NEGATIVE_TTL = 86400
+
+# Review item type the spiders emit: the dict-backed scrapy Item, or the
+# slotted "scrap_reviews.items.ReviewRecord" (less memory per review, one
+# shared ItemAdapter across pipeline stages).
+REVIEW_ITEM_CLASS = "scrap_reviews.items.ReviewItem"
+
+# Deduplication (DuplicatesPipeline): "memory" keeps 64-bit item keys for one
+# crawl; "sqlite" keeps them in .scrapy/<DEDUP_FILE> so later runs and other
+# processes drop reviews already scraped. Each key commits at once, so
+# concurrent runs see each other's keys. DEDUP_BLOOM_CAPACITY > 0 puts a
+# fixed-size Bloom filter in front so likely repeats are confirmed with a read
+# instead of a write.
+DEDUP_BACKEND = "memory"
+DEDUP_FILE = "dedup.sqlite"
+DEDUP_BLOOM_CAPACITY = 0
+DEDUP_BLOOM_ERROR_RATE = 0.001
+
+# Review database (SqliteExportPipeline, main.py --db): upsert every review into
+# one SQLite file keyed on its dedup key, REVIEW_DB_BATCH rows per transaction,
+# indexed for (source,) company and date-range queries:
+# python -m scrap_reviews.reviewdb query --company X --start ... --end ...
+REVIEW_DB_ENABLED = False
+REVIEW_DB_FILE = "data/reviews.sqlite"
+REVIEW_DB_BATCH = 500
+
+# Stage timing (main.py --timing): download latency per source and page,
+# callback CPU time per page, process_item time per pipeline and items/s, as
+# timing/* crawl stats plus a JSON report at close. TIMING_PROMETHEUS_FILE (e.g.
+# "data/timing/{spider}.prom") also writes them in Prometheus text format.
+# {spider} and {start} in the paths become the spider name and start time.
+TIMING_ENABLED = False
+TIMING_REPORT_FILE = "data/timing/{spider}_{start}.json"
+TIMING_PROMETHEUS_FILE = None
+
+# Batch mode (main.py --jobs): crawls running at once, overall and per source
+BATCH_CONCURRENCY = 4
+BATCH_SOURCE_CONCURRENCY = {"g2": 2, "capterra": 2, "trustpilot": 2}
+
 # User agent rotation
 USER_AGENT_LIST = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
@@ -0,0 +1,330 @@
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+
+import scrapy
+from scrapy.spidermiddlewares.httperror import HttpError
+
+from scrap_reviews.extract import LayoutPlan, first_number
+from scrap_reviews.items import item_class
+from scrap_reviews.pagination import (
+    PageFanOut,
+    PageTracker,
+    card_key,
+    detect_last_page,
+    fanout_settings,
+    page_number,
+    page_url,
+)
+from scrap_reviews.probe import CandidateProbe, CandidateState, definitive_miss, first_page, probe_settings
+from scrap_reviews.render import RenderLadder
+from scrap_reviews.resolver import resolve_key
+from scrap_reviews.structured import StructuredFirst, rendered_url, structured_page
+from scrap_reviews.utils import DateWindow, parse_date
+
+
+class ReviewSpider(scrapy.Spider):
+    """Shared crawl logic of the review spiders, parameterized by ``source``.
+
+    Subclasses set ``name``, ``source`` (the item/settings key, e.g.
+    ``"g2"``), ``label`` (for logs and stats), the layout queries and
+    :meth:`_candidates`; everything else (candidate probing, rendering,
+    structured data, pagination and fan-out) lives here.
+    """
+
+    source = ""
+    label = ""
+
+    # Probing order for review cards and each card field (see LayoutPlan).
+    CARD_QUERIES: list = []
+    FIELD_QUERIES: dict = {}
+    # Next-page link on a listing page (the page= parameter is bumped otherwise).
+    NEXT_PAGE_QUERY = 'a[rel="next"]::attr(href)'
+    # Star icons counted when no rating field matches (None: no fallback).
+    STAR_QUERY = None
+    # Extra meta for candidate requests.
+    CANDIDATE_META: dict = {}
+
+    def __init__(
+        self,
+        company_name: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        product_url: str | None = None,
+        product_slug: str | None = None,
+        max_pages: int | None = None,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.company_name = company_name or ""
+        self.start_date = start_date
+        self.end_date = end_date
+        self.window = DateWindow(start_date, end_date)
+        self.max_pages = int(max_pages) if max_pages else None
+        self.resolve_key = resolve_key(product_url, product_slug, self.company_name)
+        self.candidate_urls = [rendered_url(u) for u in self._candidates(product_url, product_slug)]
+
+        self.page = 1
+        self.pager = None
+        self.fanout = None
+        self.layout = None
+        self.structured = None
+        self.render = None
+        self.probe = None
+        self.item_cls = None
+
+    @classmethod
+    def update_settings(cls, settings):
+        super().update_settings(settings)
+        fanout_settings(settings, cls.source)
+        probe_settings(settings, cls.source)
+
+    def _candidates(self, product_url: str | None, product_slug: str | None) -> list[str]:
+        """Candidate review listing URLs for the product, most likely first."""
+        raise NotImplementedError
+
+    def _structured(self) -> StructuredFirst:
+        if self.structured is None:
+            self.structured = StructuredFirst.from_spider(self, self.label)
+        return self.structured
+
+    def _render(self) -> RenderLadder:
+        if self.render is None:
+            self.render = RenderLadder.from_spider(self, self.label)
+        return self.render
+
+    def _listing_request(self, url: str, **kwargs):
+        """Request for a listing page: rendered, plain (structured-data-first) or at the adaptive level."""
+        wait = self.settings.getint("SCRAPEOPS_WAIT_MS", 2000)
+        meta = {"render_js": True, "wait": wait, **kwargs.pop("meta", {})}
+        url = rendered_url(url)
+        if self._render().enabled:
+            url, meta = self._render().prepare(url, meta)
+        else:
+            url, meta = self._structured().prepare(url, meta)
+        return scrapy.Request(url, meta=meta, **kwargs)
+
+    def _shows_reviews(self, response) -> bool:
+        """Whether a listing page holds reviews in any form the spider reads."""
+        return bool(self._structured().extract(response) or self._find_cards(response))
+
+    def _rerender(self, response):
+        """Re-fetch of a listing page that showed no reviews (adaptive or structured mode), else None."""
+        if self._render().enabled:
+            return self._render().escalate(response, self._shows_reviews(response))
+        return self._structured().rerender(response)
+
+    def _probe(self) -> CandidateProbe:
+        if self.probe is None:
+            self.probe = CandidateProbe.from_spider(self, self.label)
+        return self.probe
+
+    def _candidate_request(self, idx: int):
+        probe = self._probe()
+        url = first_page(probe.urls[idx])
+        self.logger.info(f"{self.label}: trying candidate URL {idx + 1}/{len(probe.urls)} -> {url}")
+        meta = {"cand_idx": idx, **self.CANDIDATE_META}
+        if probe.slot:
+            meta["download_slot"] = probe.slot
+        return self._listing_request(url, callback=self.try_start, errback=self.candidate_failed, meta=meta)
+
+    def _next_candidates(self, request, definitive: bool = False):
+        """Requests for the candidates to try after ``request``'s one failed."""
+        probe = self._probe()
+        for idx in probe.fail(int(request.meta.get("cand_idx", 0)), definitive):
+            yield self._candidate_request(idx)
+        if probe.exhausted:
+            self.logger.warning(
+                f"No valid {self.label} reviews URL found for company={self.company_name}. Tried: {probe.urls}"
+            )
+
+    def candidate_failed(self, failure):
+        idx = int(failure.request.meta.get("cand_idx", 0))
+        self.logger.info(f"{self.label}: candidate {self._probe().urls[idx]} failed ({failure.value!r})")
+        status = failure.value.response.status if failure.check(HttpError) else None
+        yield from self._next_candidates(failure.request, definitive_miss(status))
+
+    def start_requests(self):
+        for idx in self._probe().start():
+            yield self._candidate_request(idx)
+
+    def _has_reviews(self, response) -> str | None:
+        """What shows reviews on a candidate page (for the log), or None."""
+        if self._structured().extract(response):
+            return "embedded"
+        # Probes with the layout plan so parse() reuses the matched cards.
+        if self._find_cards(response):
+            return f"css: {self.layout.card_queries[self.layout.card_hit]}"
+        return None
+
+    def try_start(self, response):
+        """Candidate response: exactly one of drop, re-fetch, crawl or next candidate."""
+        state, request = self._probe().judge(response, self._rerender, self._has_reviews)
+        if state is CandidateState.RETRY:
+            yield request
+        elif state is CandidateState.HIT:
+            yield from self.parse(response)
+        elif state is CandidateState.MISS:
+            yield from self._next_candidates(response, definitive_miss(response.status))
+
+    def _extract_rating(self, card) -> str | None:
+        v = self._layout().field(card, "rating", first_number)
+        if v or not self.STAR_QUERY:
+            return v
+        stars = card.css(self.STAR_QUERY).getall()
+        if stars:
+            return str(len(stars))
+        return None
+
+    def _item_cls(self) -> type:
+        if self.item_cls is None:
+            self.item_cls = item_class(getattr(self, "settings", None))
+        return self.item_cls
+
+    def _layout(self) -> LayoutPlan:
+        if self.layout is None:
+            self.layout = LayoutPlan.from_spider(self, self.label, self.CARD_QUERIES, self.FIELD_QUERIES)
+        return self.layout
+
+    def _extract_date(self, card) -> str | None:
+        return self._layout().field(card, "date", parse_date)
+
+    def _find_cards(self, response):
+        return self._layout().find_cards(response)
+
+    def _parse_cards(self, response, cards):
+        """Return ``(items, dates, keys)`` for the review cards of one page."""
+        self.logger.info(f"{self.label}: detected {len(cards)} review containers on {response.url}")
+        layout = self._layout()
+        items = []
+        if not cards:
+            self.logger.warning(f"No review cards found for {response.url}")
+        page_dates = []
+        page_keys = []
+        for card in cards:
+            date_iso = self._extract_date(card)
+            page_dates.append(date_iso)
+            page_keys.append(card_key(card))
+            if date_iso not in self.window:
+                continue
+
+            title = layout.field(card, "title")
+            body = layout.field(card, "body")
+            if not title and body:
+                t = body.strip()
+                title = (t[:80] + "...") if len(t) > 80 else t
+            reviewer = layout.field(card, "reviewer")
+
+            if not body or not date_iso:
+                continue
+            items.append(
+                self._item_cls()(
+                    source=self.source,
+                    company_name=self.company_name,
+                    title=title,
+                    review_text=body,
+                    date=date_iso,
+                    rating=self._extract_rating(card),
+                    reviewer_name=reviewer,
+                )
+            )
+
+        self.logger.info(
+            f"{self.label}: kept {len(items)} of {len(cards)} within {self.start_date}..{self.end_date} on {response.url}"
+        )
+        return items, page_dates, page_keys
+
+    def _page_items(self, response):
+        """``(items, dates, keys)`` from embedded data if present, else from review cards.
+
+        Subclasses may return None to hand the page to :meth:`_fallback_items`.
+        """
+        reviews = self._structured().extract(response)
+        if reviews:
+            return structured_page(reviews, self.source, self.company_name, self.window, self._item_cls())
+        return self._parse_cards(response, self._find_cards(response))
+
+    def _fallback_items(self, response):
+        """Items of a page :meth:`_page_items` could not read (no pagination follows)."""
+        return []
+
+    def parse(self, response):
+        rerender = self._rerender(response)
+        if rerender is not None:
+            yield rerender
+            return
+        page = self._page_items(response)
+        if page is None:
+            yield from self._fallback_items(response)
+            return
+        items, page_dates, page_keys = page
+        yield from items
+
+        if self.pager is None:
+            self.pager = PageTracker.from_spider(self, self.label)
+        self.pager.observe(response, page_dates, page_keys)
+        if self.pager.stop_reason:
+            return
+
+        if self.max_pages and self.page >= self.max_pages:
+            self.pager.stop("max_pages", response)
+            return
+
+        if self.fanout is None and self.settings.getbool("FANOUT_ENABLED"):
+            first = page_number(response.url)
+            last = detect_last_page(response, len(page_dates))
+            if last and self.max_pages:
+                last = min(last, first + self.max_pages - self.page)
+            if last and last > first:
+                concurrency = self.settings.getdict("FANOUT_CONCURRENCY").get(self.source, 1)
+                self.fanout = PageFanOut(self.pager, first, last, concurrency)
+                self.logger.info(f"{self.label}: fanning out pages {first + 1}..{last} ({concurrency} at a time)")
+                for n in self.fanout.start():
+                    yield self._page_request(response.url, n)
+                return
+
+        next_href = response.css(self.NEXT_PAGE_QUERY).get()
+        next_url = urljoin(response.url, next_href) if next_href else None
+
+        if not next_url:
+            # fallback by incrementing page param
+            p = urlparse(response.url)
+            qs = parse_qs(p.query)
+            cur = int(qs.get("page", ["1"])[0])
+            qs["page"] = [str(cur + 1)]
+            next_url = urlunparse(p._replace(query=urlencode(qs, doseq=True)))
+
+        self.page += 1
+        if next_url:
+            yield self._listing_request(next_url, callback=self.parse)
+
+    def _page_request(self, url: str, page: int):
+        return self._listing_request(
+            page_url(url, page),
+            callback=self.parse_fanned,
+            errback=self.fanout_failed,
+            cb_kwargs={"page": page},
+            meta={"download_slot": f"{self.source}-pages"},
+        )
+
+    def parse_fanned(self, response, page):
+        rerender = self._rerender(response)
+        if rerender is not None:
+            yield rerender
+            return
+        result = self._page_items(response)
+        if result is None:
+            result = list(self._fallback_items(response)), [], []
+        items, page_dates, page_keys = result
+        ready, pages = self.fanout.complete(page, (response, items, page_dates, page_keys))
+        yield from ready
+        for n in pages:
+            yield self._page_request(response.url, n)
+
+    def fanout_failed(self, failure):
+        request = failure.request
+        page = request.cb_kwargs["page"]
+        self.logger.warning(f"{self.label}: page {page} failed ({failure.value!r}), skipping it")
+        ready, pages = self.fanout.complete(page, None)
+        yield from ready
+        for n in pages:
+            yield self._page_request(request.url, n)
@@ -0,0 +1,187 @@
+"""Persistent per-product high-water marks for incremental scraping.
+
+    python -m scrap_reviews.state show
+    python -m scrap_reviews.state rebuild data/*.json*
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import sqlite3
+import time
+from typing import Iterable, Iterator, Optional
+
+from scrap_reviews.feeds import iter_jsonl
+from scrap_reviews.utils import review_key, slugify
+
+__all__ = ["ReviewState", "iter_output_items"]
+
+
+class ReviewState:
+    """SQLite store of the newest review date and IDs seen per (source, product).
+
+    ``newest_ids`` holds every review ID seen on ``newest_date``, so reviews
+    sharing the high-water date are still told apart on the next run.
+    ``covered_start`` is where the dates already scraped begin (NULL: from
+    the oldest review); reviews older than it were never crawled.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS high_water (
+                source TEXT NOT NULL,
+                product TEXT NOT NULL,
+                newest_date TEXT NOT NULL,
+                newest_ids TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                covered_start TEXT,
+                PRIMARY KEY (source, product)
+            )
+            """
+        )
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(high_water)")}
+        if "covered_start" not in columns:
+            # Marks from before coverage was tracked only vouch for their own date.
+            self.db.execute("ALTER TABLE high_water ADD COLUMN covered_start TEXT")
+            self.db.execute("UPDATE high_water SET covered_start = newest_date")
+        self.db.commit()
+
+    @classmethod
+    def from_settings(cls, settings) -> "ReviewState":
+        from scrapy.utils.project import data_path
+
+        return cls(data_path(settings.get("INCREMENTAL_STATE_FILE"), createdir=True))
+
+    @staticmethod
+    def product_key(company_name: Optional[str]) -> str:
+        return slugify(company_name or "") or "company"
+
+    def get(self, source: str, product: str) -> tuple[Optional[str], set[str], Optional[str]]:
+        """``(newest_date, newest_ids, covered_start)``; ``(None, set(), None)`` if unknown."""
+        row = self.db.execute(
+            "SELECT newest_date, newest_ids, covered_start FROM high_water WHERE source = ? AND product = ?",
+            (source, product),
+        ).fetchone()
+        if not row:
+            return None, set(), None
+        return row[0], set(json.loads(row[1])), row[2]
+
+    def update(
+        self,
+        source: str,
+        product: str,
+        date_iso: str,
+        ids: Iterable[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> None:
+        """Record a finished crawl of ``start``..``end`` whose newest review is ``date_iso``.
+
+        The mark rises to ``date_iso`` if newer. The covered range grows by
+        the crawl's window when the two touch; a crawl starting after the
+        mark leaves a gap, so coverage restarts at its ``start``, and one
+        ending before the covered start changes nothing.
+        """
+        cur_date, cur_ids, cur_start = self.get(source, product)
+        if cur_date is None:
+            covered = start
+        elif start is not None and start > cur_date:
+            covered = start
+        elif cur_start is not None and end is not None and end < cur_start:
+            return
+        else:
+            covered = None if start is None or cur_start is None else min(start, cur_start)
+        if cur_date and date_iso < cur_date:
+            date_iso, ids = cur_date, cur_ids
+        new_ids = set(ids) | (cur_ids if cur_date == date_iso else set())
+        self.db.execute(
+            "INSERT OR REPLACE INTO high_water VALUES (?, ?, ?, ?, ?, ?)",
+            (source, product, date_iso, json.dumps(sorted(new_ids)), time.time(), covered),
+        )
+        self.db.commit()
+
+    def rows(self) -> list[tuple]:
+        return self.db.execute(
+            "SELECT source, product, newest_date, newest_ids, updated_at, covered_start"
+            " FROM high_water ORDER BY source, product"
+        ).fetchall()
+
+    def rebuild(self, paths: Iterable[str]) -> int:
+        """Recompute high-water marks from existing output files; return items read."""
+        marks: dict[tuple[str, str], tuple[str, set[str]]] = {}
+        oldest: dict[tuple[str, str], str] = {}
+        count = 0
+        for path in paths:
+            for item in iter_output_items(path):
+                src, d = item.get("source"), item.get("date")
+                if not (src and d):
+                    continue
+                count += 1
+                key = (src, self.product_key(item.get("company_name")))
+                rid = review_key(src, item.get("reviewer_name"), d, item.get("review_text"))
+                best = marks.get(key)
+                if best is None or d > best[0]:
+                    marks[key] = (d, {rid})
+                elif d == best[0]:
+                    best[1].add(rid)
+                if key not in oldest or d < oldest[key]:
+                    oldest[key] = d
+        for key, (d, ids) in marks.items():
+            # Outputs only vouch for dates from their oldest review on.
+            self.update(*key, d, ids, start=oldest[key])
+        return count
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def iter_output_items(path: str) -> Iterator[dict]:
+    """Yield items from a JSON array or (compressed) JSON Lines output file."""
+    if path.endswith((".jsonl", ".gz", ".zst")):
+        yield from iter_jsonl(path)
+        return
+    with open(path, encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == "[":
+            for item in json.load(f):
+                if isinstance(item, dict):
+                    yield item
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from scrapy.utils.project import get_project_settings
+
+    parser = argparse.ArgumentParser(prog="python -m scrap_reviews.state", description=__doc__.splitlines()[0])
+    parser.add_argument("--path", help="State DB (default: INCREMENTAL_STATE_FILE under .scrapy/)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("show", help="List high-water marks")
+    rb = sub.add_parser("rebuild", help="Rebuild marks from output files")
+    rb.add_argument("files", nargs="*", help="Output files (default: data/*.json*)")
+    args = parser.parse_args(argv)
+
+    state = ReviewState(args.path) if args.path else ReviewState.from_settings(get_project_settings())
+    try:
+        if args.command == "rebuild":
+            files = args.files or sorted(glob.glob("data/*.json*"))
+            n = state.rebuild(files)
+            print(f"Read {n} reviews from {len(files)} file(s) into {state.path}")
+        for src, product, d, ids, _, covered in state.rows():
+            print(f"{src}\t{product}\t{covered or '...'}..{d}\t{len(json.loads(ids))} id(s)")
+    finally:
+        state.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Iterator, Optional
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from scrap_reviews.items import ReviewItem
+from scrap_reviews.utils import DateWindow, parse_date
+
+__all__ = [
+    "StructuredFirst",
+    "json_ld_reviews",
+    "next_data_reviews",
+    "plain_url",
+    "refetch_meta",
+    "rendered_url",
+    "structured_page",
+    "structured_reviews",
+]
+
+
+# Query params only the rendering proxy cares about.
+_RENDER_PARAMS = {"render_js", "wait"}
+# Per-download meta set by middlewares; a re-fetch must start without it.
+_FETCH_STATE = {"render_cache_checked", "random_delay_done", "download_latency"}
+
+
+def plain_url(url: str) -> str:
+    """``url`` without the ``render_js``/``wait`` params the spiders add."""
+    p = urlparse(url)
+    qs = {k: v for k, v in parse_qs(p.query, keep_blank_values=True).items() if k not in _RENDER_PARAMS}
+    return urlunparse(p._replace(query=urlencode(qs, doseq=True)))
+
+
+def rendered_url(url: str) -> str:
+    """``url`` with ``render_js=true`` unless it already sets ``render_js``."""
+    p = urlparse(url)
+    qs = parse_qs(p.query)
+    qs.setdefault("render_js", ["true"])
+    return urlunparse(p._replace(query=urlencode(qs, doseq=True)))
+
+
+def refetch_meta(meta: dict) -> dict:
+    """``meta`` for a re-fetch of the same page: without the per-download state."""
+    return {k: v for k, v in meta.items() if k not in _FETCH_STATE}
+
+
+def _json_ld_objects(response) -> Iterator[dict]:
+    for script_text in response.css('script[type="application/ld+json"]::text').getall():
+        try:
+            data = json.loads(script_text)
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, list):
+                stack.extend(reversed(obj))
+            elif isinstance(obj, dict):
+                if "@graph" in obj:
+                    stack.append(obj["@graph"])
+                yield obj
+
+
+def _types(obj: dict) -> set[str]:
+    t = obj.get("@type")
+    return set(t) if isinstance(t, list) else {t}
+
+
+def _name(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get("name") or value.get("displayName")
+    return value if isinstance(value, str) else None
+
+
+def _first(obj: dict, *keys: str) -> Any:
+    for k in keys:
+        v = obj.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def _review(obj: dict) -> Optional[dict]:
+    """Normalize a schema.org Review or an app-state review object."""
+    text = _first(obj, "reviewBody", "text", "body", "content", "description")
+    if not isinstance(text, str):
+        return None
+    rating = _first(obj, "reviewRating", "rating", "stars", "ratingValue")
+    if isinstance(rating, dict):
+        rating = _first(rating, "ratingValue", "value", "stars")
+    dates = obj.get("dates") if isinstance(obj.get("dates"), dict) else {}
+    return {
+        "title": _first(obj, "headline", "title", "name"),
+        "review_text": text,
+        "date": _first(obj, "datePublished", "publishedDate", "dateCreated", "createdAt", "date")
+        or _first(dates, "publishedDate", "experiencedDate"),
+        "rating": rating,
+        "reviewer_name": _name(_first(obj, "author", "consumer", "user", "reviewer")),
+    }
+
+
+def json_ld_reviews(response) -> list[dict]:
+    """Reviews embedded as schema.org JSON-LD (``Review`` or ``review``/``reviews`` of any entity)."""
+    reviews = []
+    for obj in _json_ld_objects(response):
+        if "Review" in _types(obj):
+            found = [obj]
+        else:
+            found = obj.get("review") or obj.get("reviews") or []
+            if isinstance(found, dict):
+                found = [found]
+        for r in found:
+            if isinstance(r, dict):
+                r = _review(r)
+                if r:
+                    reviews.append(r)
+    return reviews
+
+
+def next_data_reviews(response) -> list[dict]:
+    """Reviews from a Next.js ``__NEXT_DATA__`` state blob (e.g. Trustpilot)."""
+    raw = response.css("script#__NEXT_DATA__::text").get()
+    if not raw:
+        return []
+    try:
+        stack = [json.loads(raw)]
+    except ValueError:
+        return []
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            found = obj.get("reviews")
+            if isinstance(found, list) and found and isinstance(found[0], dict):
+                reviews = [r for r in map(_review, found) if r]
+                if reviews:
+                    return reviews
+            stack.extend(obj.values())
+        elif isinstance(obj, list):
+            stack.extend(obj)
+    return []
+
+
+def structured_reviews(response) -> list[dict]:
+    """Reviews from the page's embedded app state or JSON-LD, whichever has them."""
+    return next_data_reviews(response) or json_ld_reviews(response)
+
+
+def _review_key(review: dict) -> bytes:
+    text = "\x1f".join(str(review.get(k) or "") for k in ("reviewer_name", "date", "title", "review_text"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def structured_page(
+    reviews: list[dict],
+    source: str,
+    company_name: str,
+    window: DateWindow,
+    item_cls: type = ReviewItem,
+) -> tuple[list, list, list]:
+    """Return ``(items, dates, keys)`` for structured reviews, like a spider's ``_parse_cards``."""
+    items = []
+    page_dates = []
+    page_keys = []
+    for r in reviews:
+        date_iso = parse_date(str(r["date"])) if r.get("date") else None
+        page_dates.append(date_iso)
+        page_keys.append(_review_key(r))
+        if date_iso not in window:
+            continue
+        body = " ".join(r["review_text"].split())
+        title = r.get("title")
+        if not title and body:
+            title = (body[:80] + "...") if len(body) > 80 else body
+
+        if body and date_iso:
+            items.append(
+                item_cls(
+                    source=source,
+                    company_name=company_name,
+                    title=title,
+                    review_text=body,
+                    date=date_iso,
+                    rating=None if r.get("rating") is None else str(r["rating"]),
+                    reviewer_name=r.get("reviewer_name"),
+                )
+            )
+    return items, page_dates, page_keys
+
+
+class StructuredFirst:
+    """Structured-data-first fetching and extraction for one crawl.
+
+    When ``enabled``, listing pages are first fetched without JS rendering
+    and reviews are taken from the embedded ``__NEXT_DATA__`` state or
+    JSON-LD. A plain page without embedded reviews is fetched again
+    rendered, waiting ``wait`` ms (SCRAPEOPS_WAIT_MS), and goes through the
+    usual card parsing. Plain fetches drop the ScrapeOps
+    ``sops_render_js``/``sops_wait`` meta; re-fetches set it.
+
+    Every listing page is counted as ``structured/pages_rendered`` or
+    ``structured/pages_plain`` (enabled or not), and pages served from
+    embedded data as ``structured/pages_extracted``.
+    """
+
+    def __init__(self, source: str, enabled: bool = False, wait: int = 2000, *, stats=None, logger=None):
+        self.source = source
+        self.enabled = enabled
+        self.wait = wait
+        self.stats = stats
+        self.logger = logger
+        self._last: Optional[tuple] = None
+
+    @classmethod
+    def from_spider(cls, spider, source: str) -> "StructuredFirst":
+        settings = getattr(spider, "settings", None)
+        crawler = getattr(spider, "crawler", None)
+        return cls(
+            source,
+            settings.getbool("STRUCTURED_DATA_FIRST") if settings is not None else False,
+            settings.getint("SCRAPEOPS_WAIT_MS", 2000) if settings is not None else 2000,
+            stats=crawler.stats if crawler is not None else None,
+            logger=spider.logger,
+        )
+
+    def _inc(self, key: str, count: int = 1) -> None:
+        if self.stats is not None:
+            self.stats.inc_value(f"structured/{key}", count)
+
+    @staticmethod
+    def rendered(response) -> bool:
+        return bool(response.meta.get("render_js"))
+
+    def prepare(self, url: str, meta: dict) -> tuple[str, dict]:
+        """Adjust a rendered listing request to a plain one when enabled."""
+        if not self.enabled or meta.get("structured_rerender"):
+            return url, meta
+        meta = {k: v for k, v in meta.items() if k not in ("wait", "sops_render_js", "sops_wait")}
+        meta["render_js"] = False
+        return plain_url(url), meta
+
+    def extract(self, response) -> list[dict]:
+        """Embedded reviews on ``response`` (always empty when disabled)."""
+        if self._last is not None and self._last[0] is response:
+            return self._last[1]
+        self._inc("pages_rendered" if self.rendered(response) else "pages_plain")
+        reviews = structured_reviews(response) if self.enabled else []
+        if reviews:
+            self._inc("pages_extracted")
+            self._inc("reviews", len(reviews))
+        self._last = (response, reviews)
+        return reviews
+
+    def rerender(self, response):
+        """Rendered re-fetch of a plain page without embedded reviews, else None."""
+        if not self.enabled or self.rendered(response) or self.extract(response):
+            return None
+        self._inc("rerendered")
+        if self.logger is not None:
+            self.logger.info(f"{self.source}: no embedded reviews on {response.url}, fetching it rendered")
+        meta = refetch_meta(response.meta)
+        meta.update(render_js=True, wait=self.wait, sops_render_js=True, sops_wait=self.wait, structured_rerender=True)
+        return response.request.replace(url=rendered_url(response.url), meta=meta, dont_filter=True)
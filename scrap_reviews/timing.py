@@ -0,0 +1,304 @@
+"""Per-stage timing: download latency, parse CPU time, pipeline time and items/s.
+
+Enabled with TIMING_ENABLED (main.py --timing). Totals go to the crawl
+stats under ``timing/``; the per-page detail goes to a JSON report at
+close (TIMING_REPORT_FILE) and, optionally, to a Prometheus text-format
+file (TIMING_PROMETHEUS_FILE) for node_exporter's textfile collector.
+"""
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import time
+from datetime import datetime
+from typing import Optional
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from twisted.internet.defer import Deferred
+
+from scrap_reviews.pagination import page_number
+
+__all__ = ["ParseTimingMiddleware", "StageTiming"]
+
+
+class _Series:
+    """Count, total and max of one stage's durations (seconds)."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 6),
+            "mean_s": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_s": round(self.max, 6),
+        }
+
+
+def _page(response) -> int:
+    return response.request.cb_kwargs.get("page") or page_number(response.url)
+
+
+class StageTiming:
+    """Extension collecting where a crawl spends its time.
+
+    - download: ``download_latency`` of every response, per source and page
+      (responses served by the render cache are counted as ``cached``);
+    - parse: CPU time of each callback, measured by :class:`ParseTimingMiddleware`;
+    - pipelines: wall time of each pipeline's ``process_item``;
+    - items: items scraped per second of crawl time.
+    """
+
+    def __init__(self, crawler, report_file: Optional[str] = None, prometheus_file: Optional[str] = None):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.report_file = report_file
+        self.prometheus_file = prometheus_file
+        self.download: dict[str, _Series] = {}
+        self.parse: dict[str, _Series] = {}
+        self.pipelines: dict[str, _Series] = {}
+        self.items: dict[str, int] = {}
+        self.pages: list[dict] = []
+        self.started = None
+        self.start_stamp = ""
+        self.elapsed = 0.0
+        self.cached = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("TIMING_ENABLED"):
+            raise NotConfigured
+        ext = cls(crawler, settings.get("TIMING_REPORT_FILE"), settings.get("TIMING_PROMETHEUS_FILE"))
+        crawler.stage_timing = ext
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.item_scraped, signal=signals.item_scraped)
+        return ext
+
+    @staticmethod
+    def source(spider) -> str:
+        return (getattr(spider, "name", "") or "spider").split("_")[0]
+
+    def spider_opened(self, spider):
+        self.started = time.perf_counter()
+        self.start_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._wrap_pipelines(spider)
+
+    def _wrap_pipelines(self, spider) -> None:
+        """Time every pipeline's ``process_item`` in the engine's pipeline chain.
+
+        Each entry is named after the pipeline its bound method belongs to.
+        The chain is a Scrapy internal; if it is not laid out as expected,
+        pipeline timing is skipped with a warning and the rest still runs.
+        """
+        try:
+            methods = self.crawler.engine.scraper.itemproc.methods["process_item"]
+            names = [type(inspect.unwrap(m).__self__).__name__ for m in methods]
+        except (AttributeError, KeyError, TypeError) as e:
+            spider.logger.warning(f"Timing: cannot hook the item pipelines ({e!r}), pipeline timing disabled")
+            return
+        for i, (name, method) in enumerate(zip(names, list(methods))):
+            methods[i] = self._timed_pipeline(name, method)
+
+    def _timed_pipeline(self, name: str, method):
+        series = self.pipelines.setdefault(name, _Series())
+        stats = self.stats
+        key = f"timing/pipeline/{name}/seconds"
+
+        def record(t0: float) -> None:
+            elapsed = time.perf_counter() - t0
+            series.add(elapsed)
+            stats.inc_value(key, elapsed)
+
+        def process_item(item, spider):
+            t0 = time.perf_counter()
+            try:
+                result = method(item, spider)
+            except BaseException:
+                record(t0)
+                raise
+            if isinstance(result, Deferred) and not result.called:
+
+                def done(value):
+                    record(t0)
+                    return value
+
+                return result.addBoth(done)
+            record(t0)
+            return result
+
+        return process_item
+
+    def response_received(self, response, request, spider):
+        latency = request.meta.get("download_latency")
+        if "cached" in response.flags:
+            self.cached += 1
+            self.stats.inc_value("timing/download/cached")
+            return
+        if latency is None:
+            return
+        src = self.source(spider)
+        self.download.setdefault(src, _Series()).add(latency)
+        self.stats.inc_value(f"timing/download/{src}/seconds", latency)
+        self.stats.max_value(f"timing/download/{src}/max_seconds", latency)
+
+    def record_parse(self, response, spider, cpu: float, wall: float, outputs: int) -> None:
+        src = self.source(spider)
+        self.parse.setdefault(src, _Series()).add(cpu)
+        self.stats.inc_value(f"timing/parse/{src}/cpu_seconds", cpu)
+        self.stats.max_value(f"timing/parse/{src}/max_cpu_seconds", cpu)
+        self.pages.append(
+            {
+                "source": src,
+                "page": _page(response),
+                "url": response.url,
+                "status": response.status,
+                "download_s": response.meta.get("download_latency"),
+                "parse_cpu_s": round(cpu, 6),
+                "parse_wall_s": round(wall, 6),
+                "outputs": outputs,
+            }
+        )
+
+    def item_scraped(self, item, response, spider):
+        src = self.source(spider)
+        self.items[src] = self.items.get(src, 0) + 1
+
+    def items_per_second(self) -> float:
+        total = sum(self.items.values())
+        return total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def spider_closed(self, spider, reason):
+        self.elapsed = time.perf_counter() - self.started if self.started is not None else 0.0
+        for name, series in self.pipelines.items():
+            self.stats.set_value(f"timing/pipeline/{name}/count", series.count)
+            self.stats.set_value(f"timing/pipeline/{name}/max_seconds", series.max)
+        for src, series in self.download.items():
+            self.stats.set_value(f"timing/download/{src}/count", series.count)
+        for src, series in self.parse.items():
+            self.stats.set_value(f"timing/parse/{src}/count", series.count)
+        self.stats.set_value("timing/elapsed_seconds", round(self.elapsed, 3))
+        self.stats.set_value("timing/items_per_second", round(self.items_per_second(), 3))
+
+        stamp = self.start_stamp
+        if self.report_file:
+            path = self.report_file.format(spider=spider.name, start=stamp)
+            self._write(path, json.dumps(self.report(spider, reason), indent=2))
+            self.stats.set_value("timing/report_file", path)
+        if self.prometheus_file:
+            self._write(self.prometheus_file.format(spider=spider.name, start=stamp), self.prometheus(spider))
+
+    def report(self, spider, reason: str) -> dict:
+        return {
+            "spider": spider.name,
+            "finish_reason": reason,
+            "elapsed_s": round(self.elapsed, 3),
+            "items": dict(self.items),
+            "items_per_second": round(self.items_per_second(), 3),
+            "download": {src: s.as_dict() for src, s in self.download.items()},
+            "download_cached": self.cached,
+            "parse_cpu": {src: s.as_dict() for src, s in self.parse.items()},
+            "pipelines": {name: s.as_dict() for name, s in self.pipelines.items()},
+            "pages": self.pages,
+        }
+
+    def prometheus(self, spider) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def summary(metric: str, help_: str, label: str, series: dict[str, _Series]) -> None:
+            lines.append(f"# HELP {metric} {help_}")
+            lines.append(f"# TYPE {metric} summary")
+            for key, s in series.items():
+                labels = f'spider="{spider.name}",{label}="{key}"'
+                lines.append(f"{metric}_sum{{{labels}}} {s.total:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {s.count}")
+
+        summary("scrap_reviews_download_seconds", "Download latency per response.", "source", self.download)
+        summary("scrap_reviews_parse_cpu_seconds", "Callback CPU time per page.", "source", self.parse)
+        summary("scrap_reviews_pipeline_seconds", "process_item time per item.", "pipeline", self.pipelines)
+        lines.append("# HELP scrap_reviews_items_total Items scraped.")
+        lines.append("# TYPE scrap_reviews_items_total counter")
+        for src, n in self.items.items():
+            lines.append(f'scrap_reviews_items_total{{spider="{spider.name}",source="{src}"}} {n}')
+        lines.append("# HELP scrap_reviews_items_per_second Items scraped per second of crawl time.")
+        lines.append("# TYPE scrap_reviews_items_per_second gauge")
+        lines.append(f'scrap_reviews_items_per_second{{spider="{spider.name}"}} {self.items_per_second():.3f}')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _write(path: str, text: str) -> None:
+        # Written whole and renamed, so readers never see a partial file.
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+class ParseTimingMiddleware:
+    """Spider middleware timing each callback (CPU and wall) for :class:`StageTiming`.
+
+    Sits closest to the spider, so the time spent producing each output is
+    the callback's own: selector queries, ``parse_date`` and item building.
+    """
+
+    def __init__(self, timing: StageTiming):
+        self.timing = timing
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        timing = getattr(crawler, "stage_timing", None)
+        if timing is None:
+            raise NotConfigured
+        return cls(timing)
+
+    def process_spider_output(self, response, result, spider):
+        cpu = wall = 0.0
+        outputs = 0
+        it = iter(result)
+        while True:
+            c0, w0 = time.thread_time(), time.perf_counter()
+            try:
+                out = next(it)
+            except StopIteration:
+                break
+            finally:
+                cpu += time.thread_time() - c0
+                wall += time.perf_counter() - w0
+            outputs += 1
+            yield out
+        self.timing.record_parse(response, spider, cpu, wall, outputs)
+
+    async def process_spider_output_async(self, response, result, spider):
+        cpu = wall = 0.0
+        outputs = 0
+        it = result.__aiter__()
+        while True:
+            c0, w0 = time.thread_time(), time.perf_counter()
+            try:
+                out = await it.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                cpu += time.thread_time() - c0
+                wall += time.perf_counter() - w0
+            outputs += 1
+            yield out
+        self.timing.record_parse(response, spider, cpu, wall, outputs)
@@ -2,10 +2,22 @@ from __future__ import annotations
 
 import re
 import unicodedata
-from datetime import datetime, timedelta, timezone
-from typing import Iterable, Optional
+from datetime import date, datetime, timedelta, timezone
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional
 
-__all__ = ["slugify", "parse_date", "in_date_range"]
+from scrap_reviews.dedup import review_dedup_key
+
+__all__ = [
+    "DatePosition",
+    "DateWindow",
+    "date_ordinal",
+    "in_date_range",
+    "parse_date",
+    "review_key",
+    "slugify",
+]
 
 
 def slugify(value: str, max_length: int = 80) -> str:
@@ -22,45 +34,120 @@ def slugify(value: str, max_length: int = 80) -> str:
     return value
 
 
+_RELATIVE_RE = re.compile(
+    r"(\d+)\s*(days?|d|weeks?|w|months?|mo|years?|y)\s*ago"
+)
+_RELATIVE_DAYS = {
+    "day": 1, "days": 1, "d": 1,
+    "week": 7, "weeks": 7, "w": 7,
+    "month": 30, "months": 30, "mo": 30,
+    "year": 365, "years": 365, "y": 365,
+}
+
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?"
+)
+_CLEAN_RE = re.compile(r"[\s,\u00A0]+")
+_MONTH_DAY_YEAR_RE = re.compile(r"([A-Za-z]{3,9}) (\d{1,2}) (\d{4})")
+_DAY_MONTH_YEAR_RE = re.compile(r"(\d{1,2}) ([A-Za-z]{3,9}) (\d{4})")
+_YEAR_MONTH_DAY_RE = re.compile(r"(\d{4}) ([A-Za-z]{3,9}) (\d{1,2})")
+_MONTH_YEAR_RE = re.compile(r"([A-Za-z]{3,9}) (\d{4})")
+_NUMERIC_RE = re.compile(r"(\d{1,4})([-/.])(\d{1,2})\2(\d{1,4})")
+_YMD_TOKEN_RE = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})")
+_MDY_TOKEN_RE = re.compile(r"\b([A-Za-z]{3,9})\s+(\d{1,2}),?\s+(\d{4})\b")
+
+_MONTHS = {}
+for _i, _name in enumerate(
+    ["january", "february", "march", "april", "may", "june", "july",
+     "august", "september", "october", "november", "december"],
+    start=1,
+):
+    _MONTHS[_name] = _i
+    _MONTHS[_name[:3]] = _i
+
+
 def _parse_relative_date(s: str, now: Optional[datetime] = None) -> Optional[datetime]:
     if not s:
         return None
     text = s.strip().lower()
-    now = now or datetime.now(timezone.utc)
-
     if text == "today":
-        return now
+        return now or datetime.now(timezone.utc)
     if text == "yesterday":
-        return now - timedelta(days=1)
+        return (now or datetime.now(timezone.utc)) - timedelta(days=1)
+    if "ago" not in text:
+        return None
 
-    m = re.search(r"(\d+)\s*(day|days|d)\s*ago", text)
+    m = _RELATIVE_RE.search(text)
     if m:
-        return now - timedelta(days=int(m.group(1)))
+        now = now or datetime.now(timezone.utc)
+        return now - timedelta(days=_RELATIVE_DAYS[m.group(2)] * int(m.group(1)))
+    return None
 
-    m = re.search(r"(\d+)\s*(week|weeks|w)\s*ago", text)
-    if m:
-        return now - timedelta(weeks=int(m.group(1)))
 
-    m = re.search(r"(\d+)\s*(month|months|mo)\s*ago", text)
+def _iso(y: int, m: int, d: int) -> Optional[str]:
+    try:
+        return date(y, m, d).isoformat()
+    except ValueError:
+        return None
+
+
+def _named(month: str, day: str, year: str) -> Optional[str]:
+    m = _MONTHS.get(month.lower())
+    return _iso(int(year), m, int(day)) if m else None
+
+
+@lru_cache(maxsize=4096)
+def _parse_absolute(raw: str, prefer_dayfirst: bool) -> Optional[str]:
+    """Parse a non-relative date string; memoized since cards repeat formats."""
+    m = _ISO_RE.fullmatch(raw)
     if m:
-        return now - timedelta(days=30 * int(m.group(1)))
+        return _iso(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+    cleaned = _CLEAN_RE.sub(" ", raw).strip()
 
-    m = re.search(r"(\d+)\s*(year|years|y)\s*ago", text)
+    # Dispatch on the string's shape to the one format that can match.
+    m = _MONTH_DAY_YEAR_RE.fullmatch(cleaned)
     if m:
-        return now - timedelta(days=365 * int(m.group(1)))
+        return _named(m.group(1), m.group(2), m.group(3))
+    m = _DAY_MONTH_YEAR_RE.fullmatch(cleaned)
+    if m:
+        return _named(m.group(2), m.group(1), m.group(3))
+    m = _YEAR_MONTH_DAY_RE.fullmatch(cleaned)
+    if m:
+        return _named(m.group(2), m.group(3), m.group(1))
+    m = _MONTH_YEAR_RE.fullmatch(cleaned)
+    if m:
+        return _named(m.group(1), "1", m.group(2))
+    m = _NUMERIC_RE.fullmatch(cleaned)
+    if m:
+        a, b, c = m.group(1), int(m.group(3)), m.group(4)
+        if len(a) == 4:
+            return _iso(int(a), b, int(c)) if len(c) <= 2 else None
+        if len(c) != 4:
+            return None
+        a, y = int(a), int(c)
+        if prefer_dayfirst:
+            return _iso(y, b, a) or _iso(y, a, b)
+        return _iso(y, a, b) or _iso(y, b, a)
 
-    return None
+    try:
+        iso = datetime.fromisoformat(cleaned.replace("Z", "+00:00"))
+        return iso.date().isoformat()
+    except ValueError:
+        pass
 
+    token = _YMD_TOKEN_RE.search(cleaned)
+    if token:
+        iso = _iso(int(token.group(1)), int(token.group(2)), int(token.group(3)))
+        if iso:
+            return iso
+
+    token = _MDY_TOKEN_RE.search(cleaned)
+    if token:
+        iso = _named(*token.groups())
+        if iso:
+            return iso
 
-def _try_strptime_formats(s: str, fmts: Iterable[str]) -> Optional[datetime]:
-    for fmt in fmts:
-        try:
-            dt = datetime.strptime(s, fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except ValueError:
-            continue
     return None
 
 
@@ -70,65 +157,74 @@ def parse_date(
     prefer_dayfirst: bool = False,
     now: Optional[datetime] = None,
 ) -> Optional[str]:
-    if not s or not str(s).strip():
+    if not s:
         return None
-
     raw = str(s).strip()
+    if not raw:
+        return None
 
     rel = _parse_relative_date(raw, now=now)
     if rel:
         return rel.date().isoformat()
 
-    cleaned = re.sub(r"[,\u00A0]", " ", raw)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-
-    month_names = [
-        "%b %d %Y", "%b %d, %Y", "%B %d %Y", "%B %d, %Y",
-        "%d %b %Y", "%d %B %Y", "%Y %b %d", "%Y %B %d",
-        "%b %Y", "%B %Y",
-    ]
-
-    dt = _try_strptime_formats(cleaned, month_names)
-    if dt:
-        return dt.date().isoformat()
-
-    if prefer_dayfirst:
-        ordered = [
-            "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y",
-            "%m-%d-%Y", "%m/%d/%Y", "%m.%d.%Y",
-        ]
-    else:
-        ordered = [
-            "%m-%d-%Y", "%m/%d/%Y", "%m.%d.%Y",
-            "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y",
-        ]
-
-    dt = _try_strptime_formats(cleaned, ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"] + ordered)
-    if dt:
-        return dt.date().isoformat()
+    return _parse_absolute(raw, prefer_dayfirst)
+
+
+class DatePosition(IntEnum):
+    """Where a date falls relative to a :class:`DateWindow`."""
 
+    BEFORE = -1
+    INSIDE = 0
+    AFTER = 1
+
+
+@lru_cache(maxsize=4096)
+def date_ordinal(date_iso: Optional[str]) -> Optional[int]:
+    """Proleptic ordinal of an ISO ``YYYY-MM-DD`` date, or None if invalid."""
+    if not date_iso:
+        return None
     try:
-        iso = datetime.fromisoformat(cleaned.replace("Z", "+00:00"))
-        if iso.tzinfo is None:
-            iso = iso.replace(tzinfo=timezone.utc)
-        return iso.date().isoformat()
-    except ValueError:
-        pass
+        return date.fromisoformat(date_iso).toordinal()
+    except (TypeError, ValueError):
+        return None
 
-    token = re.search(r"(\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2})", cleaned)
-    if token:
-        dt = _try_strptime_formats(token.group(1), ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"])
-        if dt:
-            return dt.date().isoformat()
 
-    token = re.search(r"\b([A-Za-z]{3,9})\s+(\d{1,2}),?\s+(\d{4})\b", cleaned)
-    if token:
-        guess = " ".join(token.groups())
-        dt = _try_strptime_formats(guess, ["%b %d %Y", "%B %d %Y"])
-        if dt:
-            return dt.date().isoformat()
+class DateWindow:
+    """Inclusive ``start``..``end`` date range parsed once per crawl.
 
-    return None
+    Either bound may be None (open). Invalid bounds are ignored, as
+    :func:`in_date_range` always did. Dates are compared as ordinals, and
+    :meth:`classify` tells "too old" from "too new" so pagination can act
+    on it.
+    """
+
+    __slots__ = ("start_iso", "end_iso", "start", "end")
+
+    def __init__(self, start_iso: Optional[str] = None, end_iso: Optional[str] = None):
+        self.start = date_ordinal(start_iso)
+        self.end = date_ordinal(end_iso)
+        self.start_iso = start_iso if self.start is not None else None
+        self.end_iso = end_iso if self.end is not None else None
+
+    def classify(self, date_iso: Optional[str]) -> Optional[DatePosition]:
+        """Position of ``date_iso`` relative to the window (None if undated)."""
+        d = date_ordinal(date_iso)
+        if d is None:
+            return None
+        if self.start is not None and d < self.start:
+            return DatePosition.BEFORE
+        if self.end is not None and d > self.end:
+            return DatePosition.AFTER
+        return DatePosition.INSIDE
+
+    def __contains__(self, date_iso: Optional[str]) -> bool:
+        return self.classify(date_iso) is DatePosition.INSIDE
+
+    def __repr__(self) -> str:
+        return f"DateWindow({self.start_iso!r}, {self.end_iso!r})"
+
+    def __str__(self) -> str:
+        return f"{self.start_iso or ''}..{self.end_iso or ''}"
 
 
 def in_date_range(
@@ -136,28 +232,14 @@ def in_date_range(
     start_iso: Optional[str] = None,
     end_iso: Optional[str] = None,
 ) -> bool:
-    if not date_iso:
-        return False
-    try:
-        d = datetime.strptime(date_iso, "%Y-%m-%d").date()
-    except ValueError:
-        return False
-
-    s = None
-    e = None
-    if start_iso:
-        try:
-            s = datetime.strptime(start_iso, "%Y-%m-%d").date()
-        except ValueError:
-            s = None
-    if end_iso:
-        try:
-            e = datetime.strptime(end_iso, "%Y-%m-%d").date()
-        except ValueError:
-            e = None
-
-    if s and d < s:
-        return False
-    if e and d > e:
-        return False
-    return True
+    return date_iso in DateWindow(start_iso, end_iso)
+
+
+def review_key(
+    source: Optional[str],
+    reviewer: Optional[str],
+    date_iso: Optional[str],
+    text: Optional[str],
+) -> str:
+    """Stable short ID for a review: :func:`~scrap_reviews.dedup.review_dedup_key` as 16 hex digits."""
+    return format(review_dedup_key(source, reviewer, date_iso, text) & 0xFFFFFFFFFFFFFFFF, "016x")
@@ -0,0 +1,61 @@
+"""parse_date keeps the pre-memoization results; DateWindow.classify's three-way split."""
+from datetime import datetime, timezone
+
+import pytest
+
+from scrap_reviews.utils import DatePosition, DateWindow, in_date_range, parse_date
+
+NOW = datetime(2025, 3, 15, 12, tzinfo=timezone.utc)
+
+# (input, month-first result, day-first result), as the old strptime loop parsed them.
+CASES = [
+    ("Jan 05, 2025", "2025-01-05", "2025-01-05"),
+    ("January 5 2025", "2025-01-05", "2025-01-05"),
+    ("05 January 2025", "2025-01-05", "2025-01-05"),
+    ("2025 Jan 05", "2025-01-05", "2025-01-05"),
+    ("Jan\u00a005, 2025", "2025-01-05", "2025-01-05"),
+    ("Mar 2024", "2024-03-01", "2024-03-01"),
+    ("01/05/2025", "2025-01-05", "2025-05-01"),
+    ("01.05.2025", "2025-01-05", "2025-05-01"),
+    ("13/05/2025", "2025-05-13", "2025-05-13"),
+    ("2025/1/5", "2025-01-05", "2025-01-05"),
+    ("2025-01-05T23:30:00+05:00", "2025-01-05", "2025-01-05"),
+    ("2025-01-05T10:20:30Z", "2025-01-05", "2025-01-05"),
+    ("Reviewed on 2025-01-05 by x", "2025-01-05", "2025-01-05"),
+    ("today", "2025-03-15", "2025-03-15"),
+    ("yesterday", "2025-03-14", "2025-03-14"),
+    ("3 days ago", "2025-03-12", "2025-03-12"),
+    ("2 weeks ago", "2025-03-01", "2025-03-01"),
+    ("1 month ago", "2025-02-13", "2025-02-13"),
+    ("2 years ago", "2023-03-16", "2023-03-16"),
+    ("", None, None),
+    ("   ", None, None),
+    ("not a date", None, None),
+]
+
+
+@pytest.mark.parametrize("raw,monthfirst,dayfirst", CASES)
+def test_parse_date_parity(raw, monthfirst, dayfirst):
+    assert parse_date(raw, now=NOW) == monthfirst
+    assert parse_date(raw, prefer_dayfirst=True, now=NOW) == dayfirst
+    # Memoized results must not leak between the two orders.
+    assert parse_date(raw, now=NOW) == monthfirst
+
+
+def test_classify():
+    window = DateWindow("2025-01-01", "2025-01-31")
+    assert window.classify("2024-12-31") is DatePosition.BEFORE
+    assert window.classify("2025-01-01") is DatePosition.INSIDE
+    assert window.classify("2025-01-31") is DatePosition.INSIDE
+    assert window.classify("2025-02-01") is DatePosition.AFTER
+    assert window.classify(None) is None
+    assert window.classify("Jan 5") is None
+
+
+def test_open_and_invalid_bounds():
+    assert DateWindow(None, "2025-01-31").classify("1999-01-01") is DatePosition.INSIDE
+    assert DateWindow("2025-01-01").classify("2099-01-01") is DatePosition.INSIDE
+    window = DateWindow("garbage", "2025-01-31")
+    assert window.start_iso is None and window.classify("1999-01-01") is DatePosition.INSIDE
+    assert in_date_range("2025-01-10", "2025-01-01", "2025-01-31")
+    assert not in_date_range(None, "2025-01-01", "2025-01-31")
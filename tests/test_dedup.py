@@ -0,0 +1,49 @@
+"""Persistent dedup keys shared by concurrent stores on one SQLite file."""
+import pytest
+
+from scrap_reviews.dedup import BloomFilter, SqliteKeyStore, review_dedup_key
+from scrap_reviews.utils import review_key
+
+blooms = pytest.mark.parametrize("capacity", [0, 1000], ids=["plain", "bloom"])
+
+
+def open_store(path, capacity):
+    return SqliteKeyStore(str(path), BloomFilter(capacity) if capacity else None)
+
+
+@blooms
+def test_concurrent_stores_see_each_others_keys(tmp_path, capacity):
+    path = tmp_path / "dedup.sqlite"
+    a, b = open_store(path, capacity), open_store(path, capacity)
+    try:
+        keys = [review_dedup_key("g2", f"reviewer {i}", "2025-03-01", "text") for i in range(20)]
+        for key in keys[::2]:
+            assert a.add(key)
+        for key in keys:
+            assert b.add(key) is (keys.index(key) % 2 == 1)
+        for key in keys:
+            assert not a.add(key)
+        assert len(a) == len(b) == len(keys)
+    finally:
+        a.close()
+        b.close()
+
+
+@blooms
+def test_keys_survive_reopen(tmp_path, capacity):
+    path = tmp_path / "dedup.sqlite"
+    store = open_store(path, capacity)
+    assert store.add(1) and not store.add(1)
+    store.close()
+    store = open_store(path, capacity)
+    try:
+        assert not store.add(1)
+        assert store.add(2)
+    finally:
+        store.close()
+
+
+def test_review_key_is_dedup_key_in_hex():
+    args = ("g2", "Jane D.", "2025-03-01", "Great product, " * 10)
+    assert int(review_key(*args), 16) == review_dedup_key(*args) & 0xFFFFFFFFFFFFFFFF
+    assert review_key(*args) == review_key(*args[:3], args[3][:50] + "different tail")
@@ -0,0 +1,85 @@
+"""High-water marks with the covered start: known reviews vs backfill."""
+import logging
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from scrapy.exceptions import DropItem
+
+from scrap_reviews.items import ReviewItem
+from scrap_reviews.pipelines import IncrementalPipeline
+from scrap_reviews.state import ReviewState
+from scrap_reviews.utils import DateWindow
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = ReviewState(str(tmp_path / "state.sqlite"))
+    yield state
+    state.close()
+
+
+def open_crawl(state, start, end):
+    spider = SimpleNamespace(
+        name="g2_reviews", company_name="Acme", window=DateWindow(start, end), logger=logging.getLogger("test")
+    )
+    pipeline = IncrementalPipeline(state)
+    pipeline.open_spider(spider)
+    return pipeline, spider
+
+
+def emitted(pipeline, spider, *dates):
+    out = []
+    for d in dates:
+        try:
+            out.append(pipeline.process_item(ReviewItem(source="g2", review_text=f"on {d}", date=d), spider)["date"])
+        except DropItem:
+            pass
+    return out
+
+
+def test_coverage_grows_with_touching_windows(state):
+    state.update("g2", "acme", "2025-06-01", {"a"}, "2025-01-01", "2025-06-30")
+    assert state.get("g2", "acme") == ("2025-06-01", {"a"}, "2025-01-01")
+    state.update("g2", "acme", "2025-03-01", {"b"}, "2024-01-01", "2025-03-31")
+    assert state.get("g2", "acme") == ("2025-06-01", {"a"}, "2024-01-01")
+    # Ends before the covered start: a gap, nothing changes.
+    state.update("g2", "acme", "2022-05-01", {"c"}, "2022-01-01", "2022-12-31")
+    assert state.get("g2", "acme")[2] == "2024-01-01"
+    # Starts after the mark: a gap the other way, coverage restarts.
+    state.update("g2", "acme", "2025-09-01", {"d"}, "2025-08-01", None)
+    assert state.get("g2", "acme") == ("2025-09-01", {"d"}, "2025-08-01")
+
+
+def test_window_inside_coverage_drops_known_and_stops_early(state):
+    state.update("g2", "acme", "2025-06-01", {"x"}, "2025-01-01", None)
+    pipeline, spider = open_crawl(state, "2025-02-01", None)
+    assert spider.known_date == "2025-06-01"
+    assert emitted(pipeline, spider, "2025-03-01", "2025-06-01", "2025-07-01") == ["2025-06-01", "2025-07-01"]
+
+
+def test_window_before_coverage_is_backfilled(state):
+    state.update("g2", "acme", "2025-06-01", set(), "2025-01-01", None)
+    pipeline, spider = open_crawl(state, "2024-06-01", None)
+    assert spider.known_date is None
+    assert emitted(pipeline, spider, "2024-07-01", "2025-03-01", "2025-07-01") == ["2024-07-01", "2025-07-01"]
+
+
+def test_legacy_marks_only_cover_their_own_date(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE high_water (source TEXT NOT NULL, product TEXT NOT NULL, newest_date TEXT NOT NULL,"
+        " newest_ids TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (source, product))"
+    )
+    db.execute("INSERT INTO high_water VALUES ('g2', 'acme', '2025-06-01', '[]', 0)")
+    db.commit()
+    db.close()
+    state = ReviewState(path)
+    try:
+        assert state.get("g2", "acme") == ("2025-06-01", set(), "2025-06-01")
+        pipeline, spider = open_crawl(state, "2025-01-01", None)
+        assert spider.known_date is None
+        assert emitted(pipeline, spider, "2025-03-01") == ["2025-03-01"]
+    finally:
+        state.close()
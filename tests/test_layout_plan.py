@@ -0,0 +1,57 @@
+"""LayoutPlan field lookups on pages whose cards mix layouts."""
+from scrapy.http import HtmlResponse
+
+from scrap_reviews.spiders.g2_reviews import G2ReviewsSpider
+
+# Card 1 only has the fallbacks (bare <p> body, <time> text, "out of 5"
+# label); card 2 has the marked-up fields *and* the fallbacks, which must
+# not win just because they matched card 1.
+MIXED_G2 = b"""<html><body>
+<article class="elv-bg-neutral-0">
+  <h3>Fallback layout</h3>
+  <time>January 5, 2025</time>
+  <div class="stars" aria-label="3 out of 5"></div>
+  <p>Card one body, only in a paragraph.</p>
+  <span class="reviewer-name">Ann</span>
+</article>
+<article class="elv-bg-neutral-0">
+  <h3>Marked-up layout</h3>
+  <meta itemprop="datePublished" content="2025-02-03">
+  <time>March 9, 2025</time>
+  <span itemprop="reviewRating"><meta itemprop="ratingValue" content="5"></span>
+  <div class="stars" aria-label="2 out of 5"></div>
+  <p>Helpful? Yes</p>
+  <div itemprop="reviewBody">Card two real body.</div>
+  <span class="reviewer-name">Bob</span>
+</article>
+</body></html>"""
+
+
+def _items(body):
+    spider = G2ReviewsSpider(company_name="Acme", start_date="2025-01-01", end_date="2025-12-31")
+    response = HtmlResponse(url="https://www.g2.com/products/acme/reviews", body=body, encoding="utf-8")
+    items, _, _ = spider._parse_cards(response, spider._find_cards(response))
+    return [dict(i) for i in items]
+
+
+def test_fields_keep_priority_order_across_cards():
+    first, second = _items(MIXED_G2)
+    assert (first["review_text"], first["date"], first["rating"]) == (
+        "Card one body, only in a paragraph.",
+        "2025-01-05",
+        "3",
+    )
+    assert (second["review_text"], second["date"], second["rating"]) == ("Card two real body.", "2025-02-03", "5")
+
+
+def test_fields_keep_priority_order_across_pages():
+    # Same cards split over two pages of one crawl: the plan learned on
+    # page 1 must not change what page 2 extracts.
+    spider = G2ReviewsSpider(company_name="Acme", start_date="2025-01-01", end_date="2025-12-31")
+    first_card, second_card = MIXED_G2.split(b"</article>", 1)
+    pages = [first_card + b"</article></body></html>", b"<html><body>" + second_card]
+    items = []
+    for n, body in enumerate(pages, 1):
+        response = HtmlResponse(url=f"https://www.g2.com/products/acme/reviews?page={n}", body=body, encoding="utf-8")
+        items += spider._parse_cards(response, spider._find_cards(response))[0]
+    assert [i["review_text"] for i in items] == ["Card one body, only in a paragraph.", "Card two real body."]
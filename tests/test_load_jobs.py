@@ -0,0 +1,29 @@
+"""Batch job files: one bad job is reported, not fatal to the batch."""
+import json
+
+from main import load_jobs
+
+
+def test_bad_jobs_get_an_error(tmp_path):
+    path = tmp_path / "jobs.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"source": "G2", "company": "Acme", "max_pages": "3"},
+                {"source": "g2", "company": "Acme", "max_pages": "three"},
+                "not a job",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    ok, bad_pages, not_object = load_jobs(str(path))
+    assert (ok["source"], ok["max_pages"], ok.get("error")) == ("g2", 3, None)
+    assert bad_pages["error"] == "invalid max_pages 'three'"
+    assert not_object["id"] == 3 and "expected an object" in not_object["error"]
+
+
+def test_csv_jobs(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("source,company,url,max_pages\ncapterra, Acme ,,\n", encoding="utf-8")
+    (job,) = load_jobs(str(path))
+    assert (job["source"], job["company"], job["product_url"], job["max_pages"]) == ("capterra", "Acme", None, None)
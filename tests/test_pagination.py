@@ -0,0 +1,99 @@
+"""PageTracker stop reasons and PageFanOut's in-order release, without a crawl."""
+from scrap_reviews.pagination import PageFanOut, PageTracker
+from scrap_reviews.utils import DateWindow
+
+WINDOW = DateWindow("2025-01-01", "2025-12-31")
+
+
+def keys(*names):
+    return [name.encode() for name in names]
+
+
+def observe(tracker, dates, card_keys=None):
+    tracker.observe(None, dates, keys(*dates) if card_keys is None else card_keys)
+
+
+def test_stops_before_window():
+    tracker = PageTracker("g2", WINDOW)
+    observe(tracker, ["2025-03-01", "2025-02-01"])
+    assert tracker.stop_reason is None
+    observe(tracker, ["2024-12-30", "2024-12-01"])
+    assert tracker.stop_reason == "before_window"
+
+
+def test_patience_and_pinned_reviews():
+    tracker = PageTracker("g2", WINDOW, patience=2, pinned=1)
+    # The pinned (newest) review is ignored, so this page counts as old.
+    observe(tracker, ["2025-06-01", "2024-11-01"])
+    # An in-window page resets the streak.
+    observe(tracker, ["2025-03-01", "2025-02-01", "2024-10-01"])
+    observe(tracker, ["2024-09-01", "2024-08-01"])
+    assert tracker.stop_reason is None
+    observe(tracker, ["2024-07-01", "2024-06-01"])
+    assert tracker.stop_reason == "before_window"
+
+
+def test_no_early_stop():
+    tracker = PageTracker("g2", WINDOW, early_stop=False)
+    for page in range(3):
+        observe(tracker, [f"2020-01-0{page + 1}"])
+    assert tracker.stop_reason is None
+
+
+def test_stops_at_known_reviews():
+    tracker = PageTracker("g2", WINDOW, known_date="2025-06-01")
+    observe(tracker, ["2025-07-01"])
+    assert tracker.stop_reason is None
+    observe(tracker, ["2025-05-01"])
+    assert tracker.stop_reason == "reached_known"
+
+
+def test_stops_on_repeated_page():
+    tracker = PageTracker("g2", WINDOW)
+    observe(tracker, ["2025-05-01", "2025-04-01"])
+    observe(tracker, ["2025-05-01", "2025-04-01"])
+    assert tracker.stop_reason == "repeated_page"
+
+
+def test_stops_on_empty_pages():
+    tracker = PageTracker("g2", WINDOW, max_empty=2)
+    observe(tracker, [], [])
+    assert tracker.stop_reason is None
+    observe(tracker, [], [])
+    assert tracker.stop_reason == "empty_pages"
+
+
+def test_stops_on_duplicate_pages():
+    tracker = PageTracker("g2", WINDOW, max_empty=2)
+    observe(tracker, ["2025-05-01", "2025-04-01", "2025-03-01"])
+    observe(tracker, ["2025-05-01", "2025-04-01"])
+    observe(tracker, ["2025-04-01", "2025-03-01"])
+    assert tracker.stop_reason == "duplicate_pages"
+
+
+def page(n, date):
+    return None, [f"item {n}"], [date], keys(f"card {n}")
+
+
+def test_fanout_releases_pages_in_order():
+    fanout = PageFanOut(PageTracker("g2", WINDOW), first=1, last=6, concurrency=3)
+    assert fanout.start() == [2, 3, 4]
+    # Pages 3 and 4 finish first: nothing is released until page 2 arrives.
+    assert fanout.complete(4, page(4, "2025-08-01")) == ([], [])
+    assert fanout.complete(3, page(3, "2025-09-01")) == ([], [])
+    items, more = fanout.complete(2, page(2, "2025-10-01"))
+    assert items == ["item 2", "item 3", "item 4"]
+    assert more == [5, 6]
+    # A failed page is skipped without holding back the next one.
+    assert fanout.complete(5, None) == ([], [])
+    assert fanout.complete(6, page(6, "2025-07-01")) == (["item 6"], [])
+
+
+def test_fanout_stops_with_the_tracker():
+    tracker = PageTracker("g2", WINDOW)
+    fanout = PageFanOut(tracker, first=1, last=10, concurrency=2)
+    assert fanout.start() == [2, 3]
+    assert fanout.complete(3, page(3, "2024-11-01")) == ([], [])
+    items, more = fanout.complete(2, page(2, "2024-12-01"))
+    assert tracker.stop_reason == "before_window"
+    assert (items, more) == (["item 2"], [])
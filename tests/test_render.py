@@ -0,0 +1,39 @@
+"""Adaptive render levels are learned per crawl; waits come from the settings."""
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from scrap_reviews.render import RenderLadder
+
+from test_try_start import fixture, make_spider, respond, split
+
+URL = "https://www.g2.com/products/acme/reviews"
+
+
+def empty_page(request):
+    return HtmlResponse(url=request.url, body=b"<html></html>", encoding="utf-8", request=request)
+
+
+def test_working_level_stays_with_its_crawl():
+    first = RenderLadder("g2", [2000, 4000], enabled=True)
+    url, meta = first.prepare(URL, {})
+    retry = first.escalate(empty_page(Request(url, meta=meta)), found=False)
+    assert retry.meta["render_level"] == 1
+    assert first.escalate(empty_page(retry), found=True) is None
+    assert first.start_level(URL) == 1
+    assert RenderLadder("g2", [2000, 4000], enabled=True).start_level(URL) == 0
+
+
+def test_escalated_fetch_sets_proxy_wait():
+    ladder = RenderLadder("g2", [1500, 6000], enabled=True)
+    url, meta = ladder.prepare(URL, {"render_level": 1})
+    retry = ladder.escalate(empty_page(Request(url, meta=meta)), found=False)
+    assert (retry.meta["sops_render_js"], retry.meta["sops_wait"], retry.meta["wait"]) == (True, 6000, 6000)
+
+
+def test_listing_waits_follow_scrapeops_wait_ms():
+    (rendered,) = make_spider("g2", SCRAPEOPS_WAIT_MS=3500).start_requests()
+    assert rendered.meta["wait"] == 3500
+    spider = make_spider("g2", SCRAPEOPS_WAIT_MS=3500, STRUCTURED_DATA_FIRST=True)
+    (plain,) = spider.start_requests()
+    (retry,), _ = split(spider.try_start(respond(plain, fixture("g2_listing.html"))))
+    assert (retry.meta["wait"], retry.meta["sops_wait"]) == (3500, 3500)
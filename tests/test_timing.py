@@ -0,0 +1,57 @@
+"""StageTiming's pipeline hook: names from the bound methods, no crash on other layouts."""
+import logging
+from collections import deque
+from types import SimpleNamespace
+
+from scrapy.utils.defer import deferred_f_from_coro_f
+
+from scrap_reviews.timing import StageTiming
+
+
+class Stats:
+    def __init__(self):
+        self.values = {}
+
+    def inc_value(self, key, count=1):
+        self.values[key] = self.values.get(key, 0) + count
+
+
+class FirstPipeline:
+    def process_item(self, item, spider):
+        return item
+
+
+class SecondPipeline(FirstPipeline):
+    pass
+
+
+class OpenOnly:
+    def open_spider(self, spider):
+        pass
+
+
+def make_timing(itemproc):
+    crawler = SimpleNamespace(stats=Stats(), engine=SimpleNamespace(scraper=SimpleNamespace(itemproc=itemproc)))
+    return StageTiming(crawler)
+
+
+spider = SimpleNamespace(name="g2_reviews", logger=logging.getLogger("test"))
+
+
+def test_pipelines_named_by_their_methods():
+    pipes = [FirstPipeline(), OpenOnly(), SecondPipeline()]
+    methods = deque(deferred_f_from_coro_f(p.process_item) for p in pipes if hasattr(p, "process_item"))
+    itemproc = SimpleNamespace(middlewares=tuple(pipes), methods={"process_item": methods})
+    timing = make_timing(itemproc)
+    timing._wrap_pipelines(spider)
+    for method in methods:
+        method({"x": 1}, spider)
+    assert {name: s.count for name, s in timing.pipelines.items()} == {"FirstPipeline": 1, "SecondPipeline": 1}
+
+
+def test_unknown_layout_disables_pipeline_timing(caplog):
+    timing = make_timing(SimpleNamespace(methods={}))
+    with caplog.at_level(logging.WARNING):
+        timing._wrap_pipelines(spider)
+    assert timing.pipelines == {}
+    assert "pipeline timing disabled" in caplog.text
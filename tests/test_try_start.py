@@ -0,0 +1,127 @@
+"""Requests and items ``try_start`` produces per candidate outcome, on saved pages.
+
+Every candidate response must lead to exactly one of: drop (late or
+repeated response), retry (one re-fetch of the same candidate), crawl
+(the page's items once and one next-page request) or next (one request
+for the next candidate).
+"""
+from pathlib import Path
+
+import pytest
+import scrapy
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+
+from scrap_reviews import settings as project_settings
+from scrap_reviews.cache import canonical_url
+from scrap_reviews.spiders.capterra_reviews import CapterraReviewsSpider
+from scrap_reviews.spiders.g2_reviews import G2ReviewsSpider
+from scrap_reviews.spiders.trustpilot_reviews import TrustpilotReviewsSpider
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SPIDERS = {
+    "g2": G2ReviewsSpider,
+    "capterra": CapterraReviewsSpider,
+    "trustpilot": TrustpilotReviewsSpider,
+}
+# Reviews in the 2025 window on each saved listing page.
+LISTING_ITEMS = {"g2": 3, "capterra": 3, "trustpilot": 3}
+
+
+def fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+def make_spider(source, **overrides):
+    settings = Settings()
+    settings.setmodule(project_settings)
+    settings.update(overrides)
+    cls = SPIDERS[source]
+    cls.update_settings(settings)
+    spider = cls(company_name="Acme Corp", start_date="2025-01-01", end_date="2025-12-31")
+    spider.settings = settings
+    return spider
+
+
+def respond(request, body, status=200):
+    return HtmlResponse(url=request.url, status=status, body=body, encoding="utf-8", request=request)
+
+
+def split(output):
+    output = list(output)
+    requests = [r for r in output if isinstance(r, scrapy.Request)]
+    return requests, len(output) - len(requests)
+
+
+sources = pytest.mark.parametrize("source", sorted(SPIDERS))
+
+
+@sources
+def test_next_on_page_without_reviews(source):
+    spider = make_spider(source)
+    (first,) = spider.start_requests()
+    requests, items = split(spider.try_start(respond(first, fixture("not_found.html"))))
+    assert (len(requests), items) == (1, 0)
+    assert requests[0].meta["cand_idx"] == 1
+    assert requests[0].callback == spider.try_start
+
+
+@sources
+def test_next_on_gone_status(source):
+    spider = make_spider(source)
+    (first,) = spider.start_requests()
+    requests, items = split(spider.try_start(respond(first, fixture("not_found.html"), status=404)))
+    assert (len(requests), items) == (1, 0)
+    assert requests[0].meta["cand_idx"] == 1
+
+
+@sources
+def test_crawl_parses_listing_once(source):
+    spider = make_spider(source)
+    (first,) = spider.start_requests()
+    requests, items = split(spider.try_start(respond(first, fixture(f"{source}_listing.html"))))
+    # Cards match several card selectors; the page is still parsed once and
+    # followed by exactly one page-2 request, with no other candidate requested.
+    assert (len(requests), items) == (1, LISTING_ITEMS[source])
+    assert requests[0].callback == spider.parse
+    assert "page=2" in requests[0].url
+
+
+@sources
+def test_drop_repeated_and_late_responses(source):
+    spider = make_spider(source)
+    (first,) = spider.start_requests()
+    miss = respond(first, fixture("not_found.html"))
+    (second,), _ = split(spider.try_start(miss))
+    hit = respond(second, fixture(f"{source}_listing.html"))
+    assert len(split(spider.try_start(hit))[0]) == 1
+    assert split(spider.try_start(hit)) == ([], 0)
+    assert split(spider.try_start(miss)) == ([], 0)
+
+
+@sources
+def test_retry_plain_candidate_rendered_then_crawl(source):
+    spider = make_spider(source, STRUCTURED_DATA_FIRST=True)
+    (first,) = spider.start_requests()
+    assert first.meta["render_js"] is False
+    assert "sops_render_js" not in first.meta and "sops_wait" not in first.meta
+    requests, items = split(spider.try_start(respond(first, fixture(f"{source}_listing.html"))))
+    assert (len(requests), items) == (1, 0)
+    (retry,) = requests
+    assert retry.meta["render_js"] is True
+    assert retry.meta["sops_render_js"] is True and retry.meta["sops_wait"] == retry.meta["wait"]
+    assert retry.meta["cand_idx"] == 0
+    assert canonical_url(retry.url) == canonical_url(first.url)
+    requests, items = split(spider.try_start(respond(retry, fixture(f"{source}_listing.html"))))
+    assert (len(requests), items) == (1, LISTING_ITEMS[source])
+
+
+@sources
+def test_parallel_probe_drops_late_candidates(source):
+    spider = make_spider(source, CANDIDATE_PROBE_PARALLEL=True, CANDIDATE_PROBE_CONCURRENCY={source: 3})
+    started = list(spider.start_requests())
+    assert len(started) == 3
+    requests, items = split(spider.try_start(respond(started[1], fixture(f"{source}_listing.html"))))
+    assert (len(requests), items) == (1, LISTING_ITEMS[source])
+    for request in (started[0], started[2]):
+        assert split(spider.try_start(respond(request, fixture(f"{source}_listing.html")))) == ([], 0)